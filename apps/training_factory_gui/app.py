@@ -20,7 +20,12 @@ from tf_gui.bundle_view import (
     render_bundle_summary,
     safe_read_text,
 )
-from tf_gui.runner import run_pipeline_from_template, run_pipeline_in_process, save_bundle_to_path
+from tf_gui.runner import (
+    run_pipeline_from_template,
+    run_pipeline_in_process,
+    run_pipeline_via_service,
+    save_bundle_to_path,
+)
 from tf_gui.state import clear_bundle, get_state, init_state_defaults
 from training_factory.settings import get_settings
 
@@ -438,14 +443,34 @@ def main() -> None:
         product_flag = ""
 
         st.header("Run Controls")
+        execution_mode_options = {
+            "In-process (Recommended)": "in_process",
+            "CLI subprocess": "cli",
+            "Pipeline service": "service",
+        }
+        execution_mode_values = list(execution_mode_options.values())
+        current_execution_mode = str(state.get("execution_mode") or "in_process")
         execution_mode = st.radio(
             "execution mode",
-            ["In-process (Recommended)", "CLI subprocess"],
-            index=0 if str(state.get("execution_mode") or "in_process") == "in_process" else 1,
+            list(execution_mode_options.keys()),
+            index=execution_mode_values.index(current_execution_mode)
+            if current_execution_mode in execution_mode_values
+            else 0,
         )
-        execution_mode_value = "in_process" if execution_mode.startswith("In-process") else "cli"
+        execution_mode_value = execution_mode_options[execution_mode]
         out_dir = st.text_input("out_dir", value=str(state.get("out_dir") or "out/gui"))
-        if execution_mode_value == "in_process":
+        service_url = str(state.get("service_url") or "http://127.0.0.1:8765")
+        if execution_mode_value == "service":
+            service_url = st.text_input(
+                "service_url",
+                value=service_url,
+                help="Base URL of a running `python -m training_factory.cli serve` process.",
+            )
+            st.caption(
+                "Service runs reuse a resident pipeline process, so there is no interpreter or import "
+                "startup per run. The bundle is kept in memory and a run log is written to `out_dir/logs`."
+            )
+        elif execution_mode_value == "in_process":
             st.caption(
                 "In-process runs keep the bundle in memory. A run log is written to `out_dir/logs`, "
                 "and the bundle is only written to disk if you use `Save current bundle to disk`."
@@ -479,8 +504,8 @@ def main() -> None:
                     value=timeout_default,
                     step=1,
                     help=(
-                        "Maximum time, in seconds, to wait for a CLI subprocess run before stopping it. "
-                        "Not used for in-process runs."
+                        "Maximum time, in seconds, to wait for a CLI subprocess or service run before "
+                        "stopping it. Not used for in-process runs."
                     ),
                 )
             )
@@ -519,6 +544,7 @@ def main() -> None:
 
         st.session_state["execution_mode"] = execution_mode_value
         st.session_state["out_dir"] = out_dir
+        st.session_state["service_url"] = service_url
         st.session_state["run_cwd"] = run_cwd
         st.session_state["timeout_s"] = timeout_s
         st.session_state["research_max_retries"] = research_max_retries
@@ -585,6 +611,19 @@ def main() -> None:
                     offline=offline,
                     log_dir=f"{out_dir}/logs",
                 )
+            elif execution_mode_value == "service":
+                result, bundle_payload = run_pipeline_via_service(
+                    service_url=service_url,
+                    topic=topic,
+                    audience=audience,
+                    web=mode in {"M2", "M3"},
+                    search_provider="fallback" if mode in {"M1", "M2"} else "serpapi",
+                    research_max_retries=research_max_retries,
+                    qa_max_retries=qa_max_retries,
+                    offline=mode == "M1",
+                    timeout_s=timeout_s,
+                    log_dir=f"{out_dir}/logs",
+                )
             else:
                 result = run_pipeline_from_template(
                     command_template,
@@ -600,7 +639,7 @@ def main() -> None:
                 st.code(" ".join(result.get("command", [])), language="bash")
                 st.write(f"return code: {result.get('returncode')}")
 
-            if execution_mode_value == "in_process":
+            if execution_mode_value in {"in_process", "service"}:
                 if result.get("ok") and isinstance(bundle_payload, dict):
                     st.session_state["bundle"] = bundle_payload
                     st.session_state["last_loaded_at"] = datetime.now().isoformat(timespec="seconds")
@@ -647,7 +686,7 @@ def main() -> None:
             except ValueError as exc:
                 st.error(str(exc))
 
-        uploaded = st.file_uploader("Upload bundle.json", type=["json"])
+        uploaded = st.file_uploader("Upload bundle.json", type=["json", "gz", "ndjson"])
         if uploaded is not None:
             try:
                 st.session_state["bundle"] = load_bundle_from_upload(uploaded)
@@ -5,6 +5,8 @@ from collections import Counter
 from pathlib import Path
 from typing import Any
 
+from training_factory.utils.bundle_io import loads_bundle
+
 
 def _as_dict(value: Any) -> dict[str, Any]:
     return value if isinstance(value, dict) else {}
@@ -32,31 +34,24 @@ def load_bundle_from_path(path: str) -> dict[str, Any]:
     if not bundle_path.is_file():
         raise ValueError(f"Bundle path is not a file: {bundle_path}")
 
+    # Accepts json, json-compact, json.gz, and ndjson bundles.
     try:
-        payload = json.loads(bundle_path.read_text(encoding="utf-8"))
+        return loads_bundle(bundle_path.read_bytes())
     except UnicodeDecodeError as exc:
         raise ValueError(f"Bundle file is not valid UTF-8: {bundle_path}") from exc
     except json.JSONDecodeError as exc:
         raise ValueError(f"Invalid JSON in bundle file: {bundle_path}") from exc
 
-    if not isinstance(payload, dict):
-        raise ValueError("Bundle JSON must be an object at top level.")
-    return payload
-
 
 def load_bundle_from_upload(uploaded_file: Any) -> dict[str, Any]:
     if uploaded_file is None:
         raise ValueError("No uploaded file provided.")
 
     try:
-        payload = json.load(uploaded_file)
-    except json.JSONDecodeError as exc:
+        return loads_bundle(uploaded_file.read())
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
         raise ValueError("Uploaded file is not valid JSON.") from exc
 
-    if not isinstance(payload, dict):
-        raise ValueError("Uploaded bundle JSON must be an object at top level.")
-    return payload
-
 
 def _derive_mode(bundle: dict[str, Any]) -> str:
     request = _as_dict(bundle.get("request"))
@@ -9,9 +9,11 @@ import shlex
 import subprocess
 import time
 from typing import Any, TypedDict
+from urllib import error as urllib_error
+from urllib import request as urllib_request
 
 from training_factory.graph import run_pipeline
-from training_factory.settings import get_settings
+from training_factory.settings import offline_override
 from training_factory.utils.json_schema import validate_json
 
 SCHEMA_PATH = Path(__file__).resolve().parents[3] / "schemas" / "bundle.schema.json"
@@ -30,35 +32,6 @@ class RunResult(TypedDict):
     log_path: str | None
 
 
-def _offline_override(enabled: bool):
-    if not enabled:
-        class _NoopContext:
-            def __enter__(self):
-                return None
-
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-        return _NoopContext()
-
-    class _OfflineContext:
-        def __enter__(self):
-            self.previous = os.environ.get("TRAINING_FACTORY_OFFLINE")
-            os.environ["TRAINING_FACTORY_OFFLINE"] = "1"
-            get_settings.cache_clear()
-            return None
-
-        def __exit__(self, exc_type, exc, tb):
-            if self.previous is None:
-                os.environ.pop("TRAINING_FACTORY_OFFLINE", None)
-            else:
-                os.environ["TRAINING_FACTORY_OFFLINE"] = self.previous
-            get_settings.cache_clear()
-            return False
-
-    return _OfflineContext()
-
-
 def _extract_bundle(state: Any) -> dict[str, Any]:
     state_data = state.model_dump() if hasattr(state, "model_dump") else dict(state)
     packaging = state_data.get("packaging", {})
@@ -213,7 +186,7 @@ def run_pipeline_in_process(
         request_qa = {
             "max_retries": qa_max_retries,
         }
-        with _offline_override(offline):
+        with offline_override(offline):
             state = run_pipeline(
                 topic=topic,
                 audience=audience,
@@ -266,6 +239,107 @@ def run_pipeline_in_process(
     return result, bundle
 
 
+def run_pipeline_via_service(
+    *,
+    service_url: str,
+    topic: str,
+    audience: str,
+    web: bool,
+    search_provider: str,
+    research_max_retries: int,
+    qa_max_retries: int,
+    offline: bool,
+    timeout_s: int,
+    log_dir: str,
+) -> tuple[RunResult, dict[str, Any] | None]:
+    """Run the pipeline on a resident `training_factory.cli serve` process."""
+
+    started_dt = datetime.now()
+    started_at = started_dt.isoformat(timespec="seconds")
+    started_clock = time.perf_counter()
+    endpoint = service_url.rstrip("/") + "/generate"
+    command = [
+        "POST",
+        endpoint,
+        f"topic={topic}",
+        f"audience={audience}",
+        f"search_provider={search_provider}",
+        f"offline={offline}",
+    ]
+    request_payload = {
+        "topic": topic,
+        "audience": audience,
+        "research": {
+            "web": web,
+            "search_provider": search_provider,
+            "max_retries": research_max_retries,
+        },
+        "qa": {
+            "max_retries": qa_max_retries,
+        },
+        "offline": offline,
+    }
+
+    stdout = ""
+    stderr = ""
+    bundle: dict[str, Any] | None = None
+    returncode = 0
+    try:
+        http_request = urllib_request.Request(
+            endpoint,
+            data=json.dumps(request_payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib_request.urlopen(http_request, timeout=timeout_s) as response:
+                job = json.loads(response.read().decode("utf-8"))
+        except urllib_error.HTTPError as exc:
+            job = json.loads(exc.read().decode("utf-8") or "{}")
+        if job.get("status") != "done" or not isinstance(job.get("bundle"), dict):
+            raise RuntimeError(str(job.get("error") or f"Service returned status {job.get('status')!r}"))
+        bundle = job["bundle"]
+        qa_status = bundle.get("qa", {}).get("status", "unknown")
+        stdout = "\n".join(
+            [
+                f"Pipeline run completed by service job {job.get('job_id')}.",
+                f"Topic: {topic}",
+                f"Curriculum modules: {len(bundle.get('curriculum', {}).get('modules', []))}",
+                f"Slides: {len(bundle.get('slides', {}).get('deck', []))}",
+                f"QA status: {qa_status}",
+            ]
+        )
+    except Exception as exc:
+        returncode = 1
+        stderr = str(exc)
+
+    finished_at = datetime.now().isoformat(timespec="seconds")
+    duration_s = round(time.perf_counter() - started_clock, 3)
+    payload = _RunLogPayload(
+        command=command,
+        started_at=started_at,
+        finished_at=finished_at,
+        duration_s=duration_s,
+        returncode=returncode,
+        stdout=stdout,
+        stderr=stderr,
+    )
+    log_path = _write_log(log_dir, payload)
+    result: RunResult = {
+        "ok": returncode == 0 and bundle is not None,
+        "returncode": returncode,
+        "command": command,
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "duration_s": duration_s,
+        "stdout": stdout,
+        "stderr": stderr,
+        "bundle_path": None,
+        "log_path": log_path,
+    }
+    return result, bundle
+
+
 def run_pipeline_from_template(
     template: str,
     tokens: dict[str, str],
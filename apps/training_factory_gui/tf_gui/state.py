@@ -26,6 +26,8 @@ def init_state_defaults() -> None:
         st.session_state["run_command_template"] = _DEFAULT_RUN_TEMPLATE
     if "execution_mode" not in st.session_state:
         st.session_state["execution_mode"] = "in_process"
+    if "service_url" not in st.session_state:
+        st.session_state["service_url"] = "http://127.0.0.1:8765"
     if "run_cwd" not in st.session_state:
         st.session_state["run_cwd"] = ""
     if "out_dir" not in st.session_state:
@@ -55,6 +57,7 @@ def get_state() -> dict[str, object]:
         "save_bundle_path": st.session_state.get("save_bundle_path"),
         "run_command_template": st.session_state.get("run_command_template"),
         "execution_mode": st.session_state.get("execution_mode"),
+        "service_url": st.session_state.get("service_url"),
         "run_cwd": st.session_state.get("run_cwd"),
         "out_dir": st.session_state.get("out_dir"),
         "last_run_result": st.session_state.get("last_run_result"),
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import training_factory.graph as graph_module
+from training_factory.graph import build_graph, run_pipeline
+from training_factory.settings import clear_settings_cache
+
+TOPICS = [
+    "Power BI fundamentals",
+    "Power Apps basics",
+    "Enterprise ChatGPT governance and risk controls",
+    "Power Platform ALM governance best practices",
+]
+
+
+def _time_runs(runs: int, before_each: Callable[[], None] | None = None) -> list[float]:
+    durations: list[float] = []
+    for idx in range(runs):
+        if before_each is not None:
+            before_each()
+        topic = TOPICS[idx % len(TOPICS)]
+        started = time.perf_counter()
+        run_pipeline(topic=topic, audience="novice")
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def _summarize(label: str, durations: list[float]) -> str:
+    mean_ms = statistics.fmean(durations) * 1000
+    median_ms = statistics.median(durations) * 1000
+    return f"{label:<28} mean={mean_ms:8.2f} ms  median={median_ms:8.2f} ms  runs={len(durations)}"
+
+
+def run_benchmark(*, runs: int = 20) -> dict[str, float]:
+    os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+    os.environ["TRAINING_FACTORY_OFFLINE"] = "1"
+    clear_settings_cache()
+
+    compile_durations: list[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        build_graph()
+        compile_durations.append(time.perf_counter() - started)
+
+    # "Before": every run pays graph construction, as run_pipeline used to.
+    cold = _time_runs(runs, before_each=graph_module._compile_graph.cache_clear)
+    # "After": the compiled graph is built once and reused across runs.
+    graph_module._compile_graph.cache_clear()
+    graph_module.get_compiled_graph()
+    warm = _time_runs(runs)
+
+    print(_summarize("build_graph() only", compile_durations))
+    print(_summarize("run_pipeline (compile/run)", cold))
+    print(_summarize("run_pipeline (cached)", warm))
+    saved_ms = (statistics.fmean(cold) - statistics.fmean(warm)) * 1000
+    print(f"Per-run overhead removed: {saved_ms:.2f} ms")
+    return {
+        "compile_ms": statistics.fmean(compile_durations) * 1000,
+        "cold_ms": statistics.fmean(cold) * 1000,
+        "warm_ms": statistics.fmean(warm) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure per-run graph compilation overhead.")
+    parser.add_argument("--runs", type=int, default=20, help="Offline runs per measurement.")
+    args = parser.parse_args()
+    run_benchmark(runs=max(1, args.runs))
+
+
+if __name__ == "__main__":
+    main()
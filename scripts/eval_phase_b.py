@@ -2,18 +2,17 @@ from __future__ import annotations
 
 import argparse
 import csv
-import json
 import os
 import sys
 from collections import Counter
-from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 from training_factory.graph import run_pipeline
-from training_factory.settings import get_settings
+from training_factory.settings import offline_override
+from training_factory.utils.bundle_io import BUNDLE_FORMATS, BundleFormat, bundle_suffix, write_bundle
 
 CASES: dict[str, dict[str, str]] = {
     "C1": {"topic": "Power BI fundamentals", "audience": "novice"},
@@ -84,25 +83,6 @@ _AUTHORITY_PROMPT = "Does curriculum cite sufficiently authoritative sources (Ti
 _CITATION_PROMPT = "Does curriculum include references_used and are they valid research source IDs?"
 
 
-@contextmanager
-def _offline_override(enabled: bool):
-    if not enabled:
-        yield
-        return
-
-    previous = os.environ.get("TRAINING_FACTORY_OFFLINE")
-    os.environ["TRAINING_FACTORY_OFFLINE"] = "1"
-    get_settings.cache_clear()
-    try:
-        yield
-    finally:
-        if previous is None:
-            os.environ.pop("TRAINING_FACTORY_OFFLINE", None)
-        else:
-            os.environ["TRAINING_FACTORY_OFFLINE"] = previous
-        get_settings.cache_clear()
-
-
 def _extract_bundle(state: Any) -> dict[str, Any]:
     state_data = state.model_dump() if hasattr(state, "model_dump") else dict(state)
     packaging = state_data.get("packaging", {})
@@ -158,6 +138,7 @@ def run_eval(
     out_root: str | Path = "out/eval/phase_b",
     case_ids: list[str] | None = None,
     mode_ids: list[str] | None = None,
+    bundle_format: BundleFormat = "json",
 ) -> Path:
     os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
 
@@ -186,13 +167,12 @@ def run_eval(
                 "search_provider": pipeline_search_provider,
             }
 
-            with _offline_override(bool(mode["offline"])):
+            with offline_override(bool(mode["offline"])):
                 state = run_pipeline(topic=topic, audience=audience, research=request_research)
 
             bundle = _extract_bundle(state)
-            bundle_path = out_root_path / case_id / mode_id / "bundle.json"
-            bundle_path.parent.mkdir(parents=True, exist_ok=True)
-            bundle_path.write_text(json.dumps(bundle, indent=2) + "\n", encoding="utf-8")
+            bundle_path = out_root_path / case_id / mode_id / f"bundle{bundle_suffix(bundle_format)}"
+            write_bundle(bundle, bundle_path, bundle_format)
 
             research_qa = bundle.get("research_qa", {}) if isinstance(bundle, dict) else {}
             metrics = research_qa.get("metrics", {}) if isinstance(research_qa, dict) else {}
@@ -265,6 +245,13 @@ def main() -> None:
         default="",
         help="Comma-separated mode IDs.",
     )
+    parser.add_argument(
+        "--format",
+        dest="bundle_format",
+        choices=BUNDLE_FORMATS,
+        default="json",
+        help="Encoding for per-run bundle files.",
+    )
     args = parser.parse_args()
 
     defaults = PHASE_DEFAULTS[args.phase]
@@ -282,6 +269,7 @@ def main() -> None:
         out_root=out_root,
         case_ids=case_ids,
         mode_ids=mode_ids,
+        bundle_format=args.bundle_format,
     )
     print(f"Wrote summary to {summary}")
 
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Any
 
 from training_factory import llm
+from training_factory.artifacts import Brief
 from training_factory.utils.structured_output import generate_structured_output
 
 SCHEMA_PATH = Path(__file__).resolve().parents[3] / "schemas" / "brief.schema.json"
@@ -110,4 +111,5 @@ def generate_brief(request: dict[str, Any], research: dict[str, Any]) -> dict[st
         schema_path=SCHEMA_PATH,
         normalize=_normalize,
         offline_stub=fallback,
+        artifact_model=Brief,
     )
@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import Any
 
 from training_factory import llm
+from training_factory.artifacts import Curriculum
 from training_factory.utils.structured_output import generate_structured_output
 
 SCHEMA_PATH = Path(__file__).resolve().parents[3] / "schemas" / "curriculum.schema.json"
@@ -105,4 +106,5 @@ def generate_curriculum(brief: dict[str, Any], research: dict[str, Any]) -> dict
         schema_path=SCHEMA_PATH,
         normalize=_normalize,
         offline_stub=fallback,
+        artifact_model=Curriculum,
     )
@@ -3,14 +3,15 @@ from pathlib import Path
 from typing import Any
 
 from training_factory import llm
+from training_factory.artifacts import Lab
+from training_factory.utils.json_schema import load_schema
 from training_factory.utils.structured_output import generate_structured_output
 
 SCHEMA_PATH = Path(__file__).resolve().parents[3] / "schemas" / "lab.schema.json"
 
 
 def _schema_mode() -> str:
-    schema = json.loads(SCHEMA_PATH.read_text(encoding="utf-8"))
-    required = schema.get("required", [])
+    required = load_schema(SCHEMA_PATH).get("required", [])
     if "labs" in required:
         return "legacy"
     return "single"
@@ -224,4 +225,5 @@ def generate_lab(curriculum: dict[str, Any], *, retry_strategy: dict[str, Any] |
         schema_path=SCHEMA_PATH,
         normalize=_normalize,
         offline_stub=fallback,
+        artifact_model=Lab if mode == "single" else None,
     )
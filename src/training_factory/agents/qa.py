@@ -1,6 +1,9 @@
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from training_factory.utils.text import tokenize
+
 SCHEMA_PATH = Path(__file__).resolve().parents[3] / "schemas" / "qa.schema.json"
 
 _SLIDES_ALIGN_PROMPT = "Do slides align with curriculum/lab objectives?"
@@ -13,6 +16,8 @@ _CURRICULUM_REFS_PROMPT = "Does curriculum include references_used and are they
 _MODULE_SOURCES_PROMPT = "Does each curriculum module include sources and are they valid research source IDs?"
 _AUTHORITY_PROMPT = "Does curriculum cite sufficiently authoritative sources (Tier A/B) for this topic?"
 
+_MEANINGFUL_TOKEN_LENGTH = 4
+
 
 def _has_steps_and_checkpoints(lab: dict[str, Any]) -> bool:
     if isinstance(lab.get("steps"), list) and lab.get("steps") and isinstance(lab.get("checkpoints"), list) and lab.get("checkpoints"):
@@ -63,44 +68,109 @@ def _slide_text(slides: dict[str, Any]) -> str:
     return " ".join(parts).strip()
 
 
-def _meaningful_tokens(text: str) -> set[str]:
-    normalized = "".join(ch.lower() if ch.isalnum() else " " for ch in text)
-    return {token for token in normalized.split() if len(token) > 3}
+def _meaningful_tokens(text: str) -> frozenset[str]:
+    return tokenize(text, _MEANINGFUL_TOKEN_LENGTH)
+
+
+@dataclass(frozen=True)
+class _IndexedSlide:
+    title: str
+    has_bullets: bool
+    title_tokens: frozenset[str]
+    text_tokens: frozenset[str]
+
+
+@dataclass(frozen=True)
+class _IndexedModule:
+    title: str
+    title_tokens: frozenset[str]
+
+
+@dataclass(frozen=True)
+class _ArtifactIndex:
+    """Everything the deterministic checks read, derived once per QA run.
+
+    ``slides`` and ``modules`` keep ``None`` placeholders for malformed items so
+    positional pairing matches the raw artifacts.
+    """
 
+    deck_is_list: bool
+    slides: list[_IndexedSlide | None]
+    slide_text: str
+    modules_is_list: bool
+    modules: list[_IndexedModule | None]
+    readme: str
+    runbook: str
+    template_tokens: frozenset[str]
+    research_ids: frozenset[str]
+    source_tiers: dict[str, str]
 
-def _slides_align_with_curriculum(slides: dict[str, Any], curriculum: dict[str, Any]) -> bool:
+
+def _index_slide(item: Any) -> _IndexedSlide | None:
+    if not isinstance(item, dict):
+        return None
+    title = str(item.get("title", "")).strip()
+    bullets = item.get("bullets")
+    bullet_text = [bullet for bullet in bullets if isinstance(bullet, str)] if isinstance(bullets, list) else []
+    return _IndexedSlide(
+        title=title,
+        has_bullets=isinstance(bullets, list) and bool(bullets),
+        title_tokens=_meaningful_tokens(title),
+        text_tokens=_meaningful_tokens(" ".join([title] + bullet_text)),
+    )
+
+
+def _index_module(item: Any) -> _IndexedModule | None:
+    if not isinstance(item, dict):
+        return None
+    title = str(item.get("title", "")).strip()
+    return _IndexedModule(title=title, title_tokens=_meaningful_tokens(title))
+
+
+def _index_artifacts(
+    slides: dict[str, Any],
+    templates: dict[str, Any],
+    curriculum: dict[str, Any],
+    research: dict[str, Any],
+) -> _ArtifactIndex:
     deck = slides.get("deck")
     modules = curriculum.get("modules")
-    if not isinstance(deck, list) or not deck:
+    readme = _template_content(templates, "README.md").lower()
+    runbook = _template_content(templates, "RUNBOOK.md").lower()
+    return _ArtifactIndex(
+        deck_is_list=isinstance(deck, list),
+        slides=[_index_slide(item) for item in deck] if isinstance(deck, list) else [],
+        slide_text=_slide_text(slides).lower(),
+        modules_is_list=isinstance(modules, list),
+        modules=[_index_module(item) for item in modules] if isinstance(modules, list) else [],
+        readme=readme,
+        runbook=runbook,
+        template_tokens=frozenset(f"{readme} {runbook}".replace("-", " ").split()),
+        research_ids=frozenset(_research_ids(research)),
+        source_tiers=_source_tiers(research),
+    )
+
+
+def _slides_align_with_curriculum(index: _ArtifactIndex) -> bool:
+    if not index.deck_is_list or not index.slides:
         return False
-    if not isinstance(modules, list) or not modules:
+    if not index.modules_is_list or not index.modules:
         return False
-    if len(deck) < len(modules):
+    if len(index.slides) < len(index.modules):
         return False
 
-    for module, slide in zip(modules, deck):
-        if not isinstance(module, dict) or not isinstance(slide, dict):
+    for module, slide in zip(index.modules, index.slides):
+        if module is None or slide is None:
             return False
-
-        module_title = str(module.get("title", "")).strip()
-        slide_title = str(slide.get("title", "")).strip()
-        bullets = slide.get("bullets")
-        if not module_title or not slide_title or not isinstance(bullets, list) or not bullets:
+        if not module.title or not slide.title or not slide.has_bullets:
             return False
 
-        module_tokens = _meaningful_tokens(module_title)
-        slide_title_tokens = _meaningful_tokens(slide_title)
-        slide_text_tokens = _meaningful_tokens(
-            " ".join(
-                [slide_title]
-                + [item for item in bullets if isinstance(item, str)]
-            )
-        )
+        module_tokens = module.title_tokens
         if not module_tokens:
             return False
 
-        title_overlap = module_tokens & slide_title_tokens
-        text_overlap = module_tokens & slide_text_tokens
+        title_overlap = module_tokens & slide.title_tokens
+        text_overlap = module_tokens & slide.text_tokens
         min_overlap = 1 if len(module_tokens) == 1 else 2
         if len(title_overlap) < min_overlap or len(text_overlap) < min_overlap:
             return False
@@ -108,45 +178,27 @@ def _slides_align_with_curriculum(slides: dict[str, Any], curriculum: dict[str,
     return True
 
 
-def _slides_reference_lab(slides: dict[str, Any]) -> bool:
-    text = _slide_text(slides).lower()
+def _slides_reference_lab(index: _ArtifactIndex) -> bool:
+    text = index.slide_text
     if not text:
         return False
     return any(token in text for token in ("lab", "exercise", "hands-on", "checkpoint"))
 
 
-def _templates_align_with_materials(slides: dict[str, Any], lab: dict[str, Any], templates: dict[str, Any]) -> bool:
-    readme = _template_content(templates, "README.md").lower()
-    runbook = _template_content(templates, "RUNBOOK.md").lower()
-    slide_text = _slide_text(slides).lower()
-
+def _templates_align_with_materials(index: _ArtifactIndex, lab: dict[str, Any]) -> bool:
     lab_present = bool(lab)
-    slides_present = bool(slide_text)
-    templates_present = bool(readme) and bool(runbook)
+    slides_present = bool(index.slide_text)
+    templates_present = bool(index.readme) and bool(index.runbook)
     if not (lab_present and slides_present and templates_present):
         return False
 
-    combined = f"{readme} {runbook}"
+    combined = f"{index.readme} {index.runbook}"
     has_lab_ref = any(token in combined for token in ("lab", "exercise", "checkpoint"))
     has_slide_ref = any(token in combined for token in ("slide", "deck", "module", "lesson"))
-    slide_titles = slides.get("deck")
-    title_token_overlap = False
-    if isinstance(slide_titles, list):
-        template_tokens = set(combined.replace("-", " ").split())
-        for item in slide_titles:
-            if not isinstance(item, dict):
-                continue
-            title = str(item.get("title", "")).strip().lower()
-            if not title:
-                continue
-            title_tokens = {
-                token
-                for token in "".join(ch if ch.isalnum() else " " for ch in title).split()
-                if len(token) > 3
-            }
-            if title_tokens and title_tokens & template_tokens:
-                title_token_overlap = True
-                break
+    title_token_overlap = any(
+        slide is not None and slide.title and slide.title_tokens & index.template_tokens
+        for slide in index.slides
+    )
     return has_lab_ref and has_slide_ref and title_token_overlap
 
 
@@ -169,7 +221,7 @@ def _research_ids(research: dict[str, Any]) -> set[str]:
     return ids
 
 
-def _curriculum_references_valid(curriculum: dict[str, Any], valid_ids: set[str]) -> bool:
+def _curriculum_references_valid(curriculum: dict[str, Any], valid_ids: frozenset[str]) -> bool:
     references_used = curriculum.get("references_used")
     if not isinstance(references_used, list) or not references_used:
         return False
@@ -179,7 +231,7 @@ def _curriculum_references_valid(curriculum: dict[str, Any], valid_ids: set[str]
     return True
 
 
-def _module_sources_valid(curriculum: dict[str, Any], valid_ids: set[str]) -> bool:
+def _module_sources_valid(curriculum: dict[str, Any], valid_ids: frozenset[str]) -> bool:
     modules = curriculum.get("modules")
     if not isinstance(modules, list) or not modules:
         return False
@@ -218,12 +270,11 @@ def _is_sensitive_topic(topic: str) -> bool:
     )
 
 
-def _authority_usage_valid(curriculum: dict[str, Any], research: dict[str, Any]) -> bool:
+def _authority_usage_valid(curriculum: dict[str, Any], tiers_by_source: dict[str, str]) -> bool:
     references_used = curriculum.get("references_used")
     if not isinstance(references_used, list) or not references_used:
         return False
 
-    tiers_by_source = _source_tiers(research)
     cited_tiers: list[str] = []
     for source_id in references_used:
         if not isinstance(source_id, str) or not source_id.strip():
@@ -302,17 +353,16 @@ def generate_qa(
     curriculum: dict[str, Any],
     research: dict[str, Any],
 ) -> dict[str, Any]:
+    index = _index_artifacts(slides, templates, curriculum, research)
     lab_has_structure = _has_steps_and_checkpoints(lab)
-    slides_have_content = _slide_text(slides)
-    slides_align = _slides_align_with_curriculum(slides, curriculum)
-    slides_reference_lab = _slides_reference_lab(slides)
-    has_readme = bool(_template_content(templates, "README.md"))
-    has_runbook = bool(_template_content(templates, "RUNBOOK.md"))
-    templates_align = _templates_align_with_materials(slides, lab, templates)
-    research_ids = _research_ids(research)
-    has_valid_curriculum_refs = _curriculum_references_valid(curriculum, research_ids)
-    has_valid_module_sources = _module_sources_valid(curriculum, research_ids)
-    has_authoritative_citations = _authority_usage_valid(curriculum, research)
+    slides_align = _slides_align_with_curriculum(index)
+    slides_reference_lab = _slides_reference_lab(index)
+    has_readme = bool(index.readme)
+    has_runbook = bool(index.runbook)
+    templates_align = _templates_align_with_materials(index, lab)
+    has_valid_curriculum_refs = _curriculum_references_valid(curriculum, index.research_ids)
+    has_valid_module_sources = _module_sources_valid(curriculum, index.research_ids)
+    has_authoritative_citations = _authority_usage_valid(curriculum, index.source_tiers)
 
     deterministic_checks = _build_deterministic_checks(
         lab_has_structure=lab_has_structure,
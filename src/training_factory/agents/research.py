@@ -1,18 +1,42 @@
 from __future__ import annotations
 
+import contextvars
+import hashlib
+import heapq
+import json
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from datetime import date
 from typing import Any
 from urllib.parse import urlparse
 
+from training_factory.agents.research_qa import summarize_sources
+from training_factory.artifacts import Research, validate_artifact
+from training_factory.budget import get_budget
 from training_factory.research import fetch_extract
-from training_factory.research.providers import SearchResult
+from training_factory.research.negative_cache import get_negative_cache
+from training_factory.research.providers import SearchProvider, SearchResult
+from training_factory.research.query_coalescing import search_plan
 from training_factory.research.registry import get_search_provider
+from training_factory.tracing import annotate, span, tracing_scope
+from training_factory.utils.text import tokenize, tokenize_all
 
 _MAX_CONTEXT_PACK_CHARS = 6000
 _MAX_RESULTS_PER_QUERY = 10
 _MAX_SELECTED_SOURCES = 8
 _MAX_ENRICHED_SOURCES = 4
+_MAX_SOURCE_SNIPPETS = 4
+# Extra candidates fetched in hedged enrichment, so slow or empty pages can be dropped.
+_ENRICHMENT_HEDGE = 2
+# How long hedged enrichment waits for higher-priority pages once K have landed.
+_ENRICHMENT_HEDGE_WINDOW_S = 0.5
 _DOMAIN_CAP = 2
+_MIN_TOKEN_LENGTH = 3
+# Page fetches have a 10s timeout each (run sequentially unless hedged); below
+# this much remaining run budget, enrichment is skipped rather than squeezed.
+_ENRICHMENT_MIN_REMAINING_S = 15.0
 
 _TIER_A_DOMAINS = {
     "learn.microsoft.com",
@@ -174,7 +198,7 @@ def _build_query_plan(topic: str, retry_strategy: dict[str, Any] | None = None)
                 f"\"{topic}\" implementation guide",
             ]
         )
-        intent_keywords.extend(sorted(_tokenize(topic)))
+        intent_keywords.extend(sorted(tokenize(topic, _MIN_TOKEN_LENGTH)))
 
     queries = _dedupe_keep_order(anchor_queries + retry_queries + base_queries)[:6]
     if len(queries) < 4:
@@ -210,16 +234,9 @@ def _authority_tier(domain: str) -> str:
     return "D"
 
 
-def _tokenize(value: str) -> set[str]:
-    normalized = "".join(ch.lower() if ch.isalnum() else " " for ch in value)
-    return {token for token in normalized.split() if len(token) > 2}
-
-
 def _keyword_overlap_score(topic: str, intent_keywords: list[str], title: str, snippet: str) -> float:
-    topic_tokens = _tokenize(topic)
-    for keyword in intent_keywords:
-        topic_tokens.update(_tokenize(keyword))
-    content_tokens = _tokenize(f"{title} {snippet}")
+    topic_tokens = tokenize_all([topic, *intent_keywords], _MIN_TOKEN_LENGTH)
+    content_tokens = tokenize(f"{title} {snippet}", _MIN_TOKEN_LENGTH)
     overlap_count = len(topic_tokens & content_tokens)
     return float(overlap_count) * 0.35
 
@@ -304,6 +321,197 @@ def _score_result(
     return tier, round(score, 3)
 
 
+def _candidate_rank(row: dict[str, Any]) -> tuple[float, str]:
+    return (-float(row["score"]), str(row["url"]))
+
+
+def _covers_keywords(candidate: dict[str, Any], keyword_tokens: frozenset[str]) -> bool:
+    # Same content research QA tokenizes: the title plus the joined snippet texts.
+    snippet_text = " ".join(str(snippet.get("text", "")) for snippet in candidate.get("snippets", []))
+    return bool(keyword_tokens & tokenize(f"{candidate['title']} {snippet_text}", _MIN_TOKEN_LENGTH))
+
+
+def _meets_authority(selected: list[dict[str, Any]]) -> bool:
+    tiers = [item["authority_tier"] for item in selected]
+    return tiers.count("A") >= 1 or tiers.count("B") >= 2
+
+
+def _fits_domain_cap(selected: list[dict[str, Any]], candidate: dict[str, Any]) -> bool:
+    if candidate["authority_tier"] == "A":
+        return True
+    return sum(1 for item in selected if item["domain"] == candidate["domain"]) < _DOMAIN_CAP
+
+
+def _swap_in(
+    selected: list[dict[str, Any]],
+    candidate: dict[str, Any],
+    victims: list[dict[str, Any]],
+) -> bool:
+    """Add ``candidate``, evicting the first victim that makes room for it."""
+
+    if len(selected) < _MAX_SELECTED_SOURCES and _fits_domain_cap(selected, candidate):
+        selected.append(candidate)
+        return True
+    for victim in victims:
+        remaining = [item for item in selected if item is not victim]
+        if _fits_domain_cap(remaining, candidate):
+            selected[:] = remaining + [candidate]
+            return True
+    return False
+
+
+def _select_sources(candidates: list[dict[str, Any]], keyword_tokens: frozenset[str]) -> list[dict[str, Any]]:
+    """Pick up to ``_MAX_SELECTED_SOURCES`` by rank, then repair research QA failures from the pool.
+
+    The greedy pass enforces the per-domain cap. If the picks miss the authority
+    threshold (>=1 Tier A or >=2 Tier B) or keyword coverage (>=half the sources
+    share a token with the topic/intent keywords), lower-ranked pool candidates
+    that fix the check replace the weakest picks, so a ``research_retry`` is only
+    needed when the pool itself cannot satisfy the checks.
+    """
+
+    selected: list[dict[str, Any]] = []
+    for item in candidates:
+        if _fits_domain_cap(selected, item):
+            selected.append(item)
+            if len(selected) >= _MAX_SELECTED_SOURCES:
+                break
+
+    swaps = 0
+    covered = {id(item) for item in candidates if _covers_keywords(item, keyword_tokens)}
+    pool = [item for item in candidates if all(item is not chosen for chosen in selected)]
+
+    def weakest_first(predicate: Callable[[dict[str, Any]], bool]) -> list[dict[str, Any]]:
+        # Uncovered picks go first, lowest ranked first within each group.
+        victims = sorted((item for item in selected if predicate(item)), key=_candidate_rank, reverse=True)
+        return sorted(victims, key=lambda item: id(item) in covered)
+
+    for tier in ("A", "B"):
+        for candidate in [item for item in pool if item["authority_tier"] == tier]:
+            if _meets_authority(selected):
+                break
+            if _swap_in(selected, candidate, weakest_first(lambda item: item["authority_tier"] not in {"A", "B"})):
+                pool.remove(candidate)
+                swaps += 1
+        if _meets_authority(selected):
+            break
+
+    def coverage_ok() -> bool:
+        return 2 * sum(1 for item in selected if id(item) in covered) >= len(selected)
+
+    for candidate in [item for item in pool if id(item) in covered]:
+        if coverage_ok():
+            break
+        authority_met = _meets_authority(selected)
+        victims = [
+            item
+            for item in weakest_first(lambda item: id(item) not in covered)
+            if not authority_met or _meets_authority([other for other in selected if other is not item] + [candidate])
+        ]
+        if _swap_in(selected, candidate, victims):
+            swaps += 1
+
+    if swaps:
+        annotate(selection_swaps=swaps)
+    selected.sort(key=_candidate_rank)
+    return selected
+
+
+def _fetch_snippets(url: str, keywords: list[str]) -> list[dict[str, str]]:
+    with span("fetch", "fetch", url=url) as current:
+        html = fetch_extract.fetch_url(url)
+        if current is not None:
+            current.attributes["chars"] = len(html)
+    snippets = fetch_extract.extract_snippets(html, intent_keywords=keywords, max_snippets=4)
+    if html and not snippets:
+        get_negative_cache().put(url, "empty_extraction")
+    return snippets
+
+
+def _apply_snippets(source: dict[str, Any], snippets: list[dict[str, str]]) -> None:
+    if snippets:
+        # Page snippets go first, but the search-result snippet always stays:
+        # selection and the early search stop judged keyword coverage on it.
+        kept = [snippet for snippet in source.get("snippets", []) if snippet.get("loc") == "search"]
+        source["snippets"] = snippets[: max(0, _MAX_SOURCE_SNIPPETS - len(kept))] + kept
+    source["retrieved_at"] = date.today().isoformat()
+
+
+def _start_fetch(url: str, keywords: list[str]) -> Future[list[dict[str, str]]]:
+    """Run ``_fetch_snippets`` on a daemon thread in a copy of the run's context.
+
+    Daemon threads (unlike ``ThreadPoolExecutor`` workers) are not joined at
+    interpreter exit, so an abandoned fetch can't delay shutdown; it still ends
+    at ``fetch_url``'s own (budget-clamped) timeout.
+    """
+
+    future: Future[list[dict[str, str]]] = Future()
+    context = contextvars.copy_context()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(context.run(_fetch_snippets, url, keywords))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name="tf-fetch", daemon=True).start()
+    return future
+
+
+def _first_k_settled(done: dict[int, list[dict[str, str]]], count: int) -> bool:
+    """True once the first K successful pages in priority order are known.
+
+    That is, every fetch ranked above the K-th success has returned.
+    """
+
+    successes = 0
+    for position in range(count):
+        if position not in done:
+            return False
+        successes += bool(done[position])
+        if successes >= _MAX_ENRICHED_SOURCES:
+            return True
+    return True
+
+
+def _enrich_hedged(sources: list[dict[str, Any]], keywords: list[str]) -> None:
+    """Fetch all of ``sources`` (in priority order) at once; keep the first K in priority order.
+
+    K is ``_MAX_ENRICHED_SOURCES``. Once K pages have yielded snippets, slower
+    higher-priority fetches get ``_ENRICHMENT_HEDGE_WINDOW_S`` more to land
+    before the best K returned so far are accepted; the rest are abandoned, so
+    one slow page no longer holds up the stage. Sources are marked retrieved up
+    to the last accepted one, like the sequential path.
+    """
+
+    futures = {_start_fetch(str(source.get("url", "")), keywords): position for position, source in enumerate(sources)}
+    done: dict[int, list[dict[str, str]]] = {}
+    pending = set(futures)
+    deadline: float | None = None
+    while pending and not _first_k_settled(done, len(sources)):
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        finished, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not finished:
+            break
+        for future in finished:
+            done[futures[future]] = future.result()
+        if deadline is None and sum(1 for snippets in done.values() if snippets) >= _MAX_ENRICHED_SOURCES:
+            deadline = time.monotonic() + _ENRICHMENT_HEDGE_WINDOW_S
+
+    accepted = 0
+    for position, source in enumerate(sources):
+        if accepted >= _MAX_ENRICHED_SOURCES:
+            break
+        if position in done:
+            _apply_snippets(source, done[position])
+            accepted += bool(done[position])
+    for future in pending:
+        future.cancel()
+    annotate(enrichment_hedged=len(sources), enrichment_abandoned=len(pending))
+
+
 def _build_context_pack(topic: str, audience: str, sources: list[dict[str, Any]]) -> str:
     lines = [
         f"Topic: {topic}",
@@ -326,29 +534,55 @@ def _build_context_pack(topic: str, audience: str, sources: list[dict[str, Any]]
     return text[: _MAX_CONTEXT_PACK_CHARS - 16].rstrip() + "\n[TRUNCATED]"
 
 
-def generate_research(request: dict[str, Any]) -> dict[str, Any]:
-    topic = str(request.get("topic", "")).strip()
-    audience = str(request.get("audience", "")).strip()
-    research_cfg = request.get("research", {}) if isinstance(request.get("research"), dict) else {}
-    web = bool(research_cfg.get("web", False))
-    search_provider = str(research_cfg.get("search_provider", "fallback"))
-    retry_strategy = _normalize_retry_strategy(research_cfg)
-    provider = get_search_provider(name=search_provider, web=web)
+def _pool_is_sufficient(candidates: list[dict[str, Any]], keyword_tokens: frozenset[str]) -> bool:
+    """True once the pool alone yields a full selection that passes research QA.
+
+    If the ``_MAX_SELECTED_SOURCES`` best-ranked candidates are all Tier A (exempt
+    from the domain cap) and at least half cover the keywords, ``_select_sources``
+    picks exactly them with no repair, and every research QA check passes. More
+    results could still reorder the picks, but not make the selection fail.
+    Enrichment keeps each source's search snippet, so it cannot undo the coverage.
+    """
+
+    if len(candidates) < _MAX_SELECTED_SOURCES:
+        return False
+    top = heapq.nsmallest(_MAX_SELECTED_SOURCES, candidates, key=_candidate_rank)
+    if any(item["authority_tier"] != "A" for item in top):
+        return False
+    return 2 * sum(1 for item in top if _covers_keywords(item, keyword_tokens)) >= len(top)
+
+
+def _gather_candidates(
+    provider: SearchProvider,
+    topic: str,
+    query_plan: dict[str, Any],
+    retry_strategy: dict[str, Any],
+    keyword_tokens: frozenset[str],
+) -> list[dict[str, Any]]:
+    """Score search results into candidates, in the order they were retrieved.
+
+    Calls run in plan priority order (topic anchors first) and stop as soon as
+    ``_pool_is_sufficient``, so the remaining queries are never sent.
+    """
 
-    query_plan = _build_query_plan(topic, retry_strategy)
     seen_urls: set[str] = set()
     candidates: list[dict[str, Any]] = []
-    for query in query_plan["queries"]:
-        for item in provider.search(query, num_results=_MAX_RESULTS_PER_QUERY):
+    excluded_domains = {
+        str(item).strip().lower()
+        for item in retry_strategy.get("excluded_domains", [])
+        if isinstance(item, str) and str(item).strip()
+    }
+    search_calls = 0
+    stopped_early = False
+    plan_results = search_plan(provider, query_plan["queries"], num_results=_MAX_RESULTS_PER_QUERY)
+    for call, attributed in plan_results:
+        search_calls += 1
+        results = [item for member in call.members for item in attributed[member]]
+        for item in results:
             if not item.url or item.url in seen_urls:
                 continue
             seen_urls.add(item.url)
             domain = _extract_domain(item.url)
-            excluded_domains = {
-                str(item).strip().lower()
-                for item in retry_strategy.get("excluded_domains", [])
-                if isinstance(item, str) and str(item).strip()
-            }
             if "domain_concentration" in retry_strategy.get("failed_checks", []) and domain in excluded_domains:
                 if _authority_tier(domain) != "A":
                     continue
@@ -379,28 +613,94 @@ def generate_research(request: dict[str, Any]) -> dict[str, Any]:
                     ],
                 }
             )
+        if _pool_is_sufficient(candidates, keyword_tokens):
+            stopped_early = True
+            break
+    plan_results.close()
+
+    annotate(search_calls=search_calls, search_stopped_early=stopped_early)
+    return candidates
+
+
+def _candidate_pool_fingerprint(candidates: list[dict[str, Any]], intent_keywords: list[str]) -> str:
+    """Hash everything selection, enrichment and research QA read from a run.
+
+    That is each scored candidate (retry strategies change scores and filter
+    domains) and the intent keywords (which drive keyword coverage), but not the
+    query strings: two plans that retrieve and score the same pool are equivalent.
+    """
+
+    pool = sorted(
+        [
+            item["url"],
+            item["title"],
+            item["domain"],
+            item["publisher"],
+            item["doc_type"],
+            item["authority_tier"],
+            item["score"],
+            item["snippets"],
+        ]
+        for item in candidates
+    )
+    encoded = json.dumps([list(intent_keywords), pool], sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
 
-    candidates.sort(key=lambda row: (-float(row["score"]), row["url"]))
 
-    selected: list[dict[str, Any]] = []
-    per_domain_counts: dict[str, int] = {}
-    for item in candidates:
-        domain = str(item["domain"])
-        tier = str(item["authority_tier"])
-        count = per_domain_counts.get(domain, 0)
-        if tier != "A" and count >= _DOMAIN_CAP:
-            continue
-        per_domain_counts[domain] = count + 1
-        selected.append(item)
-        if len(selected) >= _MAX_SELECTED_SOURCES:
-            break
+def research_candidate_pool(request: dict[str, Any]) -> str | None:
+    """Fingerprint the scored candidate pool ``request`` would produce, without selecting or fetching.
+
+    Returns None unless the provider sets a truthy ``deterministic`` attribute
+    (same results for the same query), since otherwise the pool can't be predicted.
+    Runs untraced: its searches are a prediction, not work the research stage did.
+    """
+
+    topic = str(request.get("topic", "")).strip()
+    research_cfg = request.get("research", {}) if isinstance(request.get("research"), dict) else {}
+    provider = get_search_provider(
+        name=str(research_cfg.get("search_provider", "fallback")),
+        web=bool(research_cfg.get("web", False)),
+    )
+    if not getattr(provider, "deterministic", False):
+        return None
+    retry_strategy = _normalize_retry_strategy(research_cfg)
+    query_plan = _build_query_plan(topic, retry_strategy)
+    keyword_tokens = tokenize_all([topic, *query_plan["intent_keywords"]], _MIN_TOKEN_LENGTH)
+    with tracing_scope(None):
+        candidates = _gather_candidates(provider, topic, query_plan, retry_strategy, keyword_tokens)
+    return _candidate_pool_fingerprint(candidates, query_plan["intent_keywords"])
+
+
+def generate_research(request: dict[str, Any]) -> dict[str, Any]:
+    topic = str(request.get("topic", "")).strip()
+    audience = str(request.get("audience", "")).strip()
+    research_cfg = request.get("research", {}) if isinstance(request.get("research"), dict) else {}
+    web = bool(research_cfg.get("web", False))
+    search_provider = str(research_cfg.get("search_provider", "fallback"))
+    retry_strategy = _normalize_retry_strategy(research_cfg)
+    provider = get_search_provider(name=search_provider, web=web)
+
+    query_plan = _build_query_plan(topic, retry_strategy)
+    keyword_tokens = tokenize_all([topic, *query_plan["intent_keywords"]], _MIN_TOKEN_LENGTH)
+    candidates = _gather_candidates(provider, topic, query_plan, retry_strategy, keyword_tokens)
+    # Fingerprint before selection assigns ids and enrichment replaces snippets.
+    candidate_pool = _candidate_pool_fingerprint(candidates, query_plan["intent_keywords"])
+    candidates.sort(key=_candidate_rank)
+    selected = _select_sources(candidates, keyword_tokens)
 
     for idx, item in enumerate(selected, start=1):
         item["id"] = f"src_{idx:03d}"
 
-    if web and selected:
+    budget = get_budget()
+    enrich = web and bool(selected)
+    if enrich and budget is not None and budget.remaining_s() < _ENRICHMENT_MIN_REMAINING_S:
+        budget.degraded = True
+        annotate(enrichment_skipped="budget")
+        enrich = False
+
+    if enrich:
         enrichment_keywords = list(query_plan["intent_keywords"])
-        enrichment_keywords.extend(sorted(_tokenize(topic)))
+        enrichment_keywords.extend(sorted(tokenize(topic, _MIN_TOKEN_LENGTH)))
         tier_priority = {"A": 0, "B": 1, "C": 2, "D": 3}
         candidate_order = sorted(
             range(len(selected)),
@@ -410,21 +710,30 @@ def generate_research(request: dict[str, Any]) -> dict[str, Any]:
                 str(selected[idx].get("url", "")),
             ),
         )
-        for source_idx in candidate_order[:_MAX_ENRICHED_SOURCES]:
-            source = selected[source_idx]
-            html = fetch_extract.fetch_url(str(source.get("url", "")))
-            enriched_snippets = fetch_extract.extract_snippets(
-                html,
-                intent_keywords=enrichment_keywords,
-                max_snippets=4,
-            )
-            if enriched_snippets:
-                source["snippets"] = (enriched_snippets + list(source.get("snippets", [])))[:4]
-            source["retrieved_at"] = date.today().isoformat()
+        # Known-bad URLs (recent fetch failure or empty extraction) yield their
+        # slot to the next candidate instead of paying for another attempt.
+        negative_cache = get_negative_cache()
+        ordered = [
+            selected[idx]
+            for idx in candidate_order
+            if negative_cache.get(str(selected[idx].get("url", ""))) is None
+        ]
+        if len(ordered) < len(candidate_order):
+            annotate(enrichment_known_bad=len(candidate_order) - len(ordered))
+        if bool(research_cfg.get("hedged_enrichment", False)):
+            _enrich_hedged(ordered[: _MAX_ENRICHED_SOURCES + _ENRICHMENT_HEDGE], enrichment_keywords)
+        else:
+            for source in ordered[:_MAX_ENRICHED_SOURCES]:
+                _apply_snippets(source, _fetch_snippets(str(source.get("url", "")), enrichment_keywords))
 
     context_pack = _build_context_pack(topic, audience, selected)
-    return {
+    payload = {
         "query_plan": query_plan,
         "sources": selected,
         "context_pack": context_pack,
+        "metrics": {
+            **summarize_sources(selected, topic, query_plan["intent_keywords"]),
+            "candidate_pool": candidate_pool,
+        },
     }
+    return validate_artifact(payload, Research)
@@ -1,35 +1,58 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from pathlib import Path
 from typing import Any
 
 from training_factory.utils.json_schema import validate_json
+from training_factory.utils.text import tokenize, tokenize_all
 
 SCHEMA_PATH = Path(__file__).resolve().parents[3] / "schemas" / "research_qa.schema.json"
 
 
-def _tokenize(value: str) -> set[str]:
-    normalized = "".join(ch.lower() if ch.isalnum() else " " for ch in value)
-    return {token for token in normalized.split() if len(token) > 2}
+_MIN_TOKEN_LENGTH = 3
+# Bump whenever summarize_sources or the checks change how they read sources,
+# so metrics stored by older code stop matching and are recomputed.
+_METRICS_VERSION = 1
+
+
+def sources_digest(sources: list[Any], topic: str, intent_keywords: list[Any]) -> str:
+    """Hash everything ``summarize_sources`` reads, plus the scoring-rules version."""
+
+    material = [
+        _METRICS_VERSION,
+        topic.strip(),
+        [str(keyword) for keyword in intent_keywords],
+        [
+            [
+                source.get("id"),
+                source.get("authority_tier"),
+                source.get("domain"),
+                source.get("title"),
+                source.get("snippets"),
+            ]
+            for source in sources
+            if isinstance(source, dict)
+        ],
+    ]
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
 
 
-def generate_research_qa(research: dict[str, Any], request: dict[str, Any]) -> dict[str, Any]:
-    sources = research.get("sources", []) if isinstance(research.get("sources"), list) else []
-    query_plan = research.get("query_plan", {}) if isinstance(research.get("query_plan"), dict) else {}
-    topic = str(request.get("topic", ""))
-    intent_keywords = query_plan.get("intent_keywords", [])
-    if not isinstance(intent_keywords, list):
-        intent_keywords = []
+def summarize_sources(sources: list[Any], topic: str, intent_keywords: list[Any]) -> dict[str, Any]:
+    """Compute the source aggregates research QA checks.
+
+    ``generate_research`` stores the result as ``research["metrics"]`` so QA (and
+    every research retry) reuses it instead of re-walking and re-tokenizing sources.
+    """
 
     tier_counts = {"A": 0, "B": 0, "C": 0, "D": 0}
     domain_counts: dict[str, int] = {}
+    over_limit_domains: set[str] = set()
+    keyword_covered: list[str] = []
 
-    topic_tokens = _tokenize(topic)
-    for keyword in intent_keywords:
-        topic_tokens.update(_tokenize(str(keyword)))
-
-    covered_sources = 0
-    non_tier_a_domain_over_limit = False
+    topic_tokens = tokenize_all([topic, *(str(keyword) for keyword in intent_keywords)], _MIN_TOKEN_LENGTH)
 
     for source in sources:
         if not isinstance(source, dict):
@@ -44,7 +67,7 @@ def generate_research_qa(research: dict[str, Any], request: dict[str, Any]) -> d
         if domain:
             domain_counts[domain] = domain_counts.get(domain, 0) + 1
             if tier != "A" and domain_counts[domain] > 2:
-                non_tier_a_domain_over_limit = True
+                over_limit_domains.add(domain)
 
         snippets = source.get("snippets", [])
         snippet_text = ""
@@ -54,12 +77,56 @@ def generate_research_qa(research: dict[str, Any], request: dict[str, Any]) -> d
                 if isinstance(snippet, dict):
                     snippet_parts.append(str(snippet.get("text", "")))
             snippet_text = " ".join(snippet_parts)
-        content_tokens = _tokenize(f"{source.get('title', '')} {snippet_text}")
+        content_tokens = tokenize(f"{source.get('title', '')} {snippet_text}", _MIN_TOKEN_LENGTH)
         if topic_tokens & content_tokens:
-            covered_sources += 1
+            keyword_covered.append(str(source.get("id", "")))
+
+    return {
+        "topic": topic.strip(),
+        "tier_counts": tier_counts,
+        "domain_counts": domain_counts,
+        "over_limit_domains": sorted(over_limit_domains),
+        "keyword_covered": keyword_covered,
+        "sources_digest": sources_digest(sources, topic, intent_keywords),
+    }
+
+
+def _stored_metrics(
+    research: dict[str, Any],
+    sources: list[Any],
+    topic: str,
+    intent_keywords: list[Any],
+) -> dict[str, Any] | None:
+    """Return ``research["metrics"]`` only if it was computed from exactly these sources and rules."""
+
+    metrics = research.get("metrics")
+    if not isinstance(metrics, dict) or metrics.get("topic") != topic.strip() or not metrics.get("sources_digest"):
+        return None
+    if metrics["sources_digest"] != sources_digest(sources, topic, intent_keywords):
+        return None
+    return metrics
+
+
+def generate_research_qa(
+    research: dict[str, Any],
+    request: dict[str, Any],
+    *,
+    reuse_metrics: bool = True,
+) -> dict[str, Any]:
+    """Check a research payload; ``reuse_metrics=False`` ignores any stored ``metrics``."""
+
+    sources = research.get("sources", []) if isinstance(research.get("sources"), list) else []
+    query_plan = research.get("query_plan", {}) if isinstance(research.get("query_plan"), dict) else {}
+    topic = str(request.get("topic", ""))
+    intent_keywords = query_plan.get("intent_keywords", [])
+    if not isinstance(intent_keywords, list):
+        intent_keywords = []
 
     source_count = len([source for source in sources if isinstance(source, dict)])
-    keyword_coverage_ratio = covered_sources / source_count if source_count else 0.0
+    stored = _stored_metrics(research, sources, topic, intent_keywords) if reuse_metrics else None
+    metrics = stored or summarize_sources(sources, topic, intent_keywords)
+    tier_counts = dict(metrics["tier_counts"])
+    keyword_coverage_ratio = len(metrics["keyword_covered"]) / source_count if source_count else 0.0
 
     checks = [
         {"prompt": "At least 3 sources are present", "answer": "Yes" if source_count >= 3 else "No"},
@@ -73,7 +140,7 @@ def generate_research_qa(research: dict[str, Any], request: dict[str, Any]) -> d
         },
         {
             "prompt": "No non-Tier-A domain has more than 2 sources",
-            "answer": "Yes" if not non_tier_a_domain_over_limit else "No",
+            "answer": "Yes" if not metrics["over_limit_domains"] else "No",
         },
     ]
 
@@ -83,9 +150,9 @@ def generate_research_qa(research: dict[str, Any], request: dict[str, Any]) -> d
         "checks": checks,
         "metrics": {
             "tier_counts": tier_counts,
-            "domain_counts": domain_counts,
+            "domain_counts": dict(metrics["domain_counts"]),
             "keyword_coverage_ratio": round(keyword_coverage_ratio, 3),
         },
     }
-    validate_json(payload, SCHEMA_PATH)
+    validate_json(payload, SCHEMA_PATH, stage=True)
     return payload
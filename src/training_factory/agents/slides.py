@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import Any
 
 from training_factory import llm
+from training_factory.artifacts import Slides
 from training_factory.utils.structured_output import generate_structured_output
 
 SCHEMA_PATH = Path(__file__).resolve().parents[3] / "schemas" / "slides.schema.json"
@@ -103,4 +104,5 @@ def generate_slides(curriculum: dict[str, Any], *, retry_strategy: dict[str, Any
         schema_path=SCHEMA_PATH,
         normalize=_normalize,
         offline_stub=fallback,
+        artifact_model=Slides,
     )
@@ -3,14 +3,15 @@ from pathlib import Path
 from typing import Any
 
 from training_factory import llm
+from training_factory.artifacts import Templates
+from training_factory.utils.json_schema import load_schema
 from training_factory.utils.structured_output import generate_structured_output
 
 SCHEMA_PATH = Path(__file__).resolve().parents[3] / "schemas" / "templates.schema.json"
 
 
 def _schema_mode() -> str:
-    schema = json.loads(SCHEMA_PATH.read_text(encoding="utf-8"))
-    required = schema.get("required", [])
+    required = load_schema(SCHEMA_PATH).get("required", [])
     if "README.md" in required:
         return "legacy"
     return "structured"
@@ -260,4 +261,5 @@ def generate_templates(slides: dict[str, Any], *, retry_strategy: dict[str, Any]
         schema_path=SCHEMA_PATH,
         normalize=_normalize,
         offline_stub=fallback,
+        artifact_model=Templates if mode == "structured" else None,
     )
@@ -0,0 +1,177 @@
+"""Typed models for pipeline artifacts.
+
+These mirror ``schemas/*.schema.json`` (the schemas remain the contract; a test
+keeps the two in sync). Agents validate their output once through these models
+instead of running jsonschema per stage. Models are strict and forbid unknown
+keys so they accept exactly what the schemas accept.
+"""
+
+from __future__ import annotations
+
+from typing import Annotated, Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator
+from pydantic.json_schema import SkipJsonSchema
+
+from training_factory.settings import get_settings
+
+NonEmptyStr = Annotated[str, StringConstraints(min_length=1)]
+
+
+class _Artifact(BaseModel):
+    model_config = ConfigDict(strict=True, extra="forbid")
+
+    # Fields declared as ``X | SkipJsonSchema[None] = None`` are optional in the
+    # schema but must be an ``X`` when present. Defaults are not validated, so
+    # this only rejects a null the payload spells out.
+    @field_validator("*", mode="before")
+    @classmethod
+    def _reject_null(cls, value: Any) -> Any:
+        if value is None:
+            raise ValueError("must not be null")
+        return value
+
+
+class QueryPlan(_Artifact):
+    queries: list[Annotated[str, StringConstraints(min_length=3)]] = Field(min_length=4, max_length=6)
+    intent_keywords: list[Annotated[str, StringConstraints(min_length=2)]] = Field(min_length=1)
+    preferred_domains: list[str]
+    product: Literal["power_bi", "power_apps", "power_platform", "enterprise_chatgpt", "generic"]
+
+
+class Snippet(_Artifact):
+    heading: str
+    text: str
+    loc: str
+
+
+class Source(_Artifact):
+    id: Annotated[str, StringConstraints(pattern=r"^src_[0-9]{3}$")]
+    title: NonEmptyStr
+    url: Annotated[str, StringConstraints(min_length=8)]
+    domain: NonEmptyStr
+    publisher: str
+    doc_type: str
+    retrieved_at: str | SkipJsonSchema[None] = None
+    authority_tier: Literal["A", "B", "C", "D"]
+    score: float
+    snippets: list[Snippet]
+
+
+class TierCounts(_Artifact):
+    A: int = Field(ge=0)
+    B: int = Field(ge=0)
+    C: int = Field(ge=0)
+    D: int = Field(ge=0)
+
+
+class ResearchMetrics(_Artifact):
+    topic: str
+    tier_counts: TierCounts
+    domain_counts: dict[str, Annotated[int, Field(ge=0)]]
+    over_limit_domains: list[str]
+    keyword_covered: list[str]
+    sources_digest: str | SkipJsonSchema[None] = None
+    candidate_pool: str | SkipJsonSchema[None] = None
+
+
+class Research(_Artifact):
+    query_plan: QueryPlan
+    sources: list[Source]
+    context_pack: Annotated[str, StringConstraints(min_length=1, max_length=6000)]
+    metrics: ResearchMetrics | SkipJsonSchema[None] = None
+
+
+class KeyGuideline(_Artifact):
+    guideline: NonEmptyStr
+    rationale: NonEmptyStr
+    sources: list[NonEmptyStr] = Field(min_length=1)
+
+
+class Brief(_Artifact):
+    topic: str
+    audience: str
+    goals: list[str]
+    constraints: list[str]
+    references_used: list[NonEmptyStr] = Field(min_length=1)
+    key_guidelines: list[KeyGuideline] = Field(min_length=1)
+
+
+class CurriculumModule(_Artifact):
+    model_config = ConfigDict(strict=True, extra="allow")
+
+    title: str
+    duration_minutes: int = Field(ge=1)
+    sources: list[NonEmptyStr] = Field(min_length=1)
+
+
+class Curriculum(_Artifact):
+    topic: str
+    audience: str
+    references_used: list[NonEmptyStr] = Field(min_length=1)
+    modules: list[CurriculumModule]
+
+
+class Slide(_Artifact):
+    slide: int = Field(ge=1)
+    title: str
+    bullets: list[str]
+
+
+class Slides(_Artifact):
+    deck: list[Slide]
+
+
+class LabStep(_Artifact):
+    step: int = Field(ge=1)
+    instruction: Annotated[str, StringConstraints(min_length=5)]
+    expected_output: str | SkipJsonSchema[None] = None
+
+
+class Lab(_Artifact):
+    title: Annotated[str, StringConstraints(min_length=3)]
+    objective: Annotated[str, StringConstraints(min_length=10)]
+    prerequisites: list[str]
+    setup: list[str] = Field(default_factory=list)
+    steps: list[LabStep] = Field(min_length=3)
+    checkpoints: list[Annotated[str, StringConstraints(min_length=5)]] = Field(min_length=2)
+
+
+class ReadmeDoc(_Artifact):
+    filename: Literal["README.md"] | SkipJsonSchema[None] = None
+    content: Annotated[str, StringConstraints(min_length=50)]
+
+
+class RunbookDoc(_Artifact):
+    filename: Literal["RUNBOOK.md"] | SkipJsonSchema[None] = None
+    content: Annotated[str, StringConstraints(min_length=50)]
+
+
+class Templates(_Artifact):
+    readme_md: ReadmeDoc
+    runbook_md: RunbookDoc
+
+
+# Artifact model for each schema file it mirrors.
+ARTIFACT_MODELS: dict[str, type[BaseModel]] = {
+    "research.schema.json": Research,
+    "brief.schema.json": Brief,
+    "curriculum.schema.json": Curriculum,
+    "slides.schema.json": Slides,
+    "lab.schema.json": Lab,
+    "templates.schema.json": Templates,
+}
+
+
+def validate_artifact(payload: dict[str, Any], model: type[BaseModel], *, stage: bool = True) -> dict[str, Any]:
+    """Validate ``payload`` against ``model`` and return it unchanged.
+
+    Honors the ``validation`` setting like ``validate_json``. Raises pydantic's
+    ``ValidationError`` (a ``ValueError``) on failure.
+    """
+
+    level = get_settings().validation
+    if level == "off" or (stage and level == "final-only"):
+        return payload
+    model.model_validate(payload)
+    return payload
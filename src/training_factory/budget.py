@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class RunBudget:
+    """Wall-clock budget for a single pipeline run."""
+
+    deadline_s: float
+    started_at: float = field(default_factory=time.monotonic)
+    stage_durations: dict[str, float] = field(default_factory=dict)
+    degraded: bool = False
+
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining_s(self) -> float:
+        return max(0.0, self.deadline_s - self.elapsed_s())
+
+    def expired(self) -> bool:
+        return self.remaining_s() <= 0.0
+
+    def record(self, stage: str, duration_s: float) -> None:
+        self.stage_durations[stage] = max(0.0, duration_s)
+
+    def estimate(self, stages: Iterable[str]) -> float:
+        """Estimate the cost of ``stages`` from the last observed duration of each.
+
+        A stage with no recorded duration yet (one still running, or one the run
+        has not reached) is costed at the mean recorded stage duration rather
+        than as free.
+        """
+
+        observed = self.stage_durations
+        unrecorded_s = sum(observed.values()) / len(observed) if observed else 0.0
+        return sum(observed.get(stage, unrecorded_s) for stage in stages)
+
+    def can_afford(self, stages: Iterable[str]) -> bool:
+        return self.remaining_s() > self.estimate(stages)
+
+
+def _coerce_deadline(value: Any) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    if isinstance(value, str):
+        try:
+            parsed = float(value.strip())
+        except ValueError:
+            return None
+        return parsed if parsed > 0 else None
+    return None
+
+
+def budget_from_request(request: dict[str, Any]) -> RunBudget | None:
+    """Build a budget from ``request["budget"]["deadline_s"]``, if present."""
+
+    budget_cfg = request.get("budget", {})
+    if not isinstance(budget_cfg, dict):
+        return None
+    deadline_s = _coerce_deadline(budget_cfg.get("deadline_s"))
+    if deadline_s is None:
+        return None
+    return RunBudget(deadline_s=deadline_s)
+
+
+_current_budget: ContextVar[RunBudget | None] = ContextVar("training_factory_budget", default=None)
+
+
+def get_budget() -> RunBudget | None:
+    return _current_budget.get()
+
+
+@contextmanager
+def budget_scope(budget: RunBudget | None) -> Iterator[RunBudget | None]:
+    """Make ``budget`` the active run budget for the current context."""
+
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def clamp_timeout(timeout: float) -> float:
+    """Shrink a network timeout to the remaining run budget.
+
+    Returns ``timeout`` unchanged when no budget is active, and ``0.0`` once the
+    budget is spent (callers should then skip the call). Any call that gets a
+    shortened or zero timeout marks the run as degraded.
+    """
+
+    budget = _current_budget.get()
+    if budget is None:
+        return timeout
+    remaining = budget.remaining_s()
+    if remaining < timeout:
+        budget.degraded = True
+        return remaining
+    return timeout
@@ -1,16 +1,22 @@
 import json
 import os
-from contextlib import contextmanager
+import re
+import time
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import typer
 
-from training_factory.graph import run_pipeline
-from training_factory.settings import get_settings
+from training_factory.profiling import Profiler
+from training_factory.settings import offline_override, settings_override
+from training_factory.tracing import Tracer
+from training_factory.utils.bundle_io import BundleFormat, bundle_suffix, read_bundle, write_bundle
 from training_factory.utils.json_schema import validate_json
 
+if TYPE_CHECKING:
+    from training_factory.graph import PipelineEvent
+
 app = typer.Typer(add_completion=False, help="Generate training assets from a topic.")
 SCHEMA_PATH = Path(__file__).resolve().parents[2] / "schemas" / "bundle.schema.json"
 
@@ -20,28 +26,27 @@ class SearchProviderChoice(str, Enum):
     fallback = "fallback"
 
 
-@app.callback()
-def main() -> None:
-    """CLI entrypoint for training-factory commands."""
+class BundleFormatChoice(str, Enum):
+    json = "json"
+    json_compact = "json-compact"
+    json_gz = "json.gz"
+    ndjson = "ndjson"
 
 
-@contextmanager
-def _offline_override(enabled: bool):
-    if not enabled:
-        yield
-        return
+class ValidationChoice(str, Enum):
+    strict = "strict"
+    final_only = "final-only"
+    off = "off"
 
-    previous = os.environ.get("TRAINING_FACTORY_OFFLINE")
-    os.environ["TRAINING_FACTORY_OFFLINE"] = "1"
-    get_settings.cache_clear()
-    try:
-        yield
-    finally:
-        if previous is None:
-            os.environ.pop("TRAINING_FACTORY_OFFLINE", None)
-        else:
-            os.environ["TRAINING_FACTORY_OFFLINE"] = previous
-        get_settings.cache_clear()
+
+class ProfileChoice(str, Enum):
+    cprofile = "cprofile"
+    tracemalloc = "tracemalloc"
+
+
+@app.callback()
+def main() -> None:
+    """CLI entrypoint for training-factory commands."""
 
 
 def _extract_bundle(state: Any) -> dict[str, Any]:
@@ -55,11 +60,32 @@ def _extract_bundle(state: Any) -> dict[str, Any]:
     raise typer.BadParameter("Pipeline did not return a valid packaging bundle")
 
 
+def _render_progress(event: "PipelineEvent") -> None:
+    prefix = f"[{event.elapsed_s:7.2f}s]"
+    counters = f"research_rev={event.research_revision_count} qa_rev={event.revision_count}"
+    if event.kind == "node_start":
+        typer.echo(f"{prefix} {event.node} started ({counters})", err=True)
+    elif event.kind == "node_end":
+        sizes = ", ".join(f"{key}={size}B" for key, size in sorted(event.artifact_sizes.items()))
+        detail = f"; {sizes}" if sizes else ""
+        typer.echo(
+            f"{prefix} {event.node} finished in {event.duration_s or 0.0:.2f}s ({counters}{detail})",
+            err=True,
+        )
+    else:
+        typer.echo(f"{prefix} pipeline finished ({counters})", err=True)
+
+
 @app.command("generate")
 def generate(
     topic: str = typer.Option(..., "--topic", help="Training topic to generate."),
     audience: str = typer.Option("novice", "--audience", help="Target audience profile."),
     out: Path = typer.Option(Path("bundle.json"), "--out", help="Output bundle JSON path."),
+    bundle_format: BundleFormatChoice = typer.Option(
+        BundleFormatChoice.json,
+        "--format",
+        help="Bundle encoding: indented json, json-compact, gzip-compressed json.gz, or one section per line ndjson.",
+    ),
     offline: bool = typer.Option(False, "--offline", help="Force offline mode for this run."),
     web: bool = typer.Option(False, "--web", help="Enable web-capable research provider selection."),
     research_max_retries: int = typer.Option(
@@ -79,33 +105,95 @@ def generate(
         "--search-provider",
         help="Research search provider to use.",
     ),
+    hedged_enrichment: bool = typer.Option(
+        False,
+        "--hedged-enrichment",
+        help="Fetch extra pages concurrently during web enrichment and keep the first that return.",
+    ),
+    deadline_s: float | None = typer.Option(
+        None,
+        "--deadline-s",
+        min=0.0,
+        help="Run-level time budget in seconds; bounds timeouts, enrichment, and retries.",
+    ),
+    progress: bool = typer.Option(
+        False,
+        "--progress",
+        help="Print per-node progress events to stderr while the pipeline runs.",
+    ),
+    trace_jsonl: Path | None = typer.Option(
+        None,
+        "--trace-jsonl",
+        help="Write node, LLM, search, and fetch spans to this JSONL file.",
+    ),
+    trace_chrome: Path | None = typer.Option(
+        None,
+        "--trace-chrome",
+        help="Write spans in Chrome trace-event format to this file.",
+    ),
+    profile: ProfileChoice | None = typer.Option(
+        None,
+        "--profile",
+        help="Profile the run and write pstats/summary (cprofile) or per-node memory peaks (tracemalloc) next to the bundle.",
+    ),
 ) -> None:
-    request = {
+    research: dict[str, Any] = {
+        "web": web,
+        "search_provider": search_provider.value,
+        "max_retries": research_max_retries,
+    }
+    if hedged_enrichment:
+        research["hedged_enrichment"] = True
+    request: dict[str, Any] = {
         "topic": topic,
         "audience": audience,
-        "research": {
-            "web": web,
-            "search_provider": search_provider.value,
-            "max_retries": research_max_retries,
-        },
+        "research": research,
         "qa": {
             "max_retries": qa_max_retries,
         },
     }
+    budget = {"deadline_s": deadline_s} if deadline_s else None
 
-    with _offline_override(offline):
-        state = run_pipeline(
-            topic=request["topic"],
-            audience=request["audience"],
-            research=request["research"],
-            qa=request["qa"],
-        )
+    # Deferred so `--help` and argument errors don't pay for langgraph/langchain.
+    from training_factory.graph import run_pipeline, stream_pipeline
+
+    tracer = Tracer()
+    profiler = Profiler(profile.value) if profile is not None else None
+    with offline_override(offline):
+        if progress:
+            state = None
+            for event in stream_pipeline(
+                topic=request["topic"],
+                audience=request["audience"],
+                research=research,
+                qa=request["qa"],
+                budget=budget,
+                tracer=tracer,
+                profiler=profiler,
+            ):
+                _render_progress(event)
+                if event.kind == "run_end":
+                    state = event.state
+        else:
+            state = run_pipeline(
+                topic=request["topic"],
+                audience=request["audience"],
+                research=research,
+                qa=request["qa"],
+                budget=budget,
+                tracer=tracer,
+                profiler=profiler,
+            )
+
+    if trace_jsonl is not None:
+        tracer.write_jsonl(trace_jsonl)
+    if trace_chrome is not None:
+        tracer.write_chrome_trace(trace_chrome)
 
     bundle = _extract_bundle(state)
     validate_json(bundle, SCHEMA_PATH)
 
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(bundle, indent=2) + "\n", encoding="utf-8")
+    write_bundle(bundle, out, bundle_format.value)
 
     brief_topic = bundle.get("brief", {}).get("topic")
     request_topic = bundle.get("request", {}).get("topic")
@@ -123,6 +211,198 @@ def generate(
     typer.echo(f"Curriculum modules: {module_count}")
     typer.echo(f"Slides: {slide_count}")
     typer.echo(f"QA status: {qa_status}")
+    if profiler is not None:
+        for path in profiler.write(out):
+            typer.echo(f"Wrote profile to {path}")
+
+
+def _batch_bundle_name(line_number: int, payload: dict[str, Any], suffix: str = ".json") -> str:
+    raw_id = payload.get("id", payload.get("request_id"))
+    if isinstance(raw_id, (str, int)) and str(raw_id).strip():
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "-", str(raw_id).strip()).strip(".-")
+        if slug:
+            return f"{slug}{suffix}"
+    return f"line-{line_number:05d}{suffix}"
+
+
+def _existing_bundle_is_valid(path: Path) -> bool:
+    if not path.is_file():
+        return False
+    try:
+        validate_json(read_bundle(path), SCHEMA_PATH)
+    except Exception:
+        return False
+    return True
+
+
+def _write_bundle_atomically(bundle: dict[str, Any], path: Path, bundle_format: BundleFormat) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    write_bundle(bundle, tmp_path, bundle_format)
+    os.replace(tmp_path, path)
+
+
+@app.command("generate-batch")
+def generate_batch(
+    in_path: Path = typer.Option(
+        ...,
+        "--in",
+        exists=True,
+        dir_okay=False,
+        help="JSONL file with one request object (topic, audience, research, qa, budget, id) per line.",
+    ),
+    out_dir: Path = typer.Option(..., "--out-dir", help="Directory for bundles and summary.jsonl."),
+    workers: int = typer.Option(4, "--workers", min=1, help="Number of concurrent pipeline runs."),
+    offline: bool = typer.Option(False, "--offline", help="Force offline mode for every run."),
+    bundle_format: BundleFormatChoice = typer.Option(
+        BundleFormatChoice.json,
+        "--format",
+        help="Bundle encoding; also sets the bundle file suffix.",
+    ),
+    validation: ValidationChoice | None = typer.Option(
+        None,
+        "--validation",
+        help="Schema validation level (default: TRAINING_FACTORY_VALIDATION, else strict).",
+    ),
+) -> None:
+    """Generate one bundle per JSONL request, skipping bundles that already exist and validate."""
+
+    overrides = {"validation": validation.value} if validation is not None else {}
+    with settings_override(**overrides), offline_override(offline):
+        _generate_batch(in_path, out_dir, workers, bundle_format)
+
+
+def _generate_batch(in_path: Path, out_dir: Path, workers: int, bundle_format: BundleFormatChoice) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = out_dir / "summary.jsonl"
+
+    rows: list[dict[str, Any]] = []
+    pending: list[dict[str, Any]] = []
+    targets: list[tuple[int, Path]] = []
+    claimed: dict[Path, int] = {}
+    for line_number, line in enumerate(in_path.read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            rows.append({"line": line_number, "status": "error", "error": f"Invalid JSON: {exc}"})
+            continue
+        if not isinstance(payload, dict):
+            rows.append({"line": line_number, "status": "error", "error": "Request must be a JSON object"})
+            continue
+
+        bundle_path = out_dir / _batch_bundle_name(line_number, payload, bundle_suffix(bundle_format.value))
+        base_row = {"line": line_number, "topic": payload.get("topic"), "bundle_path": str(bundle_path)}
+        if bundle_path in claimed:
+            # Two requests resolving to one file would overwrite each other.
+            error = f"Duplicate bundle name; line {claimed[bundle_path]} already writes {bundle_path.name}"
+            rows.append({**base_row, "status": "error", "error": error})
+            continue
+        claimed[bundle_path] = line_number
+        if _existing_bundle_is_valid(bundle_path):
+            rows.append({**base_row, "status": "skipped", "duration_s": 0.0})
+            continue
+        pending.append(payload)
+        targets.append((line_number, bundle_path))
+
+    from training_factory.graph import run_pipeline_batch
+
+    started = time.perf_counter()
+    # Append, so a resumed run keeps the earlier rows; the last row per line is current.
+    with summary_path.open("a", encoding="utf-8") as summary:
+        for row in rows:
+            summary.write(json.dumps(row) + "\n")
+        summary.flush()
+
+        for result in run_pipeline_batch(pending, max_workers=workers):
+            line_number, bundle_path = targets[result.index]
+            result_row: dict[str, Any] = {
+                "line": line_number,
+                "topic": result.request.get("topic"),
+                "bundle_path": str(bundle_path),
+                "duration_s": round(result.duration_s, 3),
+            }
+            try:
+                if not result.ok or result.state is None:
+                    raise RuntimeError(result.error or "Pipeline failed")
+                bundle = _extract_bundle(result.state)
+                validate_json(bundle, SCHEMA_PATH)
+                _write_bundle_atomically(bundle, bundle_path, bundle_format.value)
+                result_row.update({"status": "ok", "qa_status": bundle.get("qa", {}).get("status", "unknown")})
+            except Exception as exc:
+                result_row.update({"status": "error", "error": str(exc)})
+            rows.append(result_row)
+            summary.write(json.dumps(result_row) + "\n")
+            summary.flush()
+
+    counts = {status: sum(1 for row in rows if row["status"] == status) for status in ("ok", "skipped", "error")}
+    typer.echo(f"Wrote summary to {summary_path}")
+    typer.echo(
+        f"ok={counts['ok']} skipped={counts['skipped']} error={counts['error']} "
+        f"elapsed_s={time.perf_counter() - started:.2f}"
+    )
+    if counts["error"]:
+        raise typer.Exit(code=1)
+
+
+@app.command("rescore")
+def rescore(
+    paths: list[Path] = typer.Argument(..., exists=True, help="Bundle files or directories of bundles."),
+    out: Path = typer.Option(..., "--out", help="Where to write one JSONL result row per bundle."),
+    workers: int = typer.Option(1, "--workers", min=1, help="Number of scoring processes."),
+) -> None:
+    """Re-run deliverable QA and research QA over stored bundles with the current rules."""
+
+    from training_factory.qa_batch import rescore_paths
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    counts = {"pass": 0, "fail": 0, "changed": 0, "error": 0}
+    started = time.perf_counter()
+    with out.open("w", encoding="utf-8") as results:
+        for result in rescore_paths(paths, workers=workers):
+            row = result.to_row()
+            results.write(json.dumps(row) + "\n")
+            if row["status"] == "error":
+                counts["error"] += 1
+                continue
+            counts[row["qa_status"]] += 1
+            counts["changed"] += int(row["qa_changed"] or row["research_qa_changed"])
+
+    typer.echo(f"Wrote results to {out}")
+    typer.echo(
+        f"pass={counts['pass']} fail={counts['fail']} changed={counts['changed']} error={counts['error']} "
+        f"elapsed_s={time.perf_counter() - started:.2f}"
+    )
+    if counts["error"]:
+        raise typer.Exit(code=1)
+
+
+@app.command("serve")
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind."),
+    port: int = typer.Option(8765, "--port", min=0, max=65535, help="TCP port to listen on."),
+    workers: int = typer.Option(4, "--workers", min=1, help="Number of concurrent pipeline runs."),
+    max_queued: int = typer.Option(
+        64, "--max-queued", min=0, help="Jobs allowed to wait for a worker before POST /generate returns 503."
+    ),
+    offline: bool = typer.Option(False, "--offline", help="Force offline mode for every run."),
+) -> None:
+    """Serve POST /generate, GET /jobs/<id>, and GET /healthz with warm pipeline state."""
+
+    from training_factory.server import make_server
+
+    server = make_server(host, port, max_workers=workers, max_queued=max_queued, offline=offline)
+    bound_host, bound_port = server.server_address[:2]
+    if isinstance(bound_host, bytes):
+        bound_host = bound_host.decode("ascii")
+    typer.echo(f"Serving training-factory on http://{bound_host}:{bound_port} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
 
 
 if __name__ == "__main__":
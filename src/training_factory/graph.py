@@ -1,5 +1,12 @@
+import contextvars
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, TypedDict, cast
+from typing import Any, Literal, TypedDict, cast
 
 from langgraph.graph import END, START, StateGraph
 
@@ -7,12 +14,17 @@ from training_factory.agents.brief import generate_brief
 from training_factory.agents.curriculum import generate_curriculum
 from training_factory.agents.lab import generate_lab
 from training_factory.agents.qa import generate_qa
-from training_factory.agents.research import generate_research
+from training_factory.agents.research import generate_research, research_candidate_pool
 from training_factory.agents.research_qa import generate_research_qa
 from training_factory.agents.slides import generate_slides
 from training_factory.agents.templates import generate_templates
+from training_factory.budget import budget_from_request, budget_scope, get_budget
+from training_factory.profiling import Profiler, profile_node, profiling_scope
+from training_factory.settings import get_settings, offline_override
 from training_factory.state import TrainingState
+from training_factory.tracing import Tracer, get_tracer, span, tracing_scope
 from training_factory.utils.json_schema import validate_json
+from training_factory.utils.stage_cache import cached_stage
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 SCHEMA_DIR = ROOT_DIR / "schemas"
@@ -31,6 +43,19 @@ class GraphState(TypedDict):
     packaging: dict[str, Any]
     research_revision_count: int
     revision_count: int
+    skipped_retries: list[dict[str, Any]]
+
+
+# Nodes re-run by each retry loop, used to estimate whether the remaining run
+# budget can cover another pass.
+_RESEARCH_LOOP_STAGES = ("research_retry", "research", "research_qa")
+_QA_LOOP_STAGES = ("qa_retry", "slides", "lab", "templates", "qa")
+# Nodes that still run once a loop passes; a retry must leave time for them too.
+_RESEARCH_TAIL_STAGES = ("brief", "curriculum", "slides", "lab", "templates", "qa", "package")
+_QA_TAIL_STAGES = ("package",)
+# QA-loop stages whose offline output is the stub built from their inputs alone:
+# retry_strategy only shapes the LLM prompt, so an offline QA retry repeats them.
+_OFFLINE_INVARIANT_NODES = frozenset({"slides", "lab", "templates"})
 
 
 def _coerce_non_negative_int(value: Any, default: int = 0) -> int:
@@ -69,18 +94,100 @@ def _qa_max_retries(state: GraphState) -> int:
 
 
 def _research_node(state: GraphState) -> dict[str, Any]:
-    research = generate_research(state["request"])
+    request = state["request"]
+    research = cached_stage(
+        "research",
+        {
+            "topic": request.get("topic"),
+            "audience": request.get("audience"),
+            "research": request.get("research"),
+        },
+        generate_research,
+        lambda: generate_research(request),
+    )
     return {"research": research}
 
 
 def _brief_node(state: GraphState) -> dict[str, Any]:
-    brief = generate_brief(state["request"], state.get("research", {}))
+    request = state["request"]
+    research = state.get("research", {})
+    brief = cached_stage(
+        "brief",
+        {"topic": request.get("topic"), "audience": request.get("audience"), "research": research},
+        generate_brief,
+        lambda: generate_brief(request, research),
+    )
     return {"brief": brief}
 
 
+def _offline_stubs_are_fixed() -> bool:
+    settings = get_settings()
+    if not settings.offline_mode and settings.openai_api_key:
+        return False
+    stages = {"slides": generate_slides, "lab": generate_lab, "templates": generate_templates}
+    # Only the stock agents are known to be invariant; a replaced stage may not be.
+    return all(
+        getattr(stages[node], "__module__", None) == f"training_factory.agents.{node}"
+        for node in _OFFLINE_INVARIANT_NODES
+    )
+
+
+def _research_retry_is_futile(state: GraphState) -> bool:
+    metrics = state.get("research", {}).get("metrics")
+    pool = metrics.get("candidate_pool") if isinstance(metrics, dict) else None
+    if not pool:
+        return False
+    return research_candidate_pool(_next_research_request(state)) == pool
+
+
+def _retry_skip_reason(state: GraphState, loop: str) -> str | None:
+    budget = get_budget()
+    if loop == "research":
+        remaining_stages: tuple[str, ...] = _RESEARCH_LOOP_STAGES + _RESEARCH_TAIL_STAGES
+    else:
+        remaining_stages = _QA_LOOP_STAGES + _QA_TAIL_STAGES
+    if budget is not None and not budget.can_afford(remaining_stages):
+        return "budget"
+    # A retry that would see the same inputs reproduces the same failure.
+    if loop == "research" and _research_retry_is_futile(state):
+        return "identical_results"
+    if loop == "qa" and _offline_stubs_are_fixed():
+        return "offline_stubs"
+    return None
+
+
+def _with_skipped_retry(
+    state: GraphState,
+    update: dict[str, Any],
+    *,
+    loop: str,
+    attempt: int,
+    reason: str,
+) -> dict[str, Any]:
+    skipped = list(state.get("skipped_retries", []) or [])
+    skipped.append({"loop": loop, "attempt": attempt, "reason": reason})
+    return {**update, "skipped_retries": skipped}
+
+
+def _retry_was_skipped(state: GraphState, loop: str, attempt: int) -> bool:
+    return any(
+        isinstance(item, dict) and item.get("loop") == loop and item.get("attempt") == attempt
+        for item in state.get("skipped_retries", []) or []
+    )
+
+
 def _research_qa_node(state: GraphState) -> dict[str, Any]:
     research_qa = generate_research_qa(state.get("research", {}), state["request"])
-    return {"research_qa": research_qa}
+    update: dict[str, Any] = {"research_qa": research_qa}
+    revision_count = int(state.get("research_revision_count", 0))
+    if research_qa.get("status") == "fail" and revision_count < _research_max_retries(state):
+        # Judge the retry against the checks that just failed, as the retry node will.
+        reason = _retry_skip_reason(cast(GraphState, {**state, "research_qa": research_qa}), "research")
+        if reason is not None:
+            update = _with_skipped_retry(
+                state, update, loop="research", attempt=revision_count + 1, reason=reason
+            )
+    return update
 
 
 def _failed_research_qa_checks(research_qa: dict[str, Any]) -> list[str]:
@@ -119,7 +226,9 @@ def _overused_non_tier_a_domains(research: dict[str, Any]) -> list[str]:
     return sorted(domain for domain, count in counts.items() if count > 2)
 
 
-def _research_retry_node(state: GraphState) -> dict[str, Any]:
+def _next_research_request(state: GraphState) -> dict[str, Any]:
+    """The request the next research attempt runs with: failed checks become its retry strategy."""
+
     revision_count = int(state.get("research_revision_count", 0))
     request = state.get("request", {})
     if not isinstance(request, dict):
@@ -138,17 +247,21 @@ def _research_retry_node(state: GraphState) -> dict[str, Any]:
         retry_strategy["excluded_domains"] = excluded_domains
 
     return {
-        "research_revision_count": revision_count + 1,
-        "request": {
-            **request,
-            "research": {
-                **research_cfg,
-                "retry_strategy": retry_strategy,
-            },
+        **request,
+        "research": {
+            **research_cfg,
+            "retry_strategy": retry_strategy,
         },
     }
 
 
+def _research_retry_node(state: GraphState) -> dict[str, Any]:
+    return {
+        "research_revision_count": int(state.get("research_revision_count", 0)) + 1,
+        "request": _next_research_request(state),
+    }
+
+
 def _failed_qa_checks(qa: dict[str, Any]) -> list[str]:
     checks = qa.get("checks", [])
     if not isinstance(checks, list):
@@ -217,22 +330,50 @@ def _qa_retry_node(state: GraphState) -> dict[str, Any]:
 
 
 def _curriculum_node(state: GraphState) -> dict[str, Any]:
-    curriculum = generate_curriculum(state["brief"], state["research"])
+    brief = state["brief"]
+    research = state["research"]
+    curriculum = cached_stage(
+        "curriculum",
+        {"brief": brief, "research": research},
+        generate_curriculum,
+        lambda: generate_curriculum(brief, research),
+    )
     return {"curriculum": curriculum}
 
 
 def _slides_node(state: GraphState) -> dict[str, Any]:
-    slides = generate_slides(state["curriculum"], retry_strategy=_qa_retry_strategy(state))
+    curriculum = state["curriculum"]
+    retry_strategy = _qa_retry_strategy(state)
+    slides = cached_stage(
+        "slides",
+        {"curriculum": curriculum, "retry_strategy": retry_strategy},
+        generate_slides,
+        lambda: generate_slides(curriculum, retry_strategy=retry_strategy),
+    )
     return {"slides": slides}
 
 
 def _lab_node(state: GraphState) -> dict[str, Any]:
-    lab = generate_lab(state["curriculum"], retry_strategy=_qa_retry_strategy(state))
+    curriculum = state["curriculum"]
+    retry_strategy = _qa_retry_strategy(state)
+    lab = cached_stage(
+        "lab",
+        {"curriculum": curriculum, "retry_strategy": retry_strategy},
+        generate_lab,
+        lambda: generate_lab(curriculum, retry_strategy=retry_strategy),
+    )
     return {"lab": lab}
 
 
 def _templates_node(state: GraphState) -> dict[str, Any]:
-    templates = generate_templates(state["slides"], retry_strategy=_qa_retry_strategy(state))
+    slides = state["slides"]
+    retry_strategy = _qa_retry_strategy(state)
+    templates = cached_stage(
+        "templates",
+        {"slides": slides, "retry_strategy": retry_strategy},
+        generate_templates,
+        lambda: generate_templates(slides, retry_strategy=retry_strategy),
+    )
     return {"templates": templates}
 
 
@@ -244,13 +385,23 @@ def _qa_node(state: GraphState) -> dict[str, Any]:
         state["curriculum"],
         state["research"],
     )
-    return {"qa": qa}
+    update: dict[str, Any] = {"qa": qa}
+    revision_count = int(state.get("revision_count", 0))
+    if qa.get("status") == "fail" and revision_count < _qa_max_retries(state):
+        reason = _retry_skip_reason(state, "qa")
+        if reason is not None:
+            update = _with_skipped_retry(state, update, loop="qa", attempt=revision_count + 1, reason=reason)
+    return update
 
 
 def _route_after_qa(state: GraphState) -> str:
     qa_status = state.get("qa", {}).get("status")
     revision_count = int(state.get("revision_count", 0))
-    if qa_status == "fail" and revision_count < _qa_max_retries(state):
+    if (
+        qa_status == "fail"
+        and revision_count < _qa_max_retries(state)
+        and not _retry_was_skipped(state, "qa", revision_count + 1)
+    ):
         return "qa_retry"
     return "package"
 
@@ -258,7 +409,11 @@ def _route_after_qa(state: GraphState) -> str:
 def _route_after_research_qa(state: GraphState) -> str:
     research_qa_status = state.get("research_qa", {}).get("status")
     revision_count = int(state.get("research_revision_count", 0))
-    if research_qa_status == "fail" and revision_count < _research_max_retries(state):
+    if (
+        research_qa_status == "fail"
+        and revision_count < _research_max_retries(state)
+        and not _retry_was_skipped(state, "research", revision_count + 1)
+    ):
         return "research_retry"
     return "brief"
 
@@ -317,12 +472,19 @@ def _canonicalize_templates_for_bundle(
 def _package_node(state: GraphState) -> dict[str, Any]:
     lab = _canonicalize_lab_for_bundle(state["lab"])
     templates = _canonicalize_templates_for_bundle(state["templates"])
+    execution: dict[str, Any] = {
+        "research_revision_count": int(state.get("research_revision_count", 0)),
+        "qa_revision_count": int(state.get("revision_count", 0)),
+    }
+    skipped_retries = state.get("skipped_retries", []) or []
+    if skipped_retries:
+        execution["skipped_retries"] = list(skipped_retries)
+    tracer = get_tracer()
+    if tracer is not None:
+        execution["stage_latency_ms"] = tracer.stage_latency_summary()
     packaging = {
         "request": state["request"],
-        "execution": {
-            "research_revision_count": int(state.get("research_revision_count", 0)),
-            "qa_revision_count": int(state.get("revision_count", 0)),
-        },
+        "execution": execution,
         "research": state["research"],
         "research_qa": state["research_qa"],
         "brief": state["brief"],
@@ -339,19 +501,37 @@ def _package_node(state: GraphState) -> dict[str, Any]:
     }
 
 
+def _traced_node(
+    name: str,
+    node: Callable[[GraphState], dict[str, Any]],
+) -> Callable[[GraphState], dict[str, Any]]:
+    def run(state: GraphState) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            with span(name, "node"), profile_node(name):
+                return node(state)
+        finally:
+            budget = get_budget()
+            if budget is not None:
+                budget.record(name, time.perf_counter() - started)
+
+    run.__name__ = f"{name}_node"
+    return run
+
+
 def build_graph():
     graph = StateGraph(GraphState)
-    graph.add_node("research", _research_node)
-    graph.add_node("research_qa", _research_qa_node)
-    graph.add_node("research_retry", _research_retry_node)
-    graph.add_node("brief", _brief_node)
-    graph.add_node("curriculum", _curriculum_node)
-    graph.add_node("slides", _slides_node)
-    graph.add_node("lab", _lab_node)
-    graph.add_node("templates", _templates_node)
-    graph.add_node("qa", _qa_node)
-    graph.add_node("qa_retry", _qa_retry_node)
-    graph.add_node("package", _package_node)
+    graph.add_node("research", _traced_node("research", _research_node))
+    graph.add_node("research_qa", _traced_node("research_qa", _research_qa_node))
+    graph.add_node("research_retry", _traced_node("research_retry", _research_retry_node))
+    graph.add_node("brief", _traced_node("brief", _brief_node))
+    graph.add_node("curriculum", _traced_node("curriculum", _curriculum_node))
+    graph.add_node("slides", _traced_node("slides", _slides_node))
+    graph.add_node("lab", _traced_node("lab", _lab_node))
+    graph.add_node("templates", _traced_node("templates", _templates_node))
+    graph.add_node("qa", _traced_node("qa", _qa_node))
+    graph.add_node("qa_retry", _traced_node("qa_retry", _qa_retry_node))
+    graph.add_node("package", _traced_node("package", _package_node))
 
     graph.add_edge(START, "research")
     graph.add_edge("research", "research_qa")
@@ -377,19 +557,283 @@ def build_graph():
     return graph.compile()
 
 
-def run_pipeline(
+def _graph_definition() -> tuple[Any, ...]:
+    # The node and router callables fully determine the compiled graph, so a
+    # monkeypatched or reloaded node yields a new key and forces a rebuild.
+    return (
+        build_graph,
+        _research_node,
+        _research_qa_node,
+        _research_retry_node,
+        _brief_node,
+        _curriculum_node,
+        _slides_node,
+        _lab_node,
+        _templates_node,
+        _qa_node,
+        _qa_retry_node,
+        _package_node,
+        _route_after_research_qa,
+        _route_after_qa,
+    )
+
+
+@lru_cache(maxsize=1)
+def _compile_graph(definition: tuple[Any, ...]):
+    return definition[0]()
+
+
+def get_compiled_graph():
+    """Return the process-wide compiled graph, rebuilding it only when the graph definition changes."""
+
+    return _compile_graph(_graph_definition())
+
+
+def validate_pipeline_request(request: Any) -> dict[str, Any]:
+    """Check a request object from the service or a batch line; raise ``ValueError`` if malformed.
+
+    ``topic`` must be a non-empty string and ``audience``, when present, a string;
+    ``research``, ``qa`` and ``budget`` must be objects and ``offline`` a boolean.
+    """
+
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+    topic = request.get("topic")
+    if not isinstance(topic, str) or not topic.strip():
+        raise ValueError("Request must include a non-empty string 'topic'")
+    if "audience" in request and not isinstance(request["audience"], str):
+        raise ValueError("'audience' must be a string")
+    for key in ("research", "qa", "budget"):
+        if key in request and not isinstance(request[key], dict):
+            raise ValueError(f"'{key}' must be an object")
+    if "offline" in request and not isinstance(request["offline"], bool):
+        raise ValueError("'offline' must be a boolean")
+    return request
+
+
+def _build_request(
     topic: str,
     audience: str,
-    *,
-    research: dict[str, Any] | None = None,
-    qa: dict[str, Any] | None = None,
-) -> TrainingState:
-    app = build_graph()
+    research: dict[str, Any] | None,
+    qa: dict[str, Any] | None,
+    budget: dict[str, Any] | None = None,
+) -> dict[str, Any]:
     request: dict[str, Any] = {"topic": topic, "audience": audience}
     if research is not None:
         request["research"] = research
     if qa is not None:
         request["qa"] = qa
-    initial = TrainingState(request=request)
-    result = app.invoke(cast(GraphState, initial.model_dump()))
+    if budget is not None:
+        request["budget"] = budget
+    return request
+
+
+def run_pipeline(
+    topic: str,
+    audience: str,
+    *,
+    research: dict[str, Any] | None = None,
+    qa: dict[str, Any] | None = None,
+    budget: dict[str, Any] | None = None,
+    tracer: Tracer | None = None,
+    profiler: Profiler | None = None,
+) -> TrainingState:
+    app = get_compiled_graph()
+    initial = TrainingState(request=_build_request(topic, audience, research, qa, budget))
+    run_budget = budget_from_request(initial.request)
+    with tracing_scope(tracer or Tracer()), budget_scope(run_budget), profiling_scope(profiler):
+        result = app.invoke(cast(GraphState, initial.model_dump()))
     return TrainingState.model_validate(result)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one request in ``run_pipeline_batch``."""
+
+    index: int
+    request: dict[str, Any]
+    state: TrainingState | None
+    error: str | None
+    duration_s: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.state is not None
+
+
+def _run_batch_item(index: int, request: dict[str, Any]) -> BatchResult:
+    started = time.perf_counter()
+    try:
+        validate_pipeline_request(request)
+        with offline_override(request.get("offline") is True):
+            state = run_pipeline(
+                topic=request["topic"],
+                audience=request.get("audience", "novice"),
+                research=request.get("research"),
+                qa=request.get("qa"),
+                budget=request.get("budget"),
+            )
+    except Exception as exc:  # isolate per-request failures from the batch
+        return BatchResult(
+            index=index,
+            request=request if isinstance(request, dict) else {},
+            state=None,
+            error=f"{type(exc).__name__}: {exc}",
+            duration_s=time.perf_counter() - started,
+        )
+    return BatchResult(
+        index=index,
+        request=request,
+        state=state,
+        error=None,
+        duration_s=time.perf_counter() - started,
+    )
+
+
+def run_pipeline_batch(
+    requests: Iterable[dict[str, Any]],
+    *,
+    max_workers: int = 4,
+) -> Iterator[BatchResult]:
+    """Run many requests concurrently, yielding each result as it completes.
+
+    Each request is a dict with ``topic`` and optional ``audience``, ``research``,
+    ``qa`` and ``budget`` keys, as accepted by ``run_pipeline``, plus an optional
+    ``offline`` flag that forces offline mode for that request only. Runs share the
+    compiled graph, HTTP connection pools, search cache and LLM client. At most
+    ``2 * max_workers`` requests are in flight, so large iterables are consumed
+    lazily. A failing request yields a result with ``error`` set; it never
+    aborts the batch.
+    """
+
+    workers = max(1, int(max_workers))
+    get_compiled_graph()
+    pending: set[Future[BatchResult]] = set()
+    items = iter(enumerate(requests))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tf-batch") as executor:
+
+        def submit_next() -> bool:
+            try:
+                index, request = next(items)
+            except StopIteration:
+                return False
+            # Each run gets a copy of the caller's context (settings overrides,
+            # tracer/budget scopes stay per run).
+            context = contextvars.copy_context()
+            pending.add(executor.submit(context.run, _run_batch_item, index, request))
+            return True
+
+        while len(pending) < workers * 2 and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                yield future.result()
+                submit_next()
+
+
+PipelineEventKind = Literal["node_start", "node_end", "run_end"]
+
+
+@dataclass(frozen=True)
+class PipelineEvent:
+    """Progress event emitted by ``stream_pipeline``."""
+
+    kind: PipelineEventKind
+    node: str
+    elapsed_s: float
+    research_revision_count: int
+    revision_count: int
+    duration_s: float | None = None
+    artifact_sizes: dict[str, int] = field(default_factory=dict)
+    update: dict[str, Any] = field(default_factory=dict)
+    state: TrainingState | None = None
+
+
+def _artifact_sizes(update: dict[str, Any]) -> dict[str, int]:
+    sizes: dict[str, int] = {}
+    for key, value in update.items():
+        if isinstance(value, (dict, list)):
+            sizes[key] = len(json.dumps(value, default=str))
+    return sizes
+
+
+def stream_pipeline(
+    topic: str,
+    audience: str,
+    *,
+    research: dict[str, Any] | None = None,
+    qa: dict[str, Any] | None = None,
+    budget: dict[str, Any] | None = None,
+    tracer: Tracer | None = None,
+    profiler: Profiler | None = None,
+) -> Iterator[PipelineEvent]:
+    """Run the pipeline, yielding an event as each node starts and finishes.
+
+    The last event has kind ``run_end`` and carries the final ``TrainingState``.
+    """
+
+    app = get_compiled_graph()
+    initial = TrainingState(request=_build_request(topic, audience, research, qa, budget))
+    values: dict[str, Any] = initial.model_dump()
+    run_tracer = tracer or Tracer()
+    run_budget = budget_from_request(initial.request)
+    run_started = time.perf_counter()
+    task_started: dict[str, float] = {}
+
+    stream = app.stream(cast(GraphState, values), stream_mode=["tasks", "values"])
+    while True:
+        # Scope the tracer, budget and profiler to each step rather than across
+        # yields so they never leak into the consumer's context between events.
+        with tracing_scope(run_tracer), budget_scope(run_budget), profiling_scope(profiler):
+            try:
+                mode, payload = next(stream)
+            except StopIteration:
+                break
+        now = time.perf_counter()
+        if mode == "values":
+            values = dict(payload)
+            continue
+
+        task_id = str(payload.get("id", ""))
+        node = str(payload.get("name", ""))
+        if "input" in payload:
+            task_started[task_id] = now
+            task_input = payload.get("input") or {}
+            yield PipelineEvent(
+                kind="node_start",
+                node=node,
+                elapsed_s=now - run_started,
+                research_revision_count=int(task_input.get("research_revision_count", 0)),
+                revision_count=int(task_input.get("revision_count", 0)),
+            )
+            continue
+
+        update = payload.get("result") or {}
+        if not isinstance(update, dict):
+            update = dict(update)
+        started = task_started.pop(task_id, now)
+        yield PipelineEvent(
+            kind="node_end",
+            node=node,
+            elapsed_s=now - run_started,
+            duration_s=now - started,
+            research_revision_count=int(
+                update.get("research_revision_count", values.get("research_revision_count", 0))
+            ),
+            revision_count=int(update.get("revision_count", values.get("revision_count", 0))),
+            artifact_sizes=_artifact_sizes(update),
+            update=update,
+        )
+
+    final_state = TrainingState.model_validate(values)
+    yield PipelineEvent(
+        kind="run_end",
+        node="",
+        elapsed_s=time.perf_counter() - run_started,
+        research_revision_count=final_state.research_revision_count,
+        revision_count=final_state.revision_count,
+        state=final_state,
+    )
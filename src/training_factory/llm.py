@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
+from training_factory.budget import get_budget
 from training_factory.settings import Settings, get_settings
+from training_factory.tracing import span
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 
 def build_chat_model(settings: Settings | None = None) -> ChatOpenAI:
@@ -12,6 +18,9 @@ def build_chat_model(settings: Settings | None = None) -> ChatOpenAI:
     if not cfg.openai_api_key:
         raise ValueError("OPENAI_API_KEY is required to build ChatOpenAI")
 
+    # Imported here so offline runs and CLI startup never load langchain_openai.
+    from langchain_openai import ChatOpenAI
+
     return ChatOpenAI(
         api_key=cfg.openai_api_key,
         model=cfg.openai_model,
@@ -19,6 +28,22 @@ def build_chat_model(settings: Settings | None = None) -> ChatOpenAI:
     )
 
 
+@lru_cache(maxsize=8)
+def _shared_chat_model(api_key: str, model: str, temperature: float) -> ChatOpenAI:
+    return build_chat_model(
+        Settings(OPENAI_API_KEY=api_key, OPENAI_MODEL=model, OPENAI_TEMPERATURE=temperature)
+    )
+
+
+def get_chat_model(settings: Settings | None = None) -> ChatOpenAI:
+    """Return a process-wide ChatOpenAI client so runs share its HTTP pool."""
+
+    cfg = settings or get_settings()
+    if not cfg.openai_api_key:
+        raise ValueError("OPENAI_API_KEY is required to build ChatOpenAI")
+    return _shared_chat_model(cfg.openai_api_key, cfg.openai_model, cfg.openai_temperature)
+
+
 def _coerce_content_to_text(content: object) -> str:
     if isinstance(content, str):
         return content
@@ -40,6 +65,20 @@ def invoke_text(prompt: str, fallback_text: str) -> str:
     if settings.offline_mode or not settings.openai_api_key:
         return fallback_text
 
-    model = build_chat_model(settings)
-    response = model.invoke(prompt)
-    return _coerce_content_to_text(response.content)
+    timeout: float | None = None
+    budget = get_budget()
+    if budget is not None:
+        timeout = budget.remaining_s()
+        if timeout <= 0:
+            # Out of run budget: degrade to the deterministic fallback.
+            budget.degraded = True
+            return fallback_text
+
+    with span("llm.invoke", "llm", model=settings.openai_model, prompt_chars=len(prompt)) as current:
+        model = get_chat_model(settings)
+        # The client is shared, so the budget-derived timeout is per request.
+        response = model.invoke(prompt, timeout=timeout) if timeout is not None else model.invoke(prompt)
+        text = _coerce_content_to_text(response.content)
+        if current is not None:
+            current.attributes["response_chars"] = len(text)
+    return text
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Literal
+
+ProfileMode = Literal["cprofile", "tracemalloc"]
+PROFILE_MODES: tuple[ProfileMode, ...] = ("cprofile", "tracemalloc")
+
+
+class Profiler:
+    """Collects a CPU or memory profile for one pipeline run.
+
+    ``cprofile`` records function timings for the whole run; ``tracemalloc``
+    records the peak memory allocated while each graph node runs. Both hook the
+    process globally, so profile one run at a time rather than a batch.
+    """
+
+    def __init__(self, mode: ProfileMode) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; expected one of {', '.join(PROFILE_MODES)}")
+        self.mode: ProfileMode = mode
+        self.node_peaks: dict[str, int] = {}
+        self.node_calls: dict[str, int] = {}
+        self._profile = cProfile.Profile() if mode == "cprofile" else None
+
+    @contextmanager
+    def running(self) -> Iterator[Profiler]:
+        """Profile the enclosed code; may be entered repeatedly for one run."""
+
+        if self._profile is not None:
+            self._profile.enable()
+            try:
+                yield self
+            finally:
+                self._profile.disable()
+            return
+
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start()
+        try:
+            yield self
+        finally:
+            if started_here:
+                tracemalloc.stop()
+
+    @contextmanager
+    def node(self, name: str) -> Iterator[None]:
+        if self.mode != "tracemalloc" or not tracemalloc.is_tracing():
+            yield
+            return
+
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            self.node_peaks[name] = max(self.node_peaks.get(name, 0), max(0, peak - baseline))
+            self.node_calls[name] = self.node_calls.get(name, 0) + 1
+
+    def summary(self, top: int = 25) -> str:
+        """Return the top cumulative functions, or per-node memory peaks, as text."""
+
+        if self._profile is not None:
+            buffer = io.StringIO()
+            pstats.Stats(self._profile, stream=buffer).sort_stats("cumulative").print_stats(top)
+            return buffer.getvalue()
+
+        lines = ["node            peak_kib   calls"]
+        for name, peak in sorted(self.node_peaks.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"{name:<15} {peak / 1024:>8.1f} {self.node_calls.get(name, 0):>7}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, bundle_path: str | Path, top: int = 25) -> list[Path]:
+        """Write the profile next to ``bundle_path`` and return the files written.
+
+        ``cprofile`` writes ``<bundle>.pstats`` plus a ``<bundle>.profile.txt``
+        summary; ``tracemalloc`` writes ``<bundle>.memory.json`` plus the same
+        text summary.
+        """
+
+        target = Path(bundle_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        written: list[Path] = []
+        if self._profile is not None:
+            stats_path = target.with_suffix(".pstats")
+            self._profile.dump_stats(str(stats_path))
+            written.append(stats_path)
+        else:
+            memory_path = target.with_suffix(".memory.json")
+            payload = {
+                name: {"peak_bytes": peak, "calls": self.node_calls.get(name, 0)}
+                for name, peak in self.node_peaks.items()
+            }
+            memory_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+            written.append(memory_path)
+
+        summary_path = target.with_suffix(".profile.txt")
+        summary_path.write_text(self.summary(top), encoding="utf-8")
+        written.append(summary_path)
+        return written
+
+
+_current_profiler: ContextVar[Profiler | None] = ContextVar("training_factory_profiler", default=None)
+
+
+def get_profiler() -> Profiler | None:
+    return _current_profiler.get()
+
+
+@contextmanager
+def profiling_scope(profiler: Profiler | None) -> Iterator[Profiler | None]:
+    """Make ``profiler`` active (and running) for the current context."""
+
+    if profiler is None:
+        yield None
+        return
+
+    token = _current_profiler.set(profiler)
+    try:
+        with profiler.running():
+            yield profiler
+    finally:
+        _current_profiler.reset(token)
+
+
+@contextmanager
+def profile_node(name: str) -> Iterator[None]:
+    """Record per-node memory peaks when a tracemalloc profiler is active."""
+
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.node(name):
+        yield
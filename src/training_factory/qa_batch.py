@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from training_factory.agents.qa import generate_qa
+from training_factory.agents.research_qa import generate_research_qa
+from training_factory.utils.bundle_io import read_bundle
+
+BUNDLE_GLOBS = ("*.json", "*.json.gz", "*.ndjson")
+# Sidecar files written next to bundles that match BUNDLE_GLOBS but are not bundles.
+_SIDECAR_SUFFIXES = (".memory.json",)
+
+
+@dataclass
+class RescoreResult:
+    """QA and research QA recomputed for one stored bundle."""
+
+    path: str | None
+    qa: dict[str, Any] | None = None
+    research_qa: dict[str, Any] | None = None
+    stored_qa_status: str | None = None
+    stored_research_qa_status: str | None = None
+    error: str | None = None
+
+    def to_row(self) -> dict[str, Any]:
+        if self.error is not None:
+            return {"path": self.path, "status": "error", "error": self.error}
+        assert self.qa is not None and self.research_qa is not None
+        return {
+            "path": self.path,
+            "status": "ok",
+            "qa_status": self.qa["status"],
+            "research_qa_status": self.research_qa["status"],
+            "qa_changed": self.qa["status"] != self.stored_qa_status,
+            "research_qa_changed": self.research_qa["status"] != self.stored_research_qa_status,
+            "failed_checks": [
+                check["prompt"]
+                for check in [*self.qa["checks"], *self.research_qa["checks"]]
+                if check["answer"] != "Yes"
+            ],
+            "qa": self.qa,
+            "research_qa": self.research_qa,
+        }
+
+
+def _section(bundle: dict[str, Any], key: str) -> dict[str, Any]:
+    value = bundle.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+def _scored_lab(lab: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild the steps/checkpoints lab QA scored from a packaged ``{"labs": [...]}`` lab.
+
+    Packaging keeps each step's instruction and the lab objective as
+    ``expected_outcome``; the pipeline only packages labs that validated with
+    steps and checkpoints, so each instruction maps back to a step and each
+    expected outcome to a checkpoint.
+    """
+
+    labs = lab.get("labs")
+    if "steps" in lab or not isinstance(labs, list):
+        return lab
+    steps: list[dict[str, Any]] = []
+    checkpoints: list[str] = []
+    for item in labs:
+        if not isinstance(item, dict):
+            continue
+        instructions = item.get("instructions")
+        if isinstance(instructions, list):
+            steps.extend(
+                {"step": len(steps) + 1, "instruction": instruction}
+                for instruction in instructions
+                if isinstance(instruction, str)
+            )
+        if isinstance(item.get("expected_outcome"), str):
+            checkpoints.append(item["expected_outcome"])
+    if not steps:
+        return lab
+    return {"steps": steps, "checkpoints": checkpoints}
+
+
+def rescore_bundle(bundle: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Recompute ``(qa, research_qa)`` from a bundle's stored sections with the current rules.
+
+    Metrics stored in the research section are ignored: they were computed by the
+    rules in force when the bundle was written.
+    """
+
+    qa = generate_qa(
+        _section(bundle, "slides"),
+        _scored_lab(_section(bundle, "lab")),
+        _section(bundle, "templates"),
+        _section(bundle, "curriculum"),
+        _section(bundle, "research"),
+    )
+    research_qa = generate_research_qa(_section(bundle, "research"), _section(bundle, "request"), reuse_metrics=False)
+    return qa, research_qa
+
+
+def _rescore_path(path: Path) -> RescoreResult:
+    result = RescoreResult(path=str(path))
+    try:
+        bundle = read_bundle(path)
+        result.stored_qa_status = _section(bundle, "qa").get("status")
+        result.stored_research_qa_status = _section(bundle, "research_qa").get("status")
+        result.qa, result.research_qa = rescore_bundle(bundle)
+    except Exception as exc:
+        # One malformed bundle becomes an error row instead of aborting the run.
+        result.qa = result.research_qa = None
+        result.error = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def iter_bundle_paths(paths: Iterable[str | Path]) -> Iterator[Path]:
+    """Expand files and directories (non-recursively) into bundle files, sorted per directory."""
+
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            found = {
+                match
+                for pattern in BUNDLE_GLOBS
+                for match in path.glob(pattern)
+                if match.is_file() and not match.name.endswith(_SIDECAR_SUFFIXES)
+            }
+            yield from sorted(found)
+        else:
+            yield path
+
+
+def rescore_paths(paths: Iterable[str | Path], *, workers: int = 1) -> Iterator[RescoreResult]:
+    """Load and rescore every bundle under ``paths``, yielding results in path order.
+
+    Scoring is CPU-bound Python, so ``workers > 1`` fans paths out to that many
+    processes; each keeps its own tokenizer and schema caches warm across bundles.
+    """
+
+    bundle_paths = list(iter_bundle_paths(paths))
+    if workers <= 1 or len(bundle_paths) <= 1:
+        yield from map(_rescore_path, bundle_paths)
+        return
+    chunksize = max(1, min(64, len(bundle_paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_rescore_path, bundle_paths, chunksize=chunksize)
@@ -5,6 +5,8 @@ from training_factory.research.providers import SearchProvider, SearchResult
 
 class SimpleFallbackSearchProvider(SearchProvider):
     _product_keywords = ("power bi", "power apps", "power platform", "alm")
+    cacheable = True
+    deterministic = True
 
     def search(self, query: str, *, num_results: int = 10) -> list[SearchResult]:
         lower_query = query.lower()
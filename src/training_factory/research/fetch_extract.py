@@ -2,6 +2,11 @@ from __future__ import annotations
 
 from html.parser import HTMLParser
 
+from training_factory.budget import clamp_timeout
+from training_factory.research.http import get_session
+from training_factory.research.negative_cache import get_negative_cache
+from training_factory.utils.text import normalize_whitespace
+
 _BOILERPLATE_PATTERNS = [
     "browser is no longer supported",
     "upgrade to microsoft edge",
@@ -16,19 +21,49 @@ _BOILERPLATE_PATTERNS = [
 ]
 
 
-def fetch_url(url: str, *, timeout: int = 10) -> str:
+def _failure_class(exc: Exception) -> str:
+    import requests
+
+    if isinstance(exc, requests.Timeout):
+        return "timeout"
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return f"http_{exc.response.status_code}"
+    if isinstance(exc, requests.ConnectionError):
+        return "connection"
+    return "request_error"
+
+
+def fetch_url(url: str, *, timeout: float = 10) -> str:
+    """Return the page body, or "" on failure.
+
+    Failures are recorded in the negative cache by class (timeout, HTTP status,
+    ...), and URLs with an unexpired failure return "" without a request. A
+    timeout is not recorded when the run budget shortened ``timeout``: the page
+    may be healthy, and the cache is shared by every run in the process.
+    """
+
     try:
         import requests
     except ImportError:
         return ""
 
-    headers = {
-        "User-Agent": "training-factory/0.1 (+https://example.local)",
-    }
+    requested_timeout = timeout
+    timeout = clamp_timeout(timeout)
+    if timeout <= 0:
+        return ""
+
+    negative_cache = get_negative_cache()
+    if negative_cache.get(url) is not None:
+        return ""
+
+    session = get_session()
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = session.get(url, timeout=timeout)
         response.raise_for_status()
-    except requests.RequestException:
+    except requests.RequestException as exc:
+        failure = _failure_class(exc)
+        if failure != "timeout" or timeout >= requested_timeout:
+            negative_cache.put(url, failure)
         return ""
     return response.text
 
@@ -83,7 +118,7 @@ class _SnippetHTMLParser(HTMLParser):
 
 
 def normalize_text(s: str) -> str:
-    return " ".join(s.lower().split())
+    return normalize_whitespace(s)
 
 
 def is_boilerplate(text: str) -> bool:
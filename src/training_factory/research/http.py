@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+_POOL_MAXSIZE = 32
+_USER_AGENT = "training-factory/0.1 (+https://example.local)"
+
+_adapter_lock = threading.Lock()
+_shared_adapter: Any = None
+_local = threading.local()
+
+
+def _get_adapter(requests_module: Any) -> Any:
+    global _shared_adapter
+    with _adapter_lock:
+        if _shared_adapter is None:
+            _shared_adapter = requests_module.adapters.HTTPAdapter(
+                pool_connections=_POOL_MAXSIZE,
+                pool_maxsize=_POOL_MAXSIZE,
+            )
+        return _shared_adapter
+
+
+def get_session() -> Any:
+    """Return this thread's requests session, or None if requests is missing.
+
+    Sessions are per thread, but every session mounts one shared adapter, so
+    keep-alive connection pools are reused across threads and runs.
+    """
+
+    try:
+        import requests
+    except ImportError:
+        return None
+
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = _get_adapter(requests)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["User-Agent"] = _USER_AGENT
+        _local.session = session
+    return session
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+_MAX_URLS = 4096
+_TRANSIENT_TTL_SECONDS = 600.0
+# Failure classes that rarely clear up within a day of catalog runs.
+_TTL_SECONDS = {
+    "http_4xx": 6 * 3600.0,
+    "empty_extraction": 24 * 3600.0,
+}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """Normalize ``url`` for cache keys: lowercase scheme and host, no fragment or default port."""
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def failure_ttl(failure: str) -> float:
+    """Seconds a failure class stays cached; unknown classes count as transient."""
+
+    if failure.startswith("http_4") and failure != "http_429":
+        return _TTL_SECONDS["http_4xx"]
+    return _TTL_SECONDS.get(failure, _TRANSIENT_TTL_SECONDS)
+
+
+class NegativeCache:
+    """Thread-safe LRU of URLs that recently failed to fetch or extract, with a TTL per failure class."""
+
+    def __init__(self, *, max_urls: int = _MAX_URLS) -> None:
+        self._max_urls = max_urls
+        # canonical URL -> failure class -> expiry (time.monotonic()).
+        self._entries: OrderedDict[str, dict[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> str | None:
+        """Return an unexpired failure class recorded for ``url``, if any."""
+
+        key = canonical_url(url)
+        now = time.monotonic()
+        with self._lock:
+            failures = self._entries.get(key)
+            if failures is None:
+                return None
+            for failure, expires_at in list(failures.items()):
+                if expires_at <= now:
+                    del failures[failure]
+            if not failures:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return max(failures, key=failures.__getitem__)
+
+    def put(self, url: str, failure: str, *, ttl_seconds: float | None = None) -> None:
+        key = canonical_url(url)
+        ttl = failure_ttl(failure) if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries.setdefault(key, {})[failure] = time.monotonic() + ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_urls:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_negative_cache = NegativeCache()
+
+
+def get_negative_cache() -> NegativeCache:
+    return _negative_cache
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections.abc import Generator, Sequence
+from dataclasses import dataclass
+
+from training_factory.research.providers import SearchProvider, SearchResult
+from training_factory.research.search_cache import cached_search
+from training_factory.tracing import span
+from training_factory.utils.text import tokenize
+
+# More alternatives per call dilutes each intent's share of the results.
+_MAX_MERGED_QUERIES = 4
+# Google (and SerpAPI) return at most 100 organic results per request.
+_MAX_RESULTS_PER_CALL = 100
+_MIN_TOKEN_LENGTH = 3
+
+
+@dataclass(frozen=True)
+class CoalescedQuery:
+    """One provider call standing in for one or more planned queries."""
+
+    query: str
+    members: tuple[str, ...]
+    num_results: int
+
+
+def _group_key(query: str) -> str:
+    # Queries only merge when they share a leading operator or word: a site
+    # restriction, the opening quote of a topic literal, or the bare topic.
+    words = query.split()
+    return words[0] if words else ""
+
+
+def _common_prefix(word_lists: Sequence[list[str]]) -> list[str]:
+    prefix: list[str] = []
+    for words in zip(*word_lists):
+        if any(word != words[0] for word in words):
+            break
+        prefix.append(words[0])
+    return prefix
+
+
+def _merge(members: Sequence[str]) -> str:
+    word_lists = [member.split() for member in members]
+    # Keep at least one word per alternative, so no branch of the OR is empty.
+    prefix = _common_prefix(word_lists)[: min(len(words) for words in word_lists) - 1]
+    alternatives = [" ".join(words[len(prefix) :]) for words in word_lists]
+    alternatives = [f"({text})" if " " in text else text for text in alternatives]
+    merged = " OR ".join(alternatives)
+    return f"{' '.join(prefix)} ({merged})" if prefix else merged
+
+
+def coalesce_queries(queries: Sequence[str], *, num_results: int, supports_or: bool) -> list[CoalescedQuery]:
+    """Group ``queries`` into as few provider calls as their shared prefixes allow.
+
+    Without OR support every query is its own call. Otherwise queries with the
+    same leading word (in plan order, at most ``_MAX_MERGED_QUERIES`` per call)
+    become ``prefix (a OR b ...)`` and ask for ``num_results`` per member.
+    """
+
+    if not supports_or:
+        return [CoalescedQuery(query=query, members=(query,), num_results=num_results) for query in queries]
+
+    groups: dict[str, list[str]] = {}
+    for query in queries:
+        groups.setdefault(_group_key(query), []).append(query)
+
+    calls: list[CoalescedQuery] = []
+    for members in groups.values():
+        for start in range(0, len(members), _MAX_MERGED_QUERIES):
+            chunk = tuple(members[start : start + _MAX_MERGED_QUERIES])
+            calls.append(
+                CoalescedQuery(
+                    query=chunk[0] if len(chunk) == 1 else _merge(chunk),
+                    members=chunk,
+                    num_results=min(num_results * len(chunk), _MAX_RESULTS_PER_CALL),
+                )
+            )
+    # Issue calls in the order of their first member in the plan.
+    calls.sort(key=lambda call: queries.index(call.members[0]))
+    return calls
+
+
+def attribute_results(call: CoalescedQuery, results: Sequence[SearchResult]) -> dict[str, list[SearchResult]]:
+    """Split a call's results across its member queries, preserving result order.
+
+    A result goes to the first member whose distinguishing words (those outside
+    the shared prefix) appear in its title or snippet, else to the first member.
+    """
+
+    attributed: dict[str, list[SearchResult]] = {member: [] for member in call.members}
+    if len(call.members) == 1:
+        attributed[call.members[0]].extend(results)
+        return attributed
+
+    shared = frozenset.intersection(*(tokenize(member, _MIN_TOKEN_LENGTH) for member in call.members))
+    intents = [(member, tokenize(member, _MIN_TOKEN_LENGTH) - shared) for member in call.members]
+    for result in results:
+        content = tokenize(f"{result.title} {result.snippet}", _MIN_TOKEN_LENGTH)
+        owner = next((member for member, tokens in intents if tokens & content), call.members[0])
+        attributed[owner].append(result)
+    return attributed
+
+
+def search_plan(
+    provider: SearchProvider,
+    queries: Sequence[str],
+    *,
+    num_results: int,
+) -> Generator[tuple[CoalescedQuery, dict[str, list[SearchResult]]], None, None]:
+    """Run ``queries`` through ``provider``, coalescing them when it sets ``supports_or_queries``.
+
+    Yields each call with its results attributed to its member queries, one
+    provider call at a time, in the order of each call's first planned query.
+    """
+
+    calls = coalesce_queries(
+        queries,
+        num_results=num_results,
+        supports_or=bool(getattr(provider, "supports_or_queries", False)),
+    )
+    for call in calls:
+        with span(
+            "search", "search", provider=type(provider).__name__, query=call.query, intents=len(call.members)
+        ) as current:
+            results = cached_search(provider, call.query, num_results=call.num_results)
+            if current is not None:
+                current.attributes["results"] = len(results)
+        yield call, attribute_results(call, results)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from training_factory.research.providers import SearchProvider, SearchResult
+
+_MAX_ENTRIES = 2048
+_TTL_SECONDS = 3600.0
+
+
+class SearchCache:
+    """Thread-safe LRU cache of search results with a time-to-live."""
+
+    def __init__(self, *, max_entries: int = _MAX_ENTRIES, ttl_seconds: float = _TTL_SECONDS) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str, int], tuple[float, list[SearchResult]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str, int]) -> list[SearchResult] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, results = entry
+            if time.monotonic() - stored_at > self._ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return list(results)
+
+    def put(self, key: tuple[str, str, int], results: list[SearchResult]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_search_cache = SearchCache()
+
+
+def get_search_cache() -> SearchCache:
+    return _search_cache
+
+
+def cached_search(provider: SearchProvider, query: str, *, num_results: int) -> list[SearchResult]:
+    """Search through the process-wide cache when the provider opts in.
+
+    Providers set a truthy ``cacheable`` class attribute to declare that their
+    results depend only on ``(query, num_results)``.
+    """
+
+    if not getattr(provider, "cacheable", False):
+        return provider.search(query, num_results=num_results)
+
+    key = (type(provider).__qualname__, query, num_results)
+    cached = _search_cache.get(key)
+    if cached is not None:
+        return cached
+    results = provider.search(query, num_results=num_results)
+    if results:
+        _search_cache.put(key, results)
+    return results
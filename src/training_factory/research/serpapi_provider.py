@@ -4,6 +4,8 @@ import logging
 import os
 from typing import Any
 
+from training_factory.budget import clamp_timeout
+from training_factory.research.http import get_session
 from training_factory.research.providers import SearchProvider, SearchResult
 from training_factory.settings import get_settings
 
@@ -12,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 class SerpApiSearchProvider(SearchProvider):
     _endpoint = "https://serpapi.com/search.json"
+    cacheable = True
+    supports_or_queries = True
 
     def __init__(self, api_key: str | None = None, *, timeout_seconds: float = 10.0) -> None:
         resolved_key = api_key or os.getenv("SERPAPI_API_KEY")
@@ -31,6 +35,11 @@ class SerpApiSearchProvider(SearchProvider):
             logger.warning("requests is not installed; SerpAPI search disabled")
             return []
 
+        timeout_seconds = clamp_timeout(self._timeout_seconds)
+        if timeout_seconds <= 0:
+            logger.warning("Run budget exhausted; skipping SerpAPI search")
+            return []
+
         params = {
             "engine": "google",
             "q": query,
@@ -38,8 +47,9 @@ class SerpApiSearchProvider(SearchProvider):
             "api_key": self._api_key,
         }
 
+        session = get_session()
         try:
-            response = requests.get(self._endpoint, params=params, timeout=self._timeout_seconds)
+            response = session.get(self._endpoint, params=params, timeout=timeout_seconds)
             response.raise_for_status()
         except requests.RequestException as exc:
             logger.warning("SerpAPI request failed: %s", exc)
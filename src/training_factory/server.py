@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Literal
+from urllib.parse import parse_qs, urlsplit
+
+from training_factory.graph import get_compiled_graph, run_pipeline, validate_pipeline_request
+from training_factory.settings import offline_override
+from training_factory.utils.json_schema import preload_schemas, validate_json
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / "schemas" / "bundle.schema.json"
+MAX_REQUEST_BYTES = 1_000_000
+DEFAULT_MAX_QUEUED = 64
+
+JobStatus = Literal["queued", "running", "done", "error"]
+
+
+@dataclass
+class Job:
+    """A generate request tracked by ``PipelineService``."""
+
+    job_id: str
+    request: dict[str, Any]
+    status: JobStatus = "queued"
+    bundle: dict[str, Any] | None = None
+    error: str | None = None
+    submitted_at: float = field(default_factory=time.time)
+    duration_s: float | None = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self, *, include_bundle: bool = True) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "duration_s": self.duration_s,
+        }
+        if self.error is not None:
+            payload["error"] = self.error
+        if include_bundle and self.bundle is not None:
+            payload["bundle"] = self.bundle
+        return payload
+
+
+class ServiceBusyError(RuntimeError):
+    """Raised by ``PipelineService.submit`` when the job queue is full."""
+
+
+class PipelineService:
+    """Runs generate requests on a resident worker pool.
+
+    The compiled graph, HTTP pools, search cache and LLM client are process-wide,
+    so they stay warm across jobs. Finished jobs are kept (up to ``max_jobs``)
+    so clients can poll ``/jobs/<id>``. At most ``max_queued`` jobs wait for a
+    worker; further submissions raise ``ServiceBusyError``. ``offline`` forces
+    offline mode for every job; otherwise a request may set ``"offline": true``
+    for itself.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 4,
+        max_jobs: int = 1000,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        offline: bool = False,
+    ) -> None:
+        self.offline = offline
+        self.max_workers = max(1, int(max_workers))
+        self.max_jobs = max(1, int(max_jobs))
+        self.max_queued = max(0, int(max_queued))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tf-serve")
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._pending = 0  # submitted jobs that have not finished yet
+        self._lock = threading.Lock()
+        get_compiled_graph()
+        preload_schemas(SCHEMA_PATH.parent)
+
+    def submit(self, request: dict[str, Any]) -> Job:
+        job = Job(job_id=uuid.uuid4().hex, request=validate_pipeline_request(request))
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queued:
+                raise ServiceBusyError(f"Job queue is full ({self.max_queued} waiting); retry later")
+            self._pending += 1
+            self._jobs[job.job_id] = job
+            self._evict_finished()
+        future: Future[None] = self._executor.submit(self._run, job)
+        future.add_done_callback(lambda _future: self._finish(job))
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {status: 0 for status in ("queued", "running", "done", "error")}
+        for job in jobs:
+            counts[job.status] += 1
+        return counts
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _finish(self, job: Job) -> None:
+        with self._lock:
+            self._pending -= 1
+        job.done.set()
+
+    def _evict_finished(self) -> None:
+        overflow = len(self._jobs) - self.max_jobs
+        if overflow <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done.is_set()][:overflow]:
+            del self._jobs[job_id]
+
+    def _run(self, job: Job) -> None:
+        job.status = "running"
+        started = time.perf_counter()
+        request = job.request
+        try:
+            with offline_override(self.offline or request.get("offline") is True):
+                state = run_pipeline(
+                    topic=request["topic"],
+                    audience=request.get("audience", "novice"),
+                    research=request.get("research"),
+                    qa=request.get("qa"),
+                    budget=request.get("budget"),
+                )
+            bundle = state.packaging
+            validate_json(bundle, SCHEMA_PATH)
+            job.bundle = bundle
+            job.status = "done"
+        except Exception as exc:  # keep the worker alive; report on the job
+            job.error = f"{type(exc).__name__}: {exc}"
+            job.status = "error"
+        finally:
+            job.duration_s = round(time.perf_counter() - started, 3)
+
+
+def _content_length(header: str | None) -> tuple[int, str | None]:
+    """Parse a request's Content-Length, returning ``(length, error)``."""
+
+    if header is None:
+        return 0, "Content-Length header is required"
+    try:
+        length = int(header)
+    except ValueError:
+        return 0, "Content-Length must be an integer"
+    if length < 0:
+        return 0, "Content-Length must not be negative"
+    if length > MAX_REQUEST_BYTES:
+        return 0, f"Request body too large (limit {MAX_REQUEST_BYTES} bytes)"
+    return length, None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: PipelineHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path.rstrip("/")
+        service = self.server.service
+        if path == "/healthz":
+            self._send_json(
+                HTTPStatus.OK,
+                {"status": "ok", "workers": service.max_workers, "jobs": service.counts()},
+            )
+            return
+        if path.startswith("/jobs/"):
+            job = service.get(path.removeprefix("/jobs/"))
+            if job is None:
+                self._send_json(HTTPStatus.NOT_FOUND, {"error": "Unknown job id"})
+                return
+            self._send_json(HTTPStatus.OK, job.to_dict())
+            return
+        self._send_json(HTTPStatus.NOT_FOUND, {"error": f"No route for GET {path or '/'}"})
+
+    def do_POST(self) -> None:
+        parts = urlsplit(self.path)
+        if parts.path.rstrip("/") != "/generate":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"No route for POST {parts.path}"})
+            return
+
+        length, length_error = _content_length(self.headers.get("Content-Length"))
+        if length_error:
+            # The body is left unread, so the connection cannot be reused.
+            self.close_connection = True
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": length_error})
+            return
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.service.submit(request)
+        except ValueError as exc:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+            return
+        except ServiceBusyError as exc:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)})
+            return
+
+        wait = parse_qs(parts.query).get("wait", ["1"])[-1].lower() not in {"0", "false", "no"}
+        if not wait:
+            self._send_json(HTTPStatus.ACCEPTED, job.to_dict(include_bundle=False))
+            return
+        job.done.wait()
+        status = HTTPStatus.OK if job.status == "done" else HTTPStatus.INTERNAL_SERVER_ERROR
+        self._send_json(status, job.to_dict())
+
+
+class PipelineHTTPServer(ThreadingHTTPServer):
+    """HTTP front end for ``PipelineService``.
+
+    Routes: ``POST /generate`` (``?wait=0`` returns a job id immediately),
+    ``GET /jobs/<id>``, and ``GET /healthz``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: PipelineService, *, quiet: bool = False) -> None:
+        super().__init__(address, _Handler)
+        self.service = service
+        self.quiet = quiet
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    *,
+    max_workers: int = 4,
+    max_queued: int = DEFAULT_MAX_QUEUED,
+    offline: bool = False,
+    quiet: bool = False,
+) -> PipelineHTTPServer:
+    service = PipelineService(max_workers=max_workers, max_queued=max_queued, offline=offline)
+    return PipelineHTTPServer((host, port), service, quiet=quiet)
@@ -1,4 +1,8 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
+from typing import Any, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,6 +19,12 @@ class Settings(BaseSettings):
     serpapi_api_key: str | None = Field(default=None, alias="SERPAPI_API_KEY")
     training_factory_offline: bool = Field(default=False, alias="TRAINING_FACTORY_OFFLINE")
     test_mode: bool = Field(default=False, alias="TEST_MODE")
+    stage_cache_dir: str | None = Field(default=None, alias="TRAINING_FACTORY_STAGE_CACHE_DIR")
+    # strict: every stage artifact and the final bundle; final-only: the bundle only; off: nothing.
+    validation: Literal["strict", "final-only", "off"] = Field(
+        default="strict",
+        alias="TRAINING_FACTORY_VALIDATION",
+    )
 
     @property
     def offline_mode(self) -> bool:
@@ -22,5 +32,52 @@ class Settings(BaseSettings):
 
 
 @lru_cache(maxsize=1)
-def get_settings() -> Settings:
+def _load_settings() -> Settings:
     return Settings()
+
+
+_settings_override: ContextVar[Settings | None] = ContextVar("training_factory_settings", default=None)
+
+
+def get_settings() -> Settings:
+    """Return the active settings: a context-local override, else the cached environment."""
+
+    override = _settings_override.get()
+    return override if override is not None else _load_settings()
+
+
+def clear_settings_cache() -> None:
+    """Drop the cached environment settings so the next ``get_settings`` re-reads them."""
+
+    _load_settings.cache_clear()
+
+
+@contextmanager
+def settings_override(**updates: Any) -> Iterator[Settings]:
+    """Override settings fields for the current context only.
+
+    ``updates`` are field names (e.g. ``training_factory_offline=True``). Unlike
+    mutating ``os.environ``, the override is local to this thread/context, so
+    concurrent in-process runs can use different settings safely.
+    """
+
+    unknown = sorted(set(updates) - set(Settings.model_fields))
+    if unknown:
+        raise ValueError(f"Unknown settings field(s): {', '.join(unknown)}")
+    settings = get_settings().model_copy(update=updates)
+    token = _settings_override.set(settings)
+    try:
+        yield settings
+    finally:
+        _settings_override.reset(token)
+
+
+@contextmanager
+def offline_override(enabled: bool) -> Iterator[Settings]:
+    """Force offline mode for the current context when ``enabled``; otherwise a no-op."""
+
+    if not enabled:
+        yield get_settings()
+        return
+    with settings_override(training_factory_offline=True) as settings:
+        yield settings
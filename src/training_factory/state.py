@@ -16,3 +16,4 @@ class TrainingState(BaseModel):
     packaging: dict[str, Any] = Field(default_factory=dict)
     research_revision_count: int = 0
     revision_count: int = 0
+    skipped_retries: list[dict[str, Any]] = Field(default_factory=list)
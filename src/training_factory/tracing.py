@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+SpanCategory = str  # "node", "llm", "search", "fetch"
+
+
+@dataclass
+class Span:
+    name: str
+    category: SpanCategory
+    span_id: int
+    parent_id: int | None
+    thread_id: int
+    start_s: float
+    end_s: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_s(self) -> float:
+        if self.end_s is None:
+            return 0.0
+        return max(0.0, self.end_s - self.start_s)
+
+
+class Tracer:
+    """Collects spans for one pipeline run and exports them locally."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._origin_perf = time.perf_counter()
+        self._origin_unix = time.time()
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin_perf
+
+    def start_span(self, name: str, category: SpanCategory, parent: Span | None, **attributes: Any) -> Span:
+        span = Span(
+            name=name,
+            category=category,
+            span_id=next(self._ids),
+            parent_id=parent.span_id if parent is not None else None,
+            thread_id=threading.get_ident(),
+            start_s=self._now(),
+            attributes=dict(attributes),
+        )
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def end_span(self, span: Span) -> None:
+        span.end_s = self._now()
+
+    def finished_spans(self, category: SpanCategory | None = None) -> list[Span]:
+        with self._lock:
+            spans = list(self.spans)
+        return [
+            span
+            for span in spans
+            if span.end_s is not None and (category is None or span.category == category)
+        ]
+
+    def stage_latency_summary(self) -> dict[str, float]:
+        """Total wall time in milliseconds per graph node, summed across retries.
+
+        A node span that is still open (such as the package node asking for the
+        summary) counts its time so far.
+        """
+
+        now = self._now()
+        with self._lock:
+            spans = [span for span in self.spans if span.category == "node"]
+        totals: dict[str, float] = {}
+        for span in spans:
+            end_s = span.end_s if span.end_s is not None else now
+            totals[span.name] = totals.get(span.name, 0.0) + max(0.0, end_s - span.start_s) * 1000
+        return {name: round(total, 3) for name, total in totals.items()}
+
+    def to_records(self) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        for span in self.finished_spans():
+            records.append(
+                {
+                    "name": span.name,
+                    "category": span.category,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "thread_id": span.thread_id,
+                    "start_unix": round(self._origin_unix + span.start_s, 6),
+                    "end_unix": round(self._origin_unix + (span.end_s or span.start_s), 6),
+                    "duration_ms": round(span.duration_s * 1000, 3),
+                    "attributes": span.attributes,
+                }
+            )
+        return records
+
+    def write_jsonl(self, path: str | Path) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("w", encoding="utf-8") as handle:
+            for record in self.to_records():
+                handle.write(json.dumps(record, default=str) + "\n")
+        return target
+
+    def write_chrome_trace(self, path: str | Path) -> Path:
+        """Write spans in Chrome trace-event format (chrome://tracing, Perfetto)."""
+
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start_s * 1_000_000, 3),
+                "dur": round(span.duration_s * 1_000_000, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.attributes,
+            }
+            for span in self.finished_spans()
+        ]
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str) + "\n",
+            encoding="utf-8",
+        )
+        return target
+
+
+_current_tracer: ContextVar[Tracer | None] = ContextVar("training_factory_tracer", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("training_factory_span", default=None)
+
+
+def get_tracer() -> Tracer | None:
+    return _current_tracer.get()
+
+
+@contextmanager
+def tracing_scope(tracer: Tracer | None) -> Iterator[Tracer | None]:
+    """Make ``tracer`` the active tracer for the current context."""
+
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, category: SpanCategory, **attributes: Any) -> Iterator[Span | None]:
+    """Record a span on the active tracer; a no-op when tracing is inactive."""
+
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+
+    current = tracer.start_span(name, category, _current_span.get(), **attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.attributes["error"] = type(exc).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.end_span(current)
+
+
+def annotate(**attributes: Any) -> None:
+    """Attach attributes to the innermost active span, if any."""
+
+    current = _current_span.get()
+    if current is not None and _current_tracer.get() is not None:
+        current.attributes.update(attributes)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from typing import IO, Any, Literal
+
+try:  # optional speedup (the ``fast`` extra); the stdlib encoder is used when orjson is missing
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+BundleFormat = Literal["json", "json-compact", "json.gz", "ndjson"]
+BUNDLE_FORMATS: tuple[BundleFormat, ...] = ("json", "json-compact", "json.gz", "ndjson")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_WRITE_CHUNK_CHARS = 64 * 1024
+_SUFFIXES: dict[str, str] = {
+    "json": ".json",
+    "json-compact": ".json",
+    "json.gz": ".json.gz",
+    "ndjson": ".ndjson",
+}
+
+
+def bundle_suffix(fmt: BundleFormat) -> str:
+    """Return the conventional file suffix for a bundle format."""
+
+    if fmt not in _SUFFIXES:
+        raise ValueError(f"Unknown bundle format {fmt!r}; expected one of {', '.join(BUNDLE_FORMATS)}")
+    return _SUFFIXES[fmt]
+
+
+def _dump_json(value: Any, fh: IO[bytes] | gzip.GzipFile, *, indent: bool) -> None:
+    # Both encoders write UTF-8 without escaping non-ASCII and use the same
+    # separators, so a bundle's bytes do not depend on whether orjson is installed
+    # (only floats that need an exponent are spelled differently).
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        fh.write(orjson.dumps(value, option=option))
+        return
+    # Stream the encoder's chunks in batches instead of building the whole
+    # document in memory.
+    if indent:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    pending: list[str] = []
+    pending_chars = 0
+    for chunk in encoder.iterencode(value):
+        pending.append(chunk)
+        pending_chars += len(chunk)
+        if pending_chars >= _WRITE_CHUNK_CHARS:
+            fh.write("".join(pending).encode("utf-8"))
+            pending, pending_chars = [], 0
+    if pending:
+        fh.write("".join(pending).encode("utf-8"))
+
+
+def dump_bundle(bundle: dict[str, Any], fh: IO[bytes], fmt: BundleFormat = "json") -> None:
+    """Write ``bundle`` to a binary file handle in ``fmt``.
+
+    ``ndjson`` writes one ``{"<section>": ...}`` object per top-level bundle key,
+    so large bundles can be inspected or grepped a section at a time.
+    """
+
+    bundle_suffix(fmt)
+    if fmt == "json.gz":
+        # mtime=0 keeps identical bundles byte-identical on disk.
+        with gzip.GzipFile(filename="", mode="wb", fileobj=fh, compresslevel=6, mtime=0) as gz:
+            _dump_json(bundle, gz, indent=False)
+            gz.write(b"\n")
+        return
+    if fmt == "ndjson":
+        for key, value in bundle.items():
+            _dump_json({key: value}, fh, indent=False)
+            fh.write(b"\n")
+        return
+    _dump_json(bundle, fh, indent=fmt == "json")
+    fh.write(b"\n")
+
+
+def write_bundle(bundle: dict[str, Any], path: str | Path, fmt: BundleFormat = "json") -> Path:
+    """Stream ``bundle`` to ``path`` in ``fmt``, creating parent directories."""
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("wb") as fh:
+        dump_bundle(bundle, fh, fmt)
+    return target
+
+
+def _loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads_bundle(data: bytes) -> dict[str, Any]:
+    """Decode a bundle written in any of ``BUNDLE_FORMATS``.
+
+    Raises ``ValueError`` (including ``json.JSONDecodeError`` and
+    ``UnicodeDecodeError``) when the payload is not a readable bundle.
+    """
+
+    if data.startswith(_GZIP_MAGIC):
+        try:
+            data = gzip.decompress(data)
+        except (OSError, EOFError) as exc:
+            raise ValueError(f"Corrupt gzip bundle: {exc}") from exc
+
+    text = data.decode("utf-8")
+    try:
+        payload = _loads(text)
+    except json.JSONDecodeError:
+        lines = [line for line in text.splitlines() if line.strip()]
+        if len(lines) < 2:
+            raise
+        # ndjson: merge one single-section object per line.
+        payload = {}
+        for line in lines:
+            section = _loads(line)
+            if not isinstance(section, dict):
+                raise ValueError("Each ndjson bundle line must be a JSON object") from None
+            payload.update(section)
+
+    if not isinstance(payload, dict):
+        raise ValueError("Bundle JSON must be an object at top level.")
+    return payload
+
+
+def read_bundle(path: str | Path) -> dict[str, Any]:
+    """Read a bundle from ``path``, detecting gzip and ndjson automatically."""
+
+    return loads_bundle(Path(path).read_bytes())
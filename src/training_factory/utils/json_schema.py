@@ -1,14 +1,133 @@
+from __future__ import annotations
+
+import hashlib
 import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from training_factory.settings import get_settings
+
+if TYPE_CHECKING:
+    from jsonschema.protocols import Validator
+
+
+@lru_cache(maxsize=None)
+def _load_schema(resolved_path: str) -> dict[str, Any]:
+    with open(resolved_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def _compiled_validator(resolved_path: str) -> Validator:
+    # jsonschema is imported lazily so CLI startup doesn't pay for it.
+    from jsonschema.validators import validator_for
+
+    schema = _load_schema(resolved_path)
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema, format_checker=cls.FORMAT_CHECKER)
+
+
+@lru_cache(maxsize=256)
+def _resolve(schema_path: str | Path) -> str:
+    return str(Path(schema_path).resolve())
+
+
+def load_schema(schema_path: str | Path) -> dict[str, Any]:
+    """Return the parsed schema, read from disk once per process.
+
+    The returned dict is shared; callers must not mutate it.
+    """
+
+    return _load_schema(_resolve(schema_path))
+
+
+def get_validator(schema_path: str | Path) -> Validator:
+    """Return a checked, precompiled validator for the schema, built once per process."""
+
+    return _compiled_validator(_resolve(schema_path))
+
+
+def preload_schemas(schema_dir: str | Path) -> int:
+    """Compile every ``*.schema.json`` in ``schema_dir`` up front; returns the count."""
+
+    paths = sorted(Path(schema_dir).glob("*.schema.json"))
+    for path in paths:
+        get_validator(path)
+    return len(paths)
+
+
+class _ValidatedFingerprints:
+    """Bounded LRU of (schema, content hash) pairs that already passed validation."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_validated = _ValidatedFingerprints()
+
+
+def _fingerprint(instance: Any) -> str | None:
+    try:
+        encoded = json.dumps(instance, sort_keys=True, separators=(",", ":"), allow_nan=False)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def clear_schema_cache() -> None:
+    _compiled_validator.cache_clear()
+    _load_schema.cache_clear()
+    _resolve.cache_clear()
+    _validated.clear()
+
+
+def validate_json(instance: dict[str, Any], schema_path: str | Path, *, stage: bool = False) -> None:
+    """Validate a JSON-like object against a schema file.
+
+    Honors the ``validation`` setting: ``strict`` checks everything,
+    ``final-only`` skips ``stage=True`` (per-agent) checks, and ``off`` skips all.
+    An object identical to one that already passed against the same schema is
+    not validated again.
+    """
 
-from jsonschema import validate
+    level = get_settings().validation
+    if level == "off" or (stage and level == "final-only"):
+        return
 
+    resolved = _resolve(schema_path)
+    fingerprint = _fingerprint(instance)
+    if fingerprint is not None and (resolved, fingerprint) in _validated:
+        return
 
-def validate_json(instance: dict[str, Any], schema_path: str | Path) -> None:
-    """Validate a JSON-like object against a schema file."""
+    from jsonschema.exceptions import best_match
 
-    path = Path(schema_path)
-    with path.open("r", encoding="utf-8") as f:
-        schema = json.load(f)
-    validate(instance=instance, schema=schema)
+    # Same error selection as jsonschema.validate, without re-reading the schema.
+    error = best_match(_compiled_validator(resolved).iter_errors(instance))
+    if error is not None:
+        raise error
+    if fingerprint is not None:
+        _validated.add((resolved, fingerprint))
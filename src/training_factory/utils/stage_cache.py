@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable
+
+from training_factory.budget import get_budget
+from training_factory.settings import Settings, get_settings
+from training_factory.tracing import annotate
+
+# Bump to invalidate every cached artifact after a change the per-module
+# source hashes cannot see (e.g. a shared helper outside the agent module).
+STAGE_CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=None)
+def _source_digest(source_file: str) -> str:
+    try:
+        return hashlib.sha256(Path(source_file).read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def stage_version(agent: Callable[..., Any]) -> str:
+    """Return a version string covering the agent's code and prompt text."""
+
+    try:
+        source_file = inspect.getsourcefile(agent) or ""
+    except TypeError:
+        source_file = ""
+    qualname = getattr(agent, "__qualname__", repr(agent))
+    return f"{STAGE_CACHE_VERSION}:{qualname}:{_source_digest(source_file)}"
+
+
+def _settings_fingerprint(settings: Settings) -> dict[str, Any]:
+    return {
+        "offline": settings.offline_mode,
+        "openai_model": settings.openai_model,
+        "openai_temperature": settings.openai_temperature,
+        "llm_enabled": bool(settings.openai_api_key),
+        "serpapi_enabled": bool(settings.serpapi_api_key or os.getenv("SERPAPI_API_KEY")),
+        # Artifacts produced with stage validation disabled must not satisfy strict runs.
+        "stage_validated": settings.validation == "strict",
+    }
+
+
+def stage_key(stage: str, inputs: dict[str, Any], *, version: str, settings: Settings) -> str:
+    """Hash a stage's inputs, code version, and output-affecting settings."""
+
+    material = {
+        "stage": stage,
+        "version": version,
+        "settings": _settings_fingerprint(settings),
+        "inputs": inputs,
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class StageCache:
+    """Content-addressed artifact store with one JSON file per stage output."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / key[:2] / f"{key}.json"
+
+    def get(self, stage: str, key: str) -> dict[str, Any] | None:
+        path = self._path(stage, key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def put(self, stage: str, key: str, artifact: dict[str, Any]) -> None:
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(artifact, handle)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+@lru_cache(maxsize=8)
+def _stage_cache_for(root: str) -> StageCache:
+    return StageCache(root)
+
+
+def get_stage_cache(settings: Settings | None = None) -> StageCache | None:
+    """Return the configured stage cache, or None when caching is disabled."""
+
+    cfg = settings or get_settings()
+    if not cfg.stage_cache_dir:
+        return None
+    return _stage_cache_for(str(Path(cfg.stage_cache_dir).expanduser()))
+
+
+def cached_stage(
+    stage: str,
+    inputs: dict[str, Any],
+    agent: Callable[..., Any],
+    produce: Callable[[], dict[str, Any]],
+) -> dict[str, Any]:
+    """Return a memoized stage artifact, calling ``produce`` only on a miss."""
+
+    settings = get_settings()
+    cache = get_stage_cache(settings)
+    if cache is None:
+        return produce()
+
+    key = stage_key(stage, inputs, version=stage_version(agent), settings=settings)
+    hit = cache.get(stage, key)
+    annotate(stage_cache_hit=hit is not None)
+    if hit is not None:
+        return hit
+
+    artifact = produce()
+    budget = get_budget()
+    if budget is None or not budget.degraded:
+        # Budget-degraded artifacts (skipped enrichment, stub fallbacks) are
+        # not representative of the inputs, so they are never stored.
+        cache.put(stage, key, artifact)
+    return artifact
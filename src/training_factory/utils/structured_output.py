@@ -4,6 +4,9 @@ import json
 from pathlib import Path
 from typing import Callable
 
+from pydantic import BaseModel
+
+from training_factory.artifacts import validate_artifact
 from training_factory.settings import get_settings
 from training_factory.utils.json_extract import extract_json_object
 from training_factory.utils.json_schema import validate_json
@@ -16,8 +19,13 @@ def generate_structured_output(
     *,
     normalize: Callable[[dict], dict] | None = None,
     offline_stub: dict | None = None,
+    artifact_model: type[BaseModel] | None = None,
 ) -> dict:
-    """Generate, normalize, and validate structured output."""
+    """Generate, normalize, and validate structured output.
+
+    With ``artifact_model`` the payload is validated through pydantic instead of
+    jsonschema; ``schema_path`` is used otherwise.
+    """
 
     settings = get_settings()
 
@@ -33,5 +41,7 @@ def generate_structured_output(
     if normalize is not None:
         payload = normalize(payload)
 
-    validate_json(payload, schema_path)
+    if artifact_model is not None:
+        return validate_artifact(payload, artifact_model)
+    validate_json(payload, schema_path, stage=True)
     return payload
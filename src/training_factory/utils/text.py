@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
+# Runs of characters for which str.isalnum() is true (\w minus the underscore).
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Titles, topics and keywords repeat across scoring and QA; long page/snippet
+# text rarely does, so it bypasses the cache instead of filling it.
+_MAX_CACHED_CHARS = 256
+
+
+def _tokenize(text: str, min_length: int) -> frozenset[str]:
+    return frozenset(
+        token for token in (match.lower() for match in _TOKEN_RE.findall(text)) if len(token) >= min_length
+    )
+
+
+_tokenize_cached = lru_cache(maxsize=8192)(_tokenize)
+
+
+def tokenize(text: str, min_length: int = 1) -> frozenset[str]:
+    """Return the distinct lowercase alphanumeric tokens of ``text``.
+
+    Tokens shorter than ``min_length`` are dropped. Short strings are served
+    from an LRU cache; the result is immutable, so copy it before mutating.
+    """
+
+    if len(text) <= _MAX_CACHED_CHARS:
+        return _tokenize_cached(text, min_length)
+    return _tokenize(text, min_length)
+
+
+def tokenize_all(texts: Iterable[str], min_length: int = 1) -> frozenset[str]:
+    """Union of ``tokenize`` over several strings."""
+
+    return frozenset().union(*(tokenize(text, min_length) for text in texts))
+
+
+def normalize_whitespace(text: str) -> str:
+    """Lowercase ``text`` and collapse whitespace runs to single spaces."""
+
+    return " ".join(text.lower().split())
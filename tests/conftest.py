@@ -21,7 +21,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 def _clear_settings_cache() -> None:
     settings_module = import_module("training_factory.settings")
-    settings_module.get_settings.cache_clear()
+    settings_module.clear_settings_cache()
 
 
 @pytest.fixture(autouse=True)
@@ -29,5 +29,6 @@ def force_offline_mode(monkeypatch) -> Generator[None, None, None]:
     monkeypatch.setenv("TRAINING_FACTORY_OFFLINE", "1")
     monkeypatch.setenv("OPENAI_API_KEY", "sk-test-should-not-be-used")
     _clear_settings_cache()
+    import_module("training_factory.research.negative_cache").get_negative_cache().clear()
     yield
     _clear_settings_cache()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.artifacts import ARTIFACT_MODELS, Lab
+from training_factory.graph import run_pipeline
+from training_factory.utils.json_schema import get_validator
+
+SCHEMA_DIR = Path(__file__).resolve().parents[1] / "schemas"
+_COMPARED_KEYWORDS = ("type", "enum", "const", "minLength", "maxLength", "pattern", "minimum", "minItems", "maxItems")
+
+
+def _shape(node: dict[str, Any], defs: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a JSON schema to the keywords both sides must agree on."""
+
+    if "$ref" in node:
+        node = defs[node["$ref"].rsplit("/", 1)[-1]]
+    shape = {key: node[key] for key in _COMPARED_KEYWORDS if key in node}
+    if "properties" in node:
+        shape["type"] = "object"
+        shape["properties"] = {key: _shape(value, defs) for key, value in node["properties"].items()}
+        shape["required"] = sorted(node.get("required", []))
+        shape["additionalProperties"] = node.get("additionalProperties", True)
+    if "items" in node:
+        shape["items"] = _shape(node["items"], defs)
+    return shape
+
+
+@pytest.mark.parametrize("schema_name", sorted(ARTIFACT_MODELS))
+def test_models_match_schema_files(schema_name: str) -> None:
+    schema = json.loads((SCHEMA_DIR / schema_name).read_text(encoding="utf-8"))
+    model_schema = ARTIFACT_MODELS[schema_name].model_json_schema()
+
+    assert _shape(model_schema, model_schema.get("$defs", {})) == _shape(schema, {})
+
+
+def test_models_and_schemas_agree_on_pipeline_artifacts() -> None:
+    state = run_pipeline(topic="Power BI basics", audience="novice")
+
+    for schema_name, model in ARTIFACT_MODELS.items():
+        artifact = getattr(state, schema_name.removesuffix(".schema.json"))
+        assert not list(get_validator(SCHEMA_DIR / schema_name).iter_errors(artifact))
+        model.model_validate(artifact)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda lab: lab.update({"steps": lab["steps"][:2]}),
+        lambda lab: lab.update({"unexpected": True}),
+        lambda lab: lab["steps"][0].update({"step": "1"}),
+        lambda lab: lab["steps"][0].update({"expected_output": None}),
+        lambda lab: lab.update({"checkpoints": ["ok", "fine"]}),
+    ],
+)
+def test_models_and_schemas_reject_the_same_invalid_lab(mutate) -> None:
+    state = run_pipeline(topic="Power BI basics", audience="novice")
+    lab = json.loads(json.dumps(state.lab))
+    mutate(lab)
+
+    assert list(get_validator(SCHEMA_DIR / "lab.schema.json").iter_errors(lab))
+    with pytest.raises(ValidationError):
+        Lab.model_validate(lab)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+import sys
+
+import pytest
+from typer.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.cli import app
+from training_factory.utils import bundle_io
+from training_factory.utils.bundle_io import BUNDLE_FORMATS, read_bundle, write_bundle
+
+BUNDLE = {
+    "request": {"topic": "Power BI basics", "audience": "novice"},
+    "research": {"sources": [{"id": "src_001", "snippet": "Données – governance"}]},
+    "qa": {"status": "pass", "checks": []},
+}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("fmt", BUNDLE_FORMATS)
+def test_every_format_round_trips(tmp_path, monkeypatch, fmt: str, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(bundle_io, "orjson", None)
+    elif bundle_io.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    path = write_bundle(BUNDLE, tmp_path / f"bundle{bundle_io.bundle_suffix(fmt)}", fmt)
+
+    assert read_bundle(path) == BUNDLE
+
+
+@pytest.mark.parametrize("fmt", BUNDLE_FORMATS)
+def test_stdlib_fallback_streams_the_same_bytes_as_orjson(tmp_path, monkeypatch, fmt: str) -> None:
+    if bundle_io.orjson is None:
+        pytest.skip("orjson is not installed")
+    bundle = {**BUNDLE, "research_qa": {"metrics": {"keyword_coverage_ratio": 0.833, "tier_counts": {"A": 5}}}}
+    fast = write_bundle(bundle, tmp_path / f"fast{bundle_io.bundle_suffix(fmt)}", fmt).read_bytes()
+
+    monkeypatch.setattr(bundle_io, "orjson", None)
+    # The fallback must not build the document as one string first.
+    monkeypatch.setattr(bundle_io.json, "dumps", lambda *_args, **_kwargs: pytest.fail("json.dumps was called"))
+    slow = write_bundle(bundle, tmp_path / f"slow{bundle_io.bundle_suffix(fmt)}", fmt).read_bytes()
+
+    assert slow == fast
+    assert "Données".encode("utf-8") in (gzip.decompress(slow) if fmt == "json.gz" else slow)
+
+
+def test_formats_have_expected_encodings(tmp_path) -> None:
+    compact = write_bundle(BUNDLE, tmp_path / "compact.json", "json-compact").read_bytes()
+    indented = write_bundle(BUNDLE, tmp_path / "indented.json", "json").read_bytes()
+    gz = write_bundle(BUNDLE, tmp_path / "bundle.json.gz", "json.gz").read_bytes()
+    ndjson = write_bundle(BUNDLE, tmp_path / "bundle.ndjson", "ndjson").read_text(encoding="utf-8")
+
+    assert b"\n" not in compact.rstrip(b"\n")
+    assert len(compact) < len(indented)
+    assert json.loads(gzip.decompress(gz)) == BUNDLE
+    assert [next(iter(json.loads(line))) for line in ndjson.splitlines()] == ["request", "research", "qa"]
+    # Gzip output carries no timestamp, so identical bundles are byte-identical.
+    assert write_bundle(BUNDLE, tmp_path / "again.json.gz", "json.gz").read_bytes() == gz
+
+
+def test_read_bundle_rejects_non_object_payloads(tmp_path) -> None:
+    path = tmp_path / "list.json"
+    path.write_text("[1, 2]", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="object at top level"):
+        read_bundle(path)
+
+
+def test_cli_generate_writes_gzip_bundle(tmp_path) -> None:
+    out_path = tmp_path / "bundle.json.gz"
+
+    result = CliRunner().invoke(
+        app,
+        ["generate", "--topic", "Intro to Python", "--out", str(out_path), "--offline", "--format", "json.gz"],
+    )
+
+    assert result.exit_code == 0
+    assert out_path.read_bytes()[:2] == b"\x1f\x8b"
+    assert read_bundle(out_path)["request"]["topic"] == "Intro to Python"
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+from typer.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.cli import app
+
+
+def _write_requests(path: Path) -> None:
+    lines = [
+        json.dumps({"id": "c1", "topic": "Power BI basics", "audience": "novice"}),
+        json.dumps({"topic": "Power Apps basics", "audience": "intermediate"}),
+        "not json",
+        "",
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _summary(out_dir: Path) -> dict[int, dict]:
+    rows = [json.loads(line) for line in (out_dir / "summary.jsonl").read_text(encoding="utf-8").splitlines()]
+    return {row["line"]: row for row in rows}
+
+
+def test_generate_batch_writes_bundles_and_summary(tmp_path) -> None:
+    requests_path = tmp_path / "requests.jsonl"
+    out_dir = tmp_path / "out"
+    _write_requests(requests_path)
+
+    result = CliRunner().invoke(
+        app,
+        ["generate-batch", "--in", str(requests_path), "--out-dir", str(out_dir), "--workers", "2", "--offline"],
+    )
+
+    assert result.exit_code == 1  # the invalid line is reported as an error
+    rows = _summary(out_dir)
+    assert rows[1]["status"] == "ok"
+    assert rows[1]["bundle_path"] == str(out_dir / "c1.json")
+    assert rows[2]["status"] == "ok"
+    assert rows[2]["bundle_path"] == str(out_dir / "line-00002.json")
+    assert rows[3]["status"] == "error"
+    assert 4 not in rows
+
+    bundle = json.loads((out_dir / "c1.json").read_text(encoding="utf-8"))
+    assert bundle["request"]["topic"] == "Power BI basics"
+    assert "ok=2 skipped=0 error=1" in result.stdout
+
+
+def test_generate_batch_resumes_by_skipping_valid_bundles(tmp_path) -> None:
+    requests_path = tmp_path / "requests.jsonl"
+    out_dir = tmp_path / "out"
+    _write_requests(requests_path)
+    runner = CliRunner()
+    args = ["generate-batch", "--in", str(requests_path), "--out-dir", str(out_dir), "--offline"]
+
+    runner.invoke(app, args)
+    (out_dir / "line-00002.json").write_text("{\"truncated\": true}", encoding="utf-8")
+
+    result = runner.invoke(app, args)
+
+    rows = _summary(out_dir)
+    assert rows[1]["status"] == "skipped"
+    assert rows[2]["status"] == "ok"
+    regenerated = json.loads((out_dir / "line-00002.json").read_text(encoding="utf-8"))
+    assert regenerated["request"]["topic"] == "Power Apps basics"
+    assert "ok=1 skipped=1 error=1" in result.stdout
+
+
+def test_generate_batch_rejects_duplicate_bundle_names(tmp_path) -> None:
+    requests_path = tmp_path / "requests.jsonl"
+    out_dir = tmp_path / "out"
+    lines = [
+        json.dumps({"id": "dup", "topic": "Power BI basics", "audience": "novice"}),
+        json.dumps({"request_id": "dup", "topic": "Power Apps basics", "audience": "novice"}),
+    ]
+    requests_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    args = ["generate-batch", "--in", str(requests_path), "--out-dir", str(out_dir), "--offline"]
+
+    result = CliRunner().invoke(app, args)
+
+    assert result.exit_code == 1
+    rows = _summary(out_dir)
+    assert rows[1]["status"] == "ok"
+    assert rows[2]["status"] == "error"
+    assert "line 1" in rows[2]["error"]
+    bundle = json.loads((out_dir / "dup.json").read_text(encoding="utf-8"))
+    assert bundle["request"]["topic"] == "Power BI basics"
+
+
+def test_generate_batch_resume_appends_to_summary(tmp_path) -> None:
+    requests_path = tmp_path / "requests.jsonl"
+    out_dir = tmp_path / "out"
+    _write_requests(requests_path)
+    args = ["generate-batch", "--in", str(requests_path), "--out-dir", str(out_dir), "--offline"]
+    runner = CliRunner()
+
+    runner.invoke(app, args)
+    runner.invoke(app, args)
+
+    rows = [json.loads(line) for line in (out_dir / "summary.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [(row["line"], row["status"]) for row in rows if row["line"] == 1] == [(1, "ok"), (1, "skipped")]
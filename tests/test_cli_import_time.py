@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Generous ceiling: the lazy CLI imports in ~0.2s, the eager one took ~1.8s.
+CLI_IMPORT_BUDGET_US = 1_000_000
+HEAVY_MODULES = ("langgraph", "langchain_openai", "langchain_core", "jsonschema", "training_factory.graph")
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(SRC_DIR), os.environ.get("PYTHONPATH", "")])}
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def _cumulative_import_us(stderr: str, module: str) -> int:
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if name.strip() == module:
+            return int(cumulative_us)
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+def test_cli_import_skips_heavy_dependencies() -> None:
+    probe = "import sys, training_factory.cli; print(','.join(m for m in {!r} if m in sys.modules))".format(
+        HEAVY_MODULES
+    )
+    result = _run_python("-c", probe)
+
+    assert result.stdout.strip() == ""
+
+
+def test_cli_import_time_stays_within_budget() -> None:
+    _run_python("-c", "import training_factory.cli")  # warm the bytecode cache
+    result = _run_python("-X", "importtime", "-c", "import training_factory.cli")
+
+    assert _cumulative_import_us(result.stderr, "training_factory.cli") < CLI_IMPORT_BUDGET_US
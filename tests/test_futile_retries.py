@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.graph import run_pipeline
+from training_factory.tracing import Tracer
+
+
+def test_research_retry_is_skipped_when_candidate_pool_would_repeat(monkeypatch) -> None:
+    import training_factory.graph as graph_module
+
+    calls = {"research": 0}
+    original_research = graph_module.generate_research
+    original_research_qa = graph_module.generate_research_qa
+
+    def counting_research(request: dict) -> dict:
+        calls["research"] += 1
+        return original_research(request)
+
+    def failing_research_qa(research: dict, request: dict) -> dict:
+        return {**original_research_qa(research, request), "status": "fail"}
+
+    monkeypatch.setattr(graph_module, "generate_research", counting_research)
+    monkeypatch.setattr(graph_module, "generate_research_qa", failing_research_qa)
+
+    tracer = Tracer()
+    state = run_pipeline(topic="Power BI basics", audience="novice", research={"max_retries": 2}, tracer=tracer)
+
+    # Predicting the retry's pool must not show up as searches under research_qa.
+    research_qa_span = next(item for item in tracer.finished_spans("node") if item.name == "research_qa")
+    assert not [item for item in tracer.finished_spans() if item.parent_id == research_qa_span.span_id]
+    assert "search_calls" not in research_qa_span.attributes
+    assert state.research["metrics"]["candidate_pool"]
+    assert calls["research"] == 1
+    assert state.research_revision_count == 0
+    assert state.packaging["execution"]["skipped_retries"] == [
+        {"loop": "research", "attempt": 1, "reason": "identical_results"}
+    ]
+
+
+def test_research_retry_runs_when_the_strategy_rescores_the_same_urls(monkeypatch) -> None:
+    import training_factory.graph as graph_module
+
+    calls = {"research": 0}
+    original_research = graph_module.generate_research
+    original_research_qa = graph_module.generate_research_qa
+
+    def counting_research(request: dict) -> dict:
+        calls["research"] += 1
+        return original_research(request)
+
+    def authority_failing_research_qa(research: dict, request: dict) -> dict:
+        payload = original_research_qa(research, request)
+        checks = [
+            {**check, "answer": "No"} if check["prompt"].startswith("Authority threshold") else check
+            for check in payload["checks"]
+        ]
+        return {**payload, "checks": checks, "status": "fail"}
+
+    monkeypatch.setattr(graph_module, "generate_research", counting_research)
+    monkeypatch.setattr(graph_module, "generate_research_qa", authority_failing_research_qa)
+
+    state = run_pipeline(topic="Power BI basics", audience="novice", research={"max_retries": 1})
+
+    # The fallback provider returns the same URLs, but the authority strategy
+    # adds intent keywords and re-weights tiers, so the retry is not futile.
+    assert calls["research"] == 2
+    assert state.research_revision_count == 1
+    assert "skipped_retries" not in state.packaging["execution"]
+
+
+def test_qa_retry_is_skipped_when_offline_stubs_cannot_change(monkeypatch) -> None:
+    import training_factory.graph as graph_module
+
+    original_qa = graph_module.generate_qa
+
+    def failing_qa(*args: dict) -> dict:
+        return {**original_qa(*args), "status": "fail"}
+
+    monkeypatch.setattr(graph_module, "generate_qa", failing_qa)
+
+    state = run_pipeline(topic="Power BI basics", audience="novice")
+
+    assert state.revision_count == 0
+    assert state.packaging["execution"]["skipped_retries"] == [
+        {"loop": "qa", "attempt": 1, "reason": "offline_stubs"}
+    ]
+
+
+def test_qa_retry_still_runs_when_a_stage_is_not_retry_invariant(monkeypatch) -> None:
+    import training_factory.graph as graph_module
+
+    original_qa = graph_module.generate_qa
+    original_slides = graph_module.generate_slides
+    calls = {"slides": 0}
+
+    def failing_qa(*args: dict) -> dict:
+        return {**original_qa(*args), "status": "fail"}
+
+    def counting_slides(*args, **kwargs) -> dict:
+        calls["slides"] += 1
+        return original_slides(*args, **kwargs)
+
+    monkeypatch.setattr(graph_module, "generate_qa", failing_qa)
+    monkeypatch.setattr(graph_module, "generate_slides", counting_slides)
+
+    state = run_pipeline(topic="Power BI basics", audience="novice")
+
+    assert calls["slides"] == 2
+    assert state.revision_count == 1
+    assert "skipped_retries" not in state.packaging["execution"]
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.graph import get_compiled_graph, run_pipeline
+
+
+def test_run_pipeline_reuses_compiled_graph(monkeypatch) -> None:
+    import training_factory.graph as graph_module
+
+    calls = {"build": 0}
+    original_build = graph_module.build_graph
+
+    def counting_build():
+        calls["build"] += 1
+        return original_build()
+
+    monkeypatch.setattr(graph_module, "build_graph", counting_build)
+
+    first = run_pipeline(topic="Intro to Python", audience="novice")
+    second = run_pipeline(topic="Power BI basics", audience="novice")
+
+    assert calls["build"] == 1
+    assert first.packaging["request"]["topic"] == "Intro to Python"
+    assert second.packaging["request"]["topic"] == "Power BI basics"
+
+
+def test_compiled_graph_is_rebuilt_when_a_node_changes(monkeypatch) -> None:
+    import training_factory.graph as graph_module
+
+    before = get_compiled_graph()
+    assert get_compiled_graph() is before
+
+    original_node = graph_module._brief_node
+    monkeypatch.setattr(graph_module, "_brief_node", lambda state: original_node(state))
+
+    assert get_compiled_graph() is not before
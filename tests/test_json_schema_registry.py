@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+import pytest
+from jsonschema import ValidationError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.utils.json_schema import (
+    clear_schema_cache,
+    get_validator,
+    load_schema,
+    preload_schemas,
+    validate_json,
+)
+
+SCHEMA_DIR = Path(__file__).resolve().parents[1] / "schemas"
+
+
+def test_validator_is_compiled_once_per_schema(tmp_path) -> None:
+    schema_path = tmp_path / "thing.schema.json"
+    schema_path.write_text(
+        json.dumps({"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}}),
+        encoding="utf-8",
+    )
+
+    first = get_validator(schema_path)
+    # Different spellings of the same file share one entry.
+    assert get_validator(tmp_path / "." / "thing.schema.json") is first
+    assert load_schema(schema_path) is load_schema(schema_path)
+
+    schema_path.write_text(json.dumps({"type": "array"}), encoding="utf-8")
+    validate_json({"name": "cached"}, schema_path)  # still uses the compiled object schema
+
+    clear_schema_cache()
+    with pytest.raises(ValidationError):
+        validate_json({"name": "reloaded"}, schema_path)
+
+
+def test_validate_json_reports_schema_errors() -> None:
+    with pytest.raises(ValidationError) as excinfo:
+        validate_json({"topic": "x"}, SCHEMA_DIR / "bundle.schema.json")
+
+    assert "required" in excinfo.value.message
+
+
+def test_preload_compiles_every_repo_schema() -> None:
+    count = preload_schemas(SCHEMA_DIR)
+
+    assert count == len(list(SCHEMA_DIR.glob("*.schema.json")))
+    assert count > 0
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import training_factory.agents.research as research_module
+import training_factory.research.fetch_extract as fetch_extract_module
+from training_factory.agents.research import generate_research
+from training_factory.budget import RunBudget, budget_scope
+from training_factory.research.negative_cache import NegativeCache, canonical_url, failure_ttl, get_negative_cache
+from training_factory.research.providers import SearchResult
+
+_PAGE = "<html><body><h2>Governance</h2><p>Governance best practices include environment separation.</p></body></html>"
+
+
+class _StaticProvider:
+    def search(self, query: str, *, num_results: int = 10) -> list[SearchResult]:
+        _ = (query, num_results)
+        return [
+            SearchResult(title=f"Power BI guidance {i}", url=f"https://learn.microsoft.com/power-bi/page-{i}")
+            for i in range(6)
+        ]
+
+
+class _ForbiddenSession:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get(self, url: str, *, timeout: float) -> requests.Response:
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 403
+        response.url = url
+        return response
+
+
+def test_canonical_url_ignores_case_fragment_and_default_port() -> None:
+    assert canonical_url("HTTPS://Learn.Microsoft.com:443/power-bi#intro") == "https://learn.microsoft.com/power-bi"
+    assert canonical_url("http://example.com") == "http://example.com/"
+    assert canonical_url("http://example.com:8080/a?b=1") == "http://example.com:8080/a?b=1"
+
+
+def test_entries_expire_per_failure_class() -> None:
+    cache = NegativeCache()
+    cache.put("https://example.com/a", "timeout", ttl_seconds=0)
+    cache.put("https://example.com/b", "http_404")
+
+    assert cache.get("https://example.com/a") is None
+    assert cache.get("https://EXAMPLE.com/b#top") == "http_404"
+    assert failure_ttl("http_404") > failure_ttl("http_429") == failure_ttl("timeout")
+
+
+def test_fetch_url_records_http_failures_and_skips_known_bad_urls(monkeypatch) -> None:
+    session = _ForbiddenSession()
+    monkeypatch.setattr(fetch_extract_module, "get_session", lambda: session)
+
+    assert fetch_extract_module.fetch_url("https://example.com/private") == ""
+    assert fetch_extract_module.fetch_url("https://example.com/private") == ""
+
+    assert session.calls == 1
+    assert get_negative_cache().get("https://example.com/private") == "http_403"
+
+
+class _TimeoutSession:
+    def __init__(self) -> None:
+        self.timeouts: list[float] = []
+
+    def get(self, url: str, *, timeout: float) -> requests.Response:
+        self.timeouts.append(timeout)
+        raise requests.Timeout(f"{url} timed out")
+
+
+def test_timeouts_under_a_clamped_budget_are_not_cached(monkeypatch) -> None:
+    session = _TimeoutSession()
+    monkeypatch.setattr(fetch_extract_module, "get_session", lambda: session)
+
+    with budget_scope(RunBudget(deadline_s=1.0)):
+        assert fetch_extract_module.fetch_url("https://example.com/slow", timeout=10) == ""
+    assert get_negative_cache().get("https://example.com/slow") is None
+
+    assert fetch_extract_module.fetch_url("https://example.com/slow", timeout=10) == ""
+    assert session.timeouts[0] < 10 and session.timeouts[1] == 10
+    assert get_negative_cache().get("https://example.com/slow") == "timeout"
+
+
+def test_enrichment_moves_past_urls_that_extracted_nothing(monkeypatch) -> None:
+    fetched: list[str] = []
+
+    def fake_fetch(url: str, timeout: float = 10) -> str:
+        fetched.append(url)
+        return "<html><body><p>Please sign in to continue.</p></body></html>" if url.endswith("page-0") else _PAGE
+
+    monkeypatch.setattr(research_module, "get_search_provider", lambda name, web=False: _StaticProvider())
+    monkeypatch.setattr(fetch_extract_module, "fetch_url", fake_fetch)
+    request = {"topic": "Power BI basics", "audience": "novice", "research": {"web": True}}
+
+    generate_research(request)
+    first_run = list(fetched)
+    fetched.clear()
+    generate_research(request)
+
+    urls = [f"https://learn.microsoft.com/power-bi/page-{i}" for i in range(6)]
+    assert first_run == urls[:4]
+    assert get_negative_cache().get(urls[0]) == "empty_extraction"
+    assert fetched == urls[1:5]
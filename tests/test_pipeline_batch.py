@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.graph import run_pipeline_batch
+from training_factory.research.providers import SearchResult
+from training_factory.research.search_cache import cached_search, get_search_cache
+
+
+def test_batch_yields_every_request_and_isolates_failures(monkeypatch) -> None:
+    import training_factory.graph as graph_module
+
+    original_brief = graph_module.generate_brief
+
+    def brief_fn(request: dict, research: dict) -> dict:
+        if request["topic"] == "boom":
+            raise RuntimeError("brief exploded")
+        return original_brief(request, research)
+
+    monkeypatch.setattr(graph_module, "generate_brief", brief_fn)
+
+    requests = [
+        {"topic": "Power BI basics", "audience": "novice"},
+        {"topic": "boom", "audience": "novice"},
+        {"topic": "Power Apps basics", "audience": "intermediate", "qa": {"max_retries": 0}},
+        {"audience": "novice"},
+        {"topic": "Power BI basics", "audience": None},
+        {"topic": "Power BI basics", "offline": "yes"},
+    ]
+    results = sorted(run_pipeline_batch(requests, max_workers=2), key=lambda item: item.index)
+
+    assert [item.index for item in results] == [0, 1, 2, 3, 4, 5]
+    assert results[0].ok
+    assert results[0].state is not None
+    assert results[0].state.packaging["request"]["topic"] == "Power BI basics"
+    assert not results[1].ok
+    assert results[1].error == "RuntimeError: brief exploded"
+    assert results[2].ok
+    assert results[2].state is not None
+    assert results[2].state.packaging["request"]["qa"] == {"max_retries": 0}
+    assert not results[3].ok
+    assert "topic" in (results[3].error or "")
+    assert results[4].error == "ValueError: 'audience' must be a string"
+    assert results[5].error == "ValueError: 'offline' must be a boolean"
+    assert all(item.duration_s >= 0 for item in results)
+
+
+class _CountingProvider:
+    cacheable = True
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def search(self, query: str, *, num_results: int = 10) -> list[SearchResult]:
+        self.calls += 1
+        return [SearchResult(title=query, url=f"https://example.com/{self.calls}")]
+
+
+class _UncacheableProvider(_CountingProvider):
+    cacheable = False
+
+
+def test_cached_search_reuses_results_for_cacheable_providers_only() -> None:
+    get_search_cache().clear()
+    provider = _CountingProvider()
+
+    first = cached_search(provider, "power bi governance", num_results=10)
+    second = cached_search(provider, "power bi governance", num_results=10)
+    cached_search(provider, "power bi governance", num_results=5)
+
+    assert first == second
+    assert provider.calls == 2
+
+    uncacheable = _UncacheableProvider()
+    cached_search(uncacheable, "power bi governance", num_results=10)
+    cached_search(uncacheable, "power bi governance", num_results=10)
+    assert uncacheable.calls == 2
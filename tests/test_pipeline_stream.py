@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+from typer.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.cli import app
+from training_factory.graph import run_pipeline, stream_pipeline
+
+
+def _without_timings(packaging: dict) -> dict:
+    execution = {
+        key: value for key, value in packaging["execution"].items() if key != "stage_latency_ms"
+    }
+    return {**packaging, "execution": execution}
+
+
+def test_stream_pipeline_emits_start_and_end_events_per_node() -> None:
+    events = list(stream_pipeline(topic="Power BI basics", audience="novice"))
+
+    starts = [event.node for event in events if event.kind == "node_start"]
+    ends = [event for event in events if event.kind == "node_end"]
+
+    assert starts[:3] == ["research", "research_qa", "brief"]
+    assert [event.node for event in ends] == starts
+    assert all(event.duration_s is not None and event.duration_s >= 0 for event in ends)
+    research_end = next(event for event in ends if event.node == "research")
+    assert research_end.artifact_sizes["research"] > 0
+    assert research_end.update["research"]["sources"]
+
+    final = events[-1]
+    assert final.kind == "run_end"
+    assert final.state is not None
+    expected = run_pipeline(topic="Power BI basics", audience="novice")
+    assert _without_timings(final.state.packaging) == _without_timings(expected.packaging)
+
+
+def test_generate_progress_renders_node_events(tmp_path) -> None:
+    runner = CliRunner()
+    out_path = tmp_path / "bundle.json"
+
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "--topic",
+            "Intro to Python",
+            "--out",
+            str(out_path),
+            "--offline",
+            "--progress",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert out_path.exists()
+    assert "research finished in" in result.stderr
+    assert "pipeline finished" in result.stderr
+    assert f"Wrote bundle to {out_path}" in result.stdout
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import pstats
+import sys
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.graph import run_pipeline, stream_pipeline
+from training_factory.profiling import Profiler
+
+
+def test_cprofile_writes_pstats_and_cumulative_summary(tmp_path) -> None:
+    profiler = Profiler("cprofile")
+    run_pipeline(topic="Power BI basics", audience="novice", profiler=profiler)
+
+    written = profiler.write(tmp_path / "bundle.json")
+
+    assert written == [tmp_path / "bundle.pstats", tmp_path / "bundle.profile.txt"]
+    stats = pstats.Stats(str(tmp_path / "bundle.pstats"))
+    assert any(filename.endswith("graph.py") for filename, _line, _name in stats.stats)
+    assert "cumulative" in (tmp_path / "bundle.profile.txt").read_text(encoding="utf-8")
+
+
+def test_tracemalloc_records_per_node_peaks_and_stops_tracing(tmp_path) -> None:
+    profiler = Profiler("tracemalloc")
+    events = list(stream_pipeline(topic="Power BI basics", audience="novice", profiler=profiler))
+
+    assert events[-1].kind == "run_end"
+    assert not tracemalloc.is_tracing()
+    assert {"research", "brief", "qa", "package"} <= set(profiler.node_peaks)
+    assert all(calls >= 1 for calls in profiler.node_calls.values())
+
+    profiler.write(tmp_path / "bundle.json")
+    memory = json.loads((tmp_path / "bundle.memory.json").read_text(encoding="utf-8"))
+    assert memory["research"]["calls"] == 1
+    assert memory["research"]["peak_bytes"] >= 0
+    assert "peak_kib" in (tmp_path / "bundle.profile.txt").read_text(encoding="utf-8")
+
+
+def test_profiler_rejects_unknown_mode() -> None:
+    with pytest.raises(ValueError, match="cprofile"):
+        Profiler("perf")  # type: ignore[arg-type]
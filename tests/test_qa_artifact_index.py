@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.agents import qa as qa_module
+from training_factory.agents.qa import generate_qa
+
+_SLIDES_ALIGN_PROMPT = "Do slides align with curriculum/lab objectives?"
+_TEMPLATES_ALIGN_PROMPT = "Do templates align with slides and lab?"
+
+
+def _artifacts(size: int) -> tuple[dict, dict, dict, dict, dict]:
+    modules = [
+        {"title": f"Dataflow topic{i} refresh", "duration_minutes": 10, "sources": ["src_001"]}
+        for i in range(size)
+    ]
+    deck = [
+        {
+            "slide": i + 1,
+            "title": f"Dataflow topic{i} refresh",
+            "bullets": [f"Practice topic{i} in the lab exercise", "Confirm the checkpoint"],
+        }
+        for i in range(size)
+    ]
+    lab = {
+        "steps": [{"step": 1, "instruction": "Create a dataflow"}],
+        "checkpoints": ["Dataflow created"],
+    }
+    templates = {
+        "readme_md": {"content": "# README\n\nThis lab follows the slide deck, one module at a time for each dataflow refresh"},
+        "runbook_md": {"content": "# RUNBOOK\n\nWork through each lab checkpoint."},
+    }
+    curriculum = {"topic": "Dataflows", "audience": "novice", "references_used": ["src_001"], "modules": modules}
+    research = {"sources": [{"id": "src_001", "authority_tier": "A"}]}
+    return {"deck": deck}, lab, templates, curriculum, research
+
+
+def _answer(qa: dict, prompt: str) -> str:
+    return next(item["answer"] for item in qa["checks"] if item["prompt"] == prompt)
+
+
+def test_large_deck_is_indexed_once(monkeypatch) -> None:
+    size = 150
+    calls = 0
+    original = qa_module._meaningful_tokens
+
+    def counting(text: str) -> frozenset[str]:
+        nonlocal calls
+        calls += 1
+        return original(text)
+
+    monkeypatch.setattr(qa_module, "_meaningful_tokens", counting)
+    qa = generate_qa(*_artifacts(size))
+
+    assert qa["status"] == "pass"
+    assert _answer(qa, _SLIDES_ALIGN_PROMPT) == "Yes"
+    assert _answer(qa, _TEMPLATES_ALIGN_PROMPT) == "Yes"
+    # Title + text per slide and title per module; nothing re-tokenized per check.
+    assert calls == 3 * size
+
+
+def test_misaligned_slide_deep_in_deck_fails_alignment() -> None:
+    slides, lab, templates, curriculum, research = _artifacts(120)
+    slides["deck"][97] = {"slide": 98, "title": "Unrelated wrap-up", "bullets": ["Questions"]}
+
+    qa = generate_qa(slides, lab, templates, curriculum, research)
+
+    assert _answer(qa, _SLIDES_ALIGN_PROMPT) == "No"
+    assert _answer(qa, _TEMPLATES_ALIGN_PROMPT) == "Yes"
+    assert qa["status"] == "fail"
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+import sys
+
+from typer.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import training_factory.qa_batch as qa_batch_module
+from training_factory.cli import app
+from training_factory.graph import run_pipeline
+from training_factory.qa_batch import rescore_bundle, rescore_paths
+from training_factory.utils.bundle_io import write_bundle
+
+_SLIDES_ALIGN = "Do slides align with curriculum/lab objectives?"
+_TEMPLATES_README = "Does templates include README.md?"
+_TEMPLATES_ALIGN = "Do templates align with slides and lab?"
+_CURRICULUM_REFS = "Does curriculum include references_used and are they valid research source IDs?"
+_MODULE_SOURCES = "Does each curriculum module include sources and are they valid research source IDs?"
+_SOURCE_COUNT = "At least 3 sources are present"
+_AUTHORITY = "Authority threshold met (>=1 Tier A or >=2 Tier B)"
+_KEYWORDS = "Keyword coverage ratio is at least 0.5"
+_DOMAIN_CAP = "No non-Tier-A domain has more than 2 sources"
+
+
+def _failed(payload: dict) -> list[str]:
+    return [check["prompt"] for check in payload["checks"] if check["answer"] != "Yes"]
+
+
+def _bundle() -> dict:
+    return run_pipeline(topic="Power BI basics", audience="novice").packaging
+
+
+def _structured_lab(bundle: dict) -> dict:
+    variant = copy.deepcopy(bundle)
+    variant["lab"] = {"steps": [{"step": 1, "instruction": "Open the workspace"}], "checkpoints": ["Workspace open"]}
+    return variant
+
+
+def test_rescoring_a_fresh_bundle_reproduces_its_stored_qa() -> None:
+    bundle = _bundle()
+
+    qa, research_qa = rescore_bundle(bundle)
+
+    # The packaged `labs` shape is mapped back to the steps/checkpoints QA scored.
+    assert "steps" not in bundle["lab"]
+    assert qa == bundle["qa"]
+    assert research_qa == bundle["research_qa"]
+    assert research_qa["status"] == "pass"
+    assert research_qa["metrics"]["tier_counts"] == {"A": 5, "B": 0, "C": 0, "D": 1}
+    assert research_qa["metrics"]["keyword_coverage_ratio"] == 0.833
+
+
+def test_rescore_applies_current_rules_to_each_section() -> None:
+    bundle = _bundle()
+    structured = _structured_lab(bundle)
+
+    bare = copy.deepcopy(bundle)
+    bare["templates"] = {"readme_md": {"content": ""}, "runbook_md": {"content": "lab slide"}}
+    bare["research"]["sources"] = bare["research"]["sources"][:1]
+
+    malformed_module = copy.deepcopy(structured)
+    malformed_module["curriculum"]["modules"].append("not a module")
+
+    qa, research_qa = rescore_bundle(structured)
+    assert (qa["status"], research_qa["status"]) == ("pass", "pass")
+
+    qa, research_qa = rescore_bundle(bare)
+    assert _failed(qa) == [_TEMPLATES_README, _TEMPLATES_ALIGN, _CURRICULUM_REFS]
+    assert _failed(research_qa) == [_SOURCE_COUNT]
+
+    qa, _ = rescore_bundle(malformed_module)
+    assert _failed(qa) == [_SLIDES_ALIGN, _MODULE_SOURCES]
+
+    qa, research_qa = rescore_bundle({})
+    assert qa["status"] == research_qa["status"] == "fail"
+    assert _failed(research_qa) == [_SOURCE_COUNT, _AUTHORITY, _KEYWORDS]
+
+
+def test_rescore_ignores_stale_stored_metrics() -> None:
+    bundle = _bundle()
+    bundle["research"]["sources"] = [
+        {**source, "authority_tier": "D", "title": "misc", "snippets": []} for source in bundle["research"]["sources"]
+    ]
+
+    _, research_qa = rescore_bundle(bundle)
+
+    assert bundle["research"]["metrics"]["tier_counts"]["A"] == 5
+    assert _failed(research_qa) == [_AUTHORITY, _KEYWORDS, _DOMAIN_CAP]
+    assert research_qa["metrics"]["tier_counts"] == {"A": 0, "B": 0, "C": 0, "D": 6}
+
+
+def test_rescore_error_in_one_bundle_becomes_an_error_row(tmp_path, monkeypatch) -> None:
+    bundle = _bundle()
+    write_bundle(bundle, tmp_path / "a.json")
+    write_bundle({**bundle, "slides": {"deck": "boom"}}, tmp_path / "b.json")
+    original_qa = qa_batch_module.generate_qa
+
+    def fragile_qa(slides: dict, *args: dict) -> dict:
+        if slides.get("deck") == "boom":
+            raise TypeError("deck is not a list")
+        return original_qa(slides, *args)
+
+    monkeypatch.setattr(qa_batch_module, "generate_qa", fragile_qa)
+
+    rows = [result.to_row() for result in rescore_paths([tmp_path])]
+
+    assert [row["status"] for row in rows] == ["ok", "error"]
+    assert rows[1]["error"] == "TypeError: deck is not a list"
+
+
+def test_rescore_cli_writes_results_table(tmp_path) -> None:
+    bundle_dir = tmp_path / "bundles"
+    bundle = _bundle()
+    write_bundle(bundle, bundle_dir / "a.json")
+    write_bundle(_structured_lab(bundle), bundle_dir / "b.json.gz", "json.gz")
+    write_bundle(bundle, bundle_dir / "c.ndjson", "ndjson")
+    (bundle_dir / "broken.json").write_text("{not json", encoding="utf-8")
+    (bundle_dir / "a.memory.json").write_text('{"nodes": []}', encoding="utf-8")  # profiling sidecar
+    out = tmp_path / "results.jsonl"
+
+    result = CliRunner().invoke(app, ["rescore", str(bundle_dir), "--out", str(out), "--workers", "2"])
+
+    assert result.exit_code == 1  # the broken bundle is reported
+    rows = {Path(row["path"]).name: row for row in map(json.loads, out.read_text(encoding="utf-8").splitlines())}
+    assert list(rows) == ["a.json", "b.json.gz", "broken.json", "c.ndjson"]
+    assert rows["broken.json"]["status"] == "error"
+    assert [rows[name]["qa_status"] for name in ("a.json", "b.json.gz", "c.ndjson")] == ["pass"] * 3
+    assert all(rows[name]["failed_checks"] == [] for name in ("a.json", "b.json.gz", "c.ndjson"))
+    assert not any(rows[name]["qa_changed"] or rows[name]["research_qa_changed"] for name in ("a.json", "c.ndjson"))
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import training_factory.agents.research as research_module
+from training_factory.agents.research import _build_query_plan, generate_research
+from training_factory.research.providers import SearchResult
+from training_factory.research.query_coalescing import CoalescedQuery, attribute_results, coalesce_queries
+
+_INTENT_RESULTS = {
+    "best practices": SearchResult(title="Widget best practices", url="https://learn.microsoft.com/widget/best"),
+    "governance operating model": SearchResult(
+        title="Widget governance", url="https://learn.microsoft.com/widget/operating-model", snippet="operating model"
+    ),
+    "lifecycle ALM": SearchResult(title="Widget lifecycle", url="https://aws.amazon.com/widget/alm"),
+    "security risk controls": SearchResult(title="Widget risk controls", url="https://owasp.org/widget"),
+}
+
+
+class _EngineProvider:
+    """Answers ``a OR b`` queries with the union of what each alternative returns."""
+
+    def __init__(self, *, supports_or: bool) -> None:
+        self.supports_or_queries = supports_or
+        self.queries: list[str] = []
+
+    def search(self, query: str, *, num_results: int = 10) -> list[SearchResult]:
+        self.queries.append(query)
+        return [result for intent, result in _INTENT_RESULTS.items() if intent in query][:num_results]
+
+
+def test_power_bi_plan_coalesces_base_queries_into_one_call() -> None:
+    queries = _build_query_plan("Power BI governance")["queries"]
+
+    calls = coalesce_queries(queries, num_results=10, supports_or=True)
+
+    assert len(queries) == 6
+    assert [len(call.members) for call in calls] == [1, 1, 4]
+    assert calls[-1].query == (
+        "Power BI governance ((best practices) OR (governance operating model)"
+        " OR (lifecycle ALM) OR (security risk controls))"
+    )
+    assert calls[-1].num_results == 40
+    assert sorted(member for call in calls for member in call.members) == sorted(queries)
+
+
+def test_without_or_support_each_query_is_its_own_call() -> None:
+    queries = _build_query_plan("Widget rollout")["queries"]
+
+    calls = coalesce_queries(queries, num_results=10, supports_or=False)
+
+    assert [call.query for call in calls] == queries
+    assert all(call.num_results == 10 for call in calls)
+
+
+def test_results_are_attributed_to_the_intent_they_match() -> None:
+    call = CoalescedQuery(
+        query="Widget ((best practices) OR (lifecycle ALM))",
+        members=("Widget best practices", "Widget lifecycle ALM"),
+        num_results=20,
+    )
+    unmatched = SearchResult(title="Widget home", url="https://example.com/widget")
+
+    attributed = attribute_results(call, [_INTENT_RESULTS["lifecycle ALM"], unmatched])
+
+    assert attributed == {
+        "Widget best practices": [unmatched],
+        "Widget lifecycle ALM": [_INTENT_RESULTS["lifecycle ALM"]],
+    }
+
+
+def test_coalescing_cuts_calls_without_changing_research_output(monkeypatch) -> None:
+    request = {"topic": "Widget", "audience": "novice", "research": {"web": False}}
+    payloads = {}
+    providers = {}
+    for supports_or in (False, True):
+        provider = _EngineProvider(supports_or=supports_or)
+        monkeypatch.setattr(research_module, "get_search_provider", lambda name, web=False, p=provider: p)
+        payloads[supports_or] = generate_research(request)
+        providers[supports_or] = provider
+
+    assert len(providers[False].queries) == 4
+    assert len(providers[True].queries) == 1
+    assert payloads[True]["query_plan"] == payloads[False]["query_plan"]
+    assert payloads[True]["sources"] == payloads[False]["sources"]
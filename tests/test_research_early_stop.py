@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import training_factory.agents.research as research_module
+from training_factory.agents.research import generate_research
+from training_factory.agents.research_qa import generate_research_qa
+from training_factory.research.providers import SearchResult
+
+_REQUEST = {"topic": "Power Platform ALM", "audience": "novice", "research": {"web": False}}
+
+
+class _CountingProvider:
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.queries: list[str] = []
+
+    def search(self, query: str, *, num_results: int = 10) -> list[SearchResult]:
+        self.queries.append(query)
+        call = len(self.queries)
+        return [
+            SearchResult(
+                title=f"Power Platform governance guide {call}.{i}",
+                url=f"https://{self.host}/power-platform/{call}/{i}",
+            )
+            for i in range(num_results)
+        ]
+
+
+def test_search_stops_once_anchor_results_fill_a_passing_selection(monkeypatch) -> None:
+    provider = _CountingProvider("learn.microsoft.com")
+    monkeypatch.setattr(research_module, "get_search_provider", lambda name, web=False: provider)
+
+    payload = generate_research(_REQUEST)
+
+    assert len(payload["query_plan"]["queries"]) == 6
+    assert provider.queries == [payload["query_plan"]["queries"][0]]
+    assert len(payload["sources"]) == 8
+    assert generate_research_qa(payload, _REQUEST)["status"] == "pass"
+
+
+def test_search_runs_the_whole_plan_when_the_pool_is_not_all_tier_a(monkeypatch) -> None:
+    provider = _CountingProvider("aws.amazon.com")
+    monkeypatch.setattr(research_module, "get_search_provider", lambda name, web=False: provider)
+
+    payload = generate_research(_REQUEST)
+
+    assert provider.queries == payload["query_plan"]["queries"]
+
+
+class _SnippetCoverageProvider(_CountingProvider):
+    """Titles miss the keywords; only the search snippets cover them."""
+
+    def search(self, query: str, *, num_results: int = 10) -> list[SearchResult]:
+        self.queries.append(query)
+        call = len(self.queries)
+        return [
+            SearchResult(
+                title=f"Reference page {call}.{i}",
+                url=f"https://{self.host}/docs/{call}/{i}",
+                snippet="Power Platform ALM with pipelines and solutions",
+            )
+            for i in range(num_results)
+        ]
+
+
+def test_enrichment_keeps_the_search_snippet_an_early_stop_relied_on(monkeypatch) -> None:
+    provider = _SnippetCoverageProvider("learn.microsoft.com")
+    page_snippets = [{"heading": "Cookies", "text": f"Manage cookie consent {i}", "loc": "p"} for i in range(4)]
+    monkeypatch.setattr(research_module, "get_search_provider", lambda name, web=False: provider)
+    monkeypatch.setattr(research_module, "_fetch_snippets", lambda url, keywords: list(page_snippets))
+    request = {**_REQUEST, "research": {"web": True}}
+
+    payload = generate_research(request)
+
+    assert len(provider.queries) == 1
+    enriched = [source for source in payload["sources"] if "retrieved_at" in source]
+    assert enriched
+    assert all(len(source["snippets"]) == 4 and source["snippets"][-1]["loc"] == "search" for source in enriched)
+    assert generate_research_qa(payload, request)["status"] == "pass"
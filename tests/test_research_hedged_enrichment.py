@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import training_factory.agents.research as research_module
+from training_factory.agents.research import generate_research
+from training_factory.research.providers import SearchResult
+
+_REQUEST = {
+    "topic": "Power BI basics",
+    "audience": "novice",
+    "research": {"web": True, "search_provider": "fallback", "hedged_enrichment": True},
+}
+_PAGE = "<html><body><h2>Governance</h2><p>Governance best practices include environment separation.</p></body></html>"
+
+
+class _StaticProvider:
+    def search(self, query: str, *, num_results: int = 10) -> list[SearchResult]:
+        _ = (query, num_results)
+        return [
+            SearchResult(title=f"Power BI guidance {i}", url=f"https://learn.microsoft.com/power-bi/page-{i}")
+            for i in range(8)
+        ]
+
+
+def _page_url(index: int) -> str:
+    return f"https://learn.microsoft.com/power-bi/page-{index}"
+
+
+def test_hedged_enrichment_keeps_first_pages_and_abandons_slow_one(monkeypatch) -> None:
+    import training_factory.research.fetch_extract as fetch_extract_module
+
+    release = threading.Event()
+    fetched: list[str] = []
+
+    def fake_fetch(url: str, timeout: float = 10) -> str:
+        fetched.append(url)
+        if url == _page_url(0):
+            release.wait(5)
+            return _PAGE
+        return "" if url == _page_url(1) else _PAGE
+
+    monkeypatch.setattr(research_module, "get_search_provider", lambda name, web=False: _StaticProvider())
+    monkeypatch.setattr(fetch_extract_module, "fetch_url", fake_fetch)
+
+    started = time.monotonic()
+    try:
+        payload = generate_research(_REQUEST)
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 2
+    assert len(fetched) == 6
+    retrieved = {source["url"] for source in payload["sources"] if "retrieved_at" in source}
+    enriched = {
+        source["url"]
+        for source in payload["sources"]
+        if any(snippet["loc"] != "search" for snippet in source["snippets"])
+    }
+    assert _page_url(0) not in retrieved
+    assert _page_url(1) in retrieved
+    assert enriched == {_page_url(i) for i in range(2, 6)}
+
+
+def test_hedged_enrichment_prefers_a_higher_priority_page_that_lands_late(monkeypatch) -> None:
+    import training_factory.research.fetch_extract as fetch_extract_module
+
+    def fake_fetch(url: str, timeout: float = 10) -> str:
+        if url == _page_url(0):
+            time.sleep(0.1)
+        return _PAGE
+
+    monkeypatch.setattr(research_module, "get_search_provider", lambda name, web=False: _StaticProvider())
+    monkeypatch.setattr(fetch_extract_module, "fetch_url", fake_fetch)
+
+    payload = generate_research(_REQUEST)
+
+    retrieved = [source["url"] for source in payload["sources"] if "retrieved_at" in source]
+    assert sorted(retrieved) == [_page_url(i) for i in range(4)]
+
+
+def test_sequential_enrichment_is_the_default(monkeypatch) -> None:
+    import training_factory.research.fetch_extract as fetch_extract_module
+
+    fetched: list[str] = []
+
+    def fake_fetch(url: str, timeout: float = 10) -> str:
+        fetched.append(url)
+        return _PAGE
+
+    monkeypatch.setattr(research_module, "get_search_provider", lambda name, web=False: _StaticProvider())
+    monkeypatch.setattr(fetch_extract_module, "fetch_url", fake_fetch)
+
+    research_cfg = {key: value for key, value in _REQUEST["research"].items() if key != "hedged_enrichment"}
+    payload = generate_research({**_REQUEST, "research": research_cfg})
+
+    assert fetched == [_page_url(i) for i in range(4)]
+    assert sum("retrieved_at" in source for source in payload["sources"]) == 4
@@ -5,6 +5,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
+from training_factory.agents import research_qa as research_qa_module
 from training_factory.agents.research import generate_research
 from training_factory.agents.research_qa import generate_research_qa
 
@@ -54,3 +55,45 @@ def test_research_qa_fails_for_low_quality_sources() -> None:
 
     assert payload["status"] == "fail"
     assert any(check["answer"] == "No" for check in payload["checks"])
+
+
+def test_research_qa_reuses_metrics_from_research(monkeypatch) -> None:
+    request = {"topic": "Power BI basics", "audience": "novice"}
+    research = generate_research(request)
+    without_metrics = {key: value for key, value in research.items() if key != "metrics"}
+    expected = generate_research_qa(without_metrics, request)
+
+    assert research["metrics"]["topic"] == "Power BI basics"
+    assert sum(research["metrics"]["tier_counts"].values()) == len(research["sources"])
+
+    def fail_tokenize(*args, **kwargs):
+        raise AssertionError("research QA should not re-tokenize sources when metrics are present")
+
+    monkeypatch.setattr(research_qa_module, "tokenize", fail_tokenize)
+    monkeypatch.setattr(research_qa_module, "tokenize_all", fail_tokenize)
+
+    assert generate_research_qa(research, request) == expected
+
+
+def test_research_qa_ignores_metrics_for_another_topic() -> None:
+    request = {"topic": "Power BI basics", "audience": "novice"}
+    research = generate_research(request)
+    expected = generate_research_qa(research, request)
+    research["metrics"] = {**research["metrics"], "topic": "Power Apps basics", "keyword_covered": []}
+
+    assert generate_research_qa(research, request) == expected
+
+
+def test_research_qa_recomputes_metrics_when_sources_changed() -> None:
+    request = {"topic": "Power BI basics", "audience": "novice"}
+    research = generate_research(request)
+    assert generate_research_qa(research, request)["status"] == "pass"
+
+    research["sources"] = [
+        {**source, "authority_tier": "D", "title": "misc", "snippets": []} for source in research["sources"]
+    ]
+    payload = generate_research_qa(research, request)
+
+    assert payload["status"] == "fail"
+    assert payload["metrics"]["tier_counts"]["D"] == len(research["sources"])
+    assert payload == generate_research_qa(research, request, reuse_metrics=False)
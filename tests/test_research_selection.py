@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import training_factory.agents.research as research_module
+from training_factory.agents.research import generate_research
+from training_factory.agents.research_qa import generate_research_qa
+from training_factory.research.providers import SearchResult
+
+_REQUEST = {"topic": "Widget rollout", "audience": "novice", "research": {"web": False, "search_provider": "fallback"}}
+_KEYWORD_TITLE = "Widget rollout best practices governance lifecycle security alm risk operating model"
+
+
+class _ListProvider:
+    def __init__(self, results: list[SearchResult]) -> None:
+        self.results = results
+
+    def search(self, query: str, *, num_results: int = 10) -> list[SearchResult]:
+        _ = (query, num_results)
+        return list(self.results)
+
+
+def _research(monkeypatch, results: list[SearchResult]) -> dict:
+    monkeypatch.setattr(research_module, "get_search_provider", lambda name, web=False: _ListProvider(results))
+    return generate_research(_REQUEST)
+
+
+def test_selection_swaps_in_pool_tier_a_source_to_meet_authority(monkeypatch) -> None:
+    results = [SearchResult(title=_KEYWORD_TITLE, url=f"https://blog{i}.example.com/post") for i in range(9)]
+    results.append(SearchResult(title="Reference", url="https://learn.microsoft.com/reference"))
+
+    research = _research(monkeypatch, results)
+
+    tiers = [source["authority_tier"] for source in research["sources"]]
+    assert len(tiers) == 8
+    assert tiers.count("A") == 1
+    assert "https://blog8.example.com/post" not in [source["url"] for source in research["sources"]]
+    assert generate_research_qa(research, _REQUEST)["status"] == "pass"
+
+
+def test_selection_swaps_in_keyword_covering_sources(monkeypatch) -> None:
+    results = [
+        SearchResult(title="Quarterly report", url=f"https://team{i}.aws.amazon.com/report", snippet="numbers")
+        for i in range(8)
+    ]
+    results.extend(
+        SearchResult(title="Widget rollout notes", url=f"https://notes{i}.example.com/widget", snippet="plan")
+        for i in range(6)
+    )
+
+    research = _research(monkeypatch, results)
+
+    domains = [source["domain"] for source in research["sources"]]
+    assert len(domains) == 8
+    assert sum(domain.endswith("example.com") for domain in domains) == 4
+    assert research["metrics"]["tier_counts"]["B"] == 4
+    assert generate_research_qa(research, _REQUEST)["status"] == "pass"
+    scores = [float(source["score"]) for source in research["sources"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_selection_keeps_ranked_picks_when_pool_cannot_help(monkeypatch) -> None:
+    results = [SearchResult(title="Quarterly report", url=f"https://site{i}.example.org/a") for i in range(5)]
+
+    research = _research(monkeypatch, results)
+
+    assert len(research["sources"]) == 5
+    assert generate_research_qa(research, _REQUEST)["status"] == "fail"
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.agents.research import generate_research
+from training_factory.budget import RunBudget, budget_from_request, budget_scope, clamp_timeout
+from training_factory.graph import run_pipeline
+
+
+def test_budget_from_request_reads_deadline() -> None:
+    assert budget_from_request({"topic": "x"}) is None
+    assert budget_from_request({"budget": {"deadline_s": 0}}) is None
+    budget = budget_from_request({"budget": {"deadline_s": "30"}})
+    assert budget is not None
+    assert budget.deadline_s == 30.0
+
+
+def test_clamp_timeout_shrinks_to_remaining_budget() -> None:
+    assert clamp_timeout(10) == 10
+
+    budget = RunBudget(deadline_s=2.0)
+    with budget_scope(budget):
+        clamped = clamp_timeout(10)
+    assert 0 < clamped <= 2.0
+    assert budget.degraded
+
+    roomy = RunBudget(deadline_s=600.0)
+    with budget_scope(roomy):
+        assert clamp_timeout(10) == 10
+    assert not roomy.degraded
+
+
+def test_enrichment_is_skipped_when_budget_is_short(monkeypatch) -> None:
+    import training_factory.research.fetch_extract as fetch_extract_module
+
+    def fail_if_called(*_args, **_kwargs):
+        raise AssertionError("fetch_url should not run when the budget is short")
+
+    monkeypatch.setattr(fetch_extract_module, "fetch_url", fail_if_called)
+
+    budget = RunBudget(deadline_s=1.0)
+    with budget_scope(budget):
+        payload = generate_research(
+            {
+                "topic": "Power BI basics",
+                "audience": "novice",
+                "research": {"web": True, "search_provider": "fallback"},
+            }
+        )
+
+    assert payload["sources"]
+    assert all("retrieved_at" not in source for source in payload["sources"])
+    assert budget.degraded
+
+
+def test_estimate_costs_unrecorded_stages_at_the_mean_duration() -> None:
+    budget = RunBudget(deadline_s=60.0)
+    assert budget.estimate(["research", "brief"]) == 0.0
+
+    budget.record("research", 3.0)
+    budget.record("research_qa", 1.0)
+
+    assert budget.estimate(["research", "brief", "package"]) == 7.0
+
+
+def _failing_research_loop(monkeypatch, delay_s: float) -> dict[str, int]:
+    import training_factory.graph as graph_module
+
+    calls = {"research": 0}
+    original_research = graph_module.generate_research
+    original_research_qa = graph_module.generate_research_qa
+
+    def slow_research(request: dict) -> dict:
+        calls["research"] += 1
+        time.sleep(delay_s)
+        research = original_research(request)
+        # Drop the candidate-pool fingerprint so the retry is not skipped as
+        # futile: these tests stand in for a provider whose results can change.
+        research.get("metrics", {}).pop("candidate_pool", None)
+        return research
+
+    def failing_research_qa(research: dict, request: dict) -> dict:
+        return {**original_research_qa(research, request), "status": "fail"}
+
+    monkeypatch.setattr(graph_module, "generate_research", slow_research)
+    monkeypatch.setattr(graph_module, "generate_research_qa", failing_research_qa)
+    return calls
+
+
+def test_research_retry_is_skipped_when_budget_cannot_cover_a_loop(monkeypatch) -> None:
+    calls = _failing_research_loop(monkeypatch, delay_s=0.2)
+
+    state = run_pipeline(
+        topic="Power BI basics",
+        audience="novice",
+        research={"max_retries": 3},
+        budget={"deadline_s": 0.3},
+    )
+
+    assert calls["research"] == 1
+    assert state.research_revision_count == 0
+    assert state.packaging["execution"]["skipped_retries"] == [
+        {"loop": "research", "attempt": 1, "reason": "budget"}
+    ]
+
+
+def test_research_retries_proceed_within_budget(monkeypatch) -> None:
+    calls = _failing_research_loop(monkeypatch, delay_s=0.01)
+
+    state = run_pipeline(
+        topic="Power BI basics",
+        audience="novice",
+        research={"max_retries": 2},
+        budget={"deadline_s": 60},
+    )
+
+    assert calls["research"] == 3
+    assert state.research_revision_count == 2
+    assert "skipped_retries" not in state.packaging["execution"]
+
+
+def test_research_retry_leaves_time_for_the_downstream_stages(monkeypatch) -> None:
+    calls = _failing_research_loop(monkeypatch, delay_s=0.1)
+
+    # Another research pass alone would fit, but not with brief..package after it.
+    state = run_pipeline(
+        topic="Power BI basics",
+        audience="novice",
+        research={"max_retries": 1},
+        budget={"deadline_s": 0.6},
+    )
+
+    assert calls["research"] == 1
+    assert state.packaging["execution"]["skipped_retries"] == [
+        {"loop": "research", "attempt": 1, "reason": "budget"}
+    ]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import http.client
+import json
+from pathlib import Path
+import sys
+import threading
+import time
+from urllib import error, request
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import training_factory.server as server_module
+from training_factory.server import make_server
+
+
+@pytest.fixture
+def base_url():
+    server = make_server("127.0.0.1", 0, max_workers=2, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.service.shutdown()
+
+
+def _call(url: str, payload: dict | None = None) -> tuple[int, dict]:
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with request.urlopen(req, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_generate_waits_for_bundle(base_url) -> None:
+    status, body = _call(f"{base_url}/generate", {"topic": "Power BI basics", "audience": "novice"})
+
+    assert status == 200
+    assert body["status"] == "done"
+    assert body["bundle"]["request"]["topic"] == "Power BI basics"
+    assert body["duration_s"] >= 0
+
+
+def test_generate_without_wait_returns_job_id_to_poll(base_url) -> None:
+    status, body = _call(f"{base_url}/generate?wait=0", {"topic": "Power Apps basics"})
+    assert status == 202
+    assert "bundle" not in body
+
+    job_url = f"{base_url}/jobs/{body['job_id']}"
+    deadline = time.monotonic() + 30
+    while True:
+        status, job = _call(job_url)
+        if job["status"] in {"done", "error"} or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+
+    assert status == 200
+    assert job["status"] == "done"
+    assert job["bundle"]["request"]["topic"] == "Power Apps basics"
+
+
+def test_healthz_and_error_responses(base_url) -> None:
+    status, health = _call(f"{base_url}/healthz")
+    assert status == 200
+    assert health["status"] == "ok"
+    assert health["workers"] == 2
+
+    status, body = _call(f"{base_url}/generate", {"audience": "novice"})
+    assert status == 400
+    assert "topic" in body["error"]
+
+    status, _ = _call(f"{base_url}/jobs/missing")
+    assert status == 404
+
+
+@pytest.mark.parametrize(
+    ("payload", "message"),
+    [
+        ({"topic": 123}, "'topic'"),
+        ({"topic": "Power BI basics", "audience": None}, "'audience'"),
+        ({"topic": "Power BI basics", "audience": ["novice"]}, "'audience'"),
+    ],
+)
+def test_generate_rejects_non_string_topic_or_audience(base_url, payload, message) -> None:
+    status, body = _call(f"{base_url}/generate", payload)
+
+    assert status == 400
+    assert message in body["error"]
+
+
+@pytest.mark.parametrize(
+    ("content_length", "message"),
+    [(None, "required"), ("-1", "negative"), ("abc", "integer"), ("2000000", "too large")],
+)
+def test_generate_rejects_bad_content_length(base_url, content_length, message) -> None:
+    host, port = base_url.removeprefix("http://").split(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=5)
+    conn.putrequest("POST", "/generate")
+    if content_length is not None:
+        conn.putheader("Content-Length", content_length)
+    conn.endheaders()
+    response = conn.getresponse()
+
+    assert response.status == 400
+    assert message in json.loads(response.read())["error"]
+    conn.close()
+
+
+def test_generate_returns_503_when_the_queue_is_full(monkeypatch) -> None:
+    release = threading.Event()
+
+    def blocking_pipeline(**_kwargs):
+        release.wait(10)
+        raise RuntimeError("released")
+
+    monkeypatch.setattr(server_module, "run_pipeline", blocking_pipeline)
+    server = make_server("127.0.0.1", 0, max_workers=1, max_queued=1, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    url = f"http://{host}:{port}/generate?wait=0"
+    try:
+        responses = [_call(url, {"topic": "Power BI basics"}) for _ in range(3)]
+        release.set()
+        for status, body in responses[:2]:
+            server.service.get(body["job_id"]).done.wait(5)
+        retried, _ = _call(url, {"topic": "Power BI basics"})
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+        server.service.shutdown()
+
+    assert [status for status, _ in responses] == [202, 202, 503]
+    assert "queue is full" in responses[2][1]["error"]
+    assert retried == 202
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.graph import run_pipeline_batch
+from training_factory.settings import clear_settings_cache, get_settings, offline_override, settings_override
+
+
+def test_overrides_are_local_to_each_thread(monkeypatch) -> None:
+    monkeypatch.setenv("TRAINING_FACTORY_OFFLINE", "0")
+    clear_settings_cache()
+    barrier = threading.Barrier(2)
+    seen: dict[str, tuple[bool, str]] = {}
+
+    def worker(name: str, offline: bool, model: str) -> None:
+        with settings_override(training_factory_offline=offline, openai_model=model):
+            barrier.wait()  # both overrides are active at the same time
+            settings = get_settings()
+            seen[name] = (settings.offline_mode, settings.openai_model)
+
+    threads = [
+        threading.Thread(target=worker, args=("offline", True, "model-a")),
+        threading.Thread(target=worker, args=("online", False, "model-b")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {"offline": (True, "model-a"), "online": (False, "model-b")}
+    assert get_settings().offline_mode is False
+
+
+def test_offline_override_is_noop_when_disabled(monkeypatch) -> None:
+    monkeypatch.setenv("TRAINING_FACTORY_OFFLINE", "0")
+    clear_settings_cache()
+
+    with offline_override(False):
+        assert get_settings().offline_mode is False
+    with offline_override(True):
+        assert get_settings().offline_mode is True
+    assert get_settings().offline_mode is False
+
+
+def test_unknown_override_field_is_rejected() -> None:
+    with pytest.raises(ValueError, match="not_a_setting"):
+        with settings_override(not_a_setting=True):
+            pass
+
+
+def test_batch_applies_offline_per_request(monkeypatch) -> None:
+    import training_factory.graph as graph_module
+    from training_factory import llm
+
+    monkeypatch.setenv("TRAINING_FACTORY_OFFLINE", "0")
+    clear_settings_cache()
+    monkeypatch.setattr(llm, "invoke_text", lambda prompt, fallback_text: fallback_text)
+
+    offline_by_topic: dict[str, bool] = {}
+    original_brief = graph_module.generate_brief
+
+    def recording_brief(request: dict, research: dict) -> dict:
+        offline_by_topic[request["topic"]] = get_settings().offline_mode
+        return original_brief(request, research)
+
+    monkeypatch.setattr(graph_module, "generate_brief", recording_brief)
+
+    requests = [
+        {"topic": "Power BI basics", "offline": True},
+        {"topic": "Power Apps basics"},
+        {"topic": "Power Automate basics", "offline": True},
+    ]
+    results = list(run_pipeline_batch(requests, max_workers=3))
+
+    assert all(result.ok for result in results)
+    assert offline_by_topic == {
+        "Power BI basics": True,
+        "Power Apps basics": False,
+        "Power Automate basics": True,
+    }
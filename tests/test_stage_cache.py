@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.graph import run_pipeline
+from training_factory.settings import clear_settings_cache, get_settings
+from training_factory.utils.stage_cache import stage_key
+
+
+def _without_timings(packaging: dict) -> dict:
+    execution = {
+        key: value for key, value in packaging["execution"].items() if key != "stage_latency_ms"
+    }
+    return {**packaging, "execution": execution}
+
+
+def _enable_stage_cache(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("TRAINING_FACTORY_STAGE_CACHE_DIR", str(tmp_path / "stage_cache"))
+    clear_settings_cache()
+
+
+def test_stage_key_is_stable_and_input_sensitive() -> None:
+    settings = get_settings()
+    first = stage_key("brief", {"b": 1, "a": [1, 2]}, version="v1", settings=settings)
+    reordered = stage_key("brief", {"a": [1, 2], "b": 1}, version="v1", settings=settings)
+    changed = stage_key("brief", {"a": [1, 2], "b": 2}, version="v1", settings=settings)
+    bumped = stage_key("brief", {"a": [1, 2], "b": 1}, version="v2", settings=settings)
+
+    assert first == reordered
+    assert first != changed
+    assert first != bumped
+
+
+def test_unchanged_stages_are_served_from_cache(monkeypatch, tmp_path) -> None:
+    import training_factory.agents.brief as brief_module
+    import training_factory.agents.curriculum as curriculum_module
+    import training_factory.agents.lab as lab_module
+    import training_factory.agents.research as research_module
+    import training_factory.agents.slides as slides_module
+    import training_factory.agents.templates as templates_module
+
+    _enable_stage_cache(monkeypatch, tmp_path)
+    first = run_pipeline(topic="Power BI basics", audience="novice")
+
+    def fail_if_called(*_args, **_kwargs):
+        raise AssertionError("agent should not run on a stage cache hit")
+
+    # Patch the agents' dependencies rather than the agents themselves so the
+    # agent code version (part of the cache key) is unchanged.
+    monkeypatch.setattr(research_module, "get_search_provider", fail_if_called)
+    for module in (brief_module, curriculum_module, slides_module, lab_module, templates_module):
+        monkeypatch.setattr(module, "generate_structured_output", fail_if_called)
+
+    second = run_pipeline(topic="Power BI basics", audience="novice")
+
+    assert _without_timings(second.packaging) == _without_timings(first.packaging)
+
+
+def test_changed_topic_misses_the_cache(monkeypatch, tmp_path) -> None:
+    import training_factory.graph as graph_module
+
+    _enable_stage_cache(monkeypatch, tmp_path)
+    run_pipeline(topic="Power BI basics", audience="novice")
+
+    calls = {"brief": 0}
+    original_brief = graph_module.generate_brief
+
+    def counting_brief(request, research):
+        calls["brief"] += 1
+        return original_brief(request, research)
+
+    monkeypatch.setattr(graph_module, "generate_brief", counting_brief)
+    state = run_pipeline(topic="Power Apps basics", audience="novice")
+
+    assert calls["brief"] == 1
+    assert state.brief["topic"] == "Power Apps basics"
@@ -9,7 +9,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 def _clear_settings_cache() -> None:
     settings_module = import_module("training_factory.settings")
-    settings_module.get_settings.cache_clear()
+    settings_module.clear_settings_cache()
 
 
 def test_generate_templates_falls_back_when_structured_content_is_not_string(monkeypatch) -> None:
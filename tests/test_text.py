@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.utils import text as text_module
+from training_factory.utils.text import normalize_whitespace, tokenize, tokenize_all
+
+
+def _legacy_tokenize(value: str, min_length: int) -> set[str]:
+    normalized = "".join(ch.lower() if ch.isalnum() else " " for ch in value)
+    return {token for token in normalized.split() if len(token) >= min_length}
+
+
+SAMPLES = [
+    "Power BI row-level security (RLS) for workspace_admins",
+    "Enterprise ChatGPT: data-governance & retention policies, 2024 edition",
+    "Café naïve résumé — Straße ÉTUDE ½ ² ٣",
+    "snake_case_identifiers and CamelCase and x1y2z3",
+    "",
+    "   \t\n  ",
+    "a" * 300 + " " + "long tail beyond the cache threshold",
+]
+
+
+def test_tokenize_matches_legacy_character_loop() -> None:
+    for sample in SAMPLES:
+        for min_length in (1, 3, 4):
+            assert tokenize(sample, min_length) == _legacy_tokenize(sample, min_length), (sample, min_length)
+
+
+def test_tokenize_all_unions_inputs() -> None:
+    assert tokenize_all(["Power BI", "row level security"], 3) == {"power", "row", "level", "security"}
+    assert tokenize_all([], 3) == frozenset()
+
+
+def test_short_strings_are_cached_and_long_strings_bypass_cache() -> None:
+    text_module._tokenize_cached.cache_clear()
+    first = tokenize("Dataverse security roles", 3)
+    second = tokenize("Dataverse security roles", 3)
+    assert first is second
+    assert text_module._tokenize_cached.cache_info().hits == 1
+
+    tokenize("word " * 100, 3)
+    assert text_module._tokenize_cached.cache_info().currsize == 1
+
+
+def test_normalize_whitespace() -> None:
+    assert normalize_whitespace("  Sign\tIN\n here ") == "sign in here"
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+from typer.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.cli import app
+from training_factory.graph import run_pipeline
+from training_factory.tracing import Tracer, span, tracing_scope
+
+
+def test_span_is_noop_without_active_tracer() -> None:
+    with span("search", "search", query="x") as current:
+        assert current is None
+
+
+def test_nested_spans_record_parent_and_attributes() -> None:
+    tracer = Tracer()
+    with tracing_scope(tracer):
+        with span("research", "node") as outer:
+            with span("search", "search", query="power bi") as inner:
+                assert inner is not None
+                inner.attributes["results"] = 3
+
+    records = {record["name"]: record for record in tracer.to_records()}
+    assert records["search"]["parent_id"] == outer.span_id
+    assert records["search"]["attributes"] == {"query": "power bi", "results": 3}
+    assert records["research"]["end_unix"] >= records["research"]["start_unix"]
+
+
+def test_run_pipeline_traces_nodes_and_search_calls_and_writes_latency_summary() -> None:
+    tracer = Tracer()
+    state = run_pipeline(topic="Power BI basics", audience="novice", tracer=tracer)
+
+    node_names = {item.name for item in tracer.finished_spans("node")}
+    assert {"research", "research_qa", "brief", "qa", "package"} <= node_names
+    search_spans = tracer.finished_spans("search")
+    assert search_spans
+    assert all(item.attributes["provider"] == "SimpleFallbackSearchProvider" for item in search_spans)
+
+    latency = state.packaging["execution"]["stage_latency_ms"]
+    assert set(latency) == node_names
+    assert {"research", "brief", "curriculum", "slides", "lab", "templates", "qa", "package"} <= set(latency)
+    assert all(value >= 0 for value in latency.values())
+
+
+def test_generate_writes_jsonl_and_chrome_traces(tmp_path) -> None:
+    runner = CliRunner()
+    jsonl_path = tmp_path / "trace.jsonl"
+    chrome_path = tmp_path / "trace.json"
+
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "--topic",
+            "Intro to Python",
+            "--out",
+            str(tmp_path / "bundle.json"),
+            "--offline",
+            "--trace-jsonl",
+            str(jsonl_path),
+            "--trace-chrome",
+            str(chrome_path),
+        ],
+    )
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in jsonl_path.read_text(encoding="utf-8").splitlines()]
+    assert any(record["category"] == "node" and record["name"] == "research" for record in records)
+
+    chrome = json.loads(chrome_path.read_text(encoding="utf-8"))
+    assert chrome["traceEvents"]
+    assert all(event["ph"] == "X" for event in chrome["traceEvents"])
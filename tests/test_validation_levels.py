@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+import sys
+
+import pytest
+from jsonschema import ValidationError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from training_factory.graph import run_pipeline
+from training_factory.settings import settings_override
+from training_factory.utils import json_schema
+from training_factory.utils.json_schema import clear_schema_cache, validate_json
+
+SCHEMA_DIR = Path(__file__).resolve().parents[1] / "schemas"
+INVALID_QA = {"status": "maybe"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_validation_cache():
+    clear_schema_cache()
+    yield
+    clear_schema_cache()
+
+
+def _count_validations(monkeypatch) -> Counter:
+    calls: Counter = Counter()
+    original = json_schema._compiled_validator
+
+    def counting(resolved_path: str):
+        calls[Path(resolved_path).name] += 1
+        return original(resolved_path)
+
+    counting.cache_clear = original.cache_clear  # type: ignore[attr-defined]
+    monkeypatch.setattr(json_schema, "_compiled_validator", counting)
+    return calls
+
+
+def test_strict_validates_stage_and_final_objects() -> None:
+    with pytest.raises(ValidationError):
+        validate_json(INVALID_QA, SCHEMA_DIR / "qa.schema.json", stage=True)
+    with pytest.raises(ValidationError):
+        validate_json(INVALID_QA, SCHEMA_DIR / "qa.schema.json")
+
+
+def test_final_only_skips_stage_checks() -> None:
+    with settings_override(validation="final-only"):
+        validate_json(INVALID_QA, SCHEMA_DIR / "qa.schema.json", stage=True)
+        with pytest.raises(ValidationError):
+            validate_json(INVALID_QA, SCHEMA_DIR / "qa.schema.json")
+
+
+def test_off_skips_everything() -> None:
+    with settings_override(validation="off"):
+        validate_json(INVALID_QA, SCHEMA_DIR / "qa.schema.json", stage=True)
+        validate_json(INVALID_QA, SCHEMA_DIR / "qa.schema.json")
+
+
+def test_identical_bundle_is_validated_once(monkeypatch) -> None:
+    calls = _count_validations(monkeypatch)
+
+    state = run_pipeline(topic="Power BI basics", audience="novice")
+    assert calls["bundle.schema.json"] == 1
+
+    # The CLI/server re-check of the same packaged bundle is a cache hit.
+    validate_json(dict(state.packaging), SCHEMA_DIR / "bundle.schema.json")
+    assert calls["bundle.schema.json"] == 1
+
+    changed = {**state.packaging, "qa": {**state.packaging["qa"], "status": "fail"}}
+    validate_json(changed, SCHEMA_DIR / "bundle.schema.json")
+    assert calls["bundle.schema.json"] == 2
+
+
+def test_final_only_pipeline_skips_stage_schemas(monkeypatch) -> None:
+    calls = _count_validations(monkeypatch)
+
+    with settings_override(validation="final-only"):
+        run_pipeline(topic="Power BI basics", audience="novice")
+
+    assert set(calls) == {"bundle.schema.json"}